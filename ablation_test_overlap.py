@@ -1,12 +1,13 @@
-import os
-import pandas as pd
+import functools
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
 
-rcParams['font.family'] = 'serif'
-rcParams['font.serif'] = ['Times New Roman']
-rcParams['font.size'] = 17
+from batch_runner import run_folders
+from coverage_axis import coverage_table
+from coverage_grid import interp_runs, pack_runs
+from figures import output_figure, overlap_axis
+from memo_cache import memoize
+from run_index import load_paired_runs
 
 # Define all folders, including the fourth one
 folders = {
@@ -24,39 +25,27 @@ colors = {
     'WSR': '#884E6D',
 }
 
-def read_coverage_data(folder):
+def read_coverage_data(data_frames):
     coverage_data = []
-    for file_name in os.listdir(os.path.join(folder, 'coverage')):
-        if file_name.endswith('.csv'):
-            file_path = os.path.join(folder, 'coverage', file_name)
-            df = pd.read_csv(file_path)
-            df['Time Elapsed (s)'] = df['Time Elapsed (s)'].round()
-            df['Coverage Overlap (%)'] = df['Coverage Overlap (%)'].apply(lambda x: 5 if x <= 0 else x)
-            coverage_data.append(df[['Time Elapsed (s)', 'Coverage Overlap (%)']])
+    for df in data_frames:
+        df['Time Elapsed (s)'] = df['Time Elapsed (s)'].round()
+        df['Coverage Overlap (%)'] = df['Coverage Overlap (%)'].apply(lambda x: 5 if x <= 0 else x)
+        coverage_data.append(df[['Time Elapsed (s)', 'Coverage Overlap (%)']])
     return coverage_data
 
-def read_time_data(folder):
+def read_time_data(data_frames):
     time_data = []
-    for file_name in os.listdir(os.path.join(folder, 'time')):
-        if file_name.endswith('.csv'):
-            file_path = os.path.join(folder, 'time', file_name)
-            df = pd.read_csv(file_path)
-            df['time_elapsed'] = df['time_elapsed'].round()
-            df['coverage_percent'] = df['coverage_percent'].round()
-            time_data.append(df[['time_elapsed', 'coverage_percent']])
+    for df in data_frames:
+        df['time_elapsed'] = df['time_elapsed'].round()
+        df['coverage_percent'] = df['coverage_percent'].round()
+        time_data.append(df[['time_elapsed', 'coverage_percent']])
     return time_data
 
 def interpolate_data(coverage_data, time_data):
     time_points = np.linspace(0, max(df['time_elapsed'].max() for df in time_data), 100)
-    all_interpolated_coverage = []
-    all_interpolated_overlap = []
-    
-    for coverage_df, time_df in zip(coverage_data, time_data):
-        interpolated_coverage = np.interp(time_points, time_df['time_elapsed'], time_df['coverage_percent'])
-        interpolated_overlap = np.interp(time_points, coverage_df['Time Elapsed (s)'], coverage_df['Coverage Overlap (%)'])
-        
-        all_interpolated_coverage.append(interpolated_coverage)
-        all_interpolated_overlap.append(interpolated_overlap)
+    # Every run on the grid in one batched pass per column
+    all_interpolated_coverage = interp_runs(time_points, *pack_runs(time_data))
+    all_interpolated_overlap = interp_runs(time_points, *pack_runs(coverage_data, 'Time Elapsed (s)', 'Coverage Overlap (%)'))
     
     avg_interpolated_coverage = np.mean(all_interpolated_coverage, axis=0)
     avg_interpolated_overlap = np.mean(all_interpolated_overlap, axis=0)
@@ -68,58 +57,70 @@ def interpolate_data(coverage_data, time_data):
     
     return avg_interpolated_coverage, avg_interpolated_overlap, std_interpolated_overlap
 
-def process_folder(folder):
-    coverage_data = read_coverage_data(folder)
-    time_data = read_time_data(folder)
+# Average overlap per running-max coverage percent for WSR_OVERLAP_AXIS=coverage, all
+# runs binned in one pass, with the mean and std capped at 100%
+def overlap_on_coverage(coverage_data, time_data):
+    table = coverage_table(time_data, coverage_data)
+    avg_overlap = np.minimum(table['mean'].to_numpy(), 100)
+    std_overlap = np.minimum(np.nan_to_num(table['std'].to_numpy()), 100 - avg_overlap)
+    return table['coverage_percent'].to_numpy(), avg_overlap, std_overlap
+
+# Cached on disk, keyed on the folder's CSV file set, the axis and the source of the helpers below
+@memoize(depends=(read_coverage_data, read_time_data, interpolate_data, overlap_on_coverage, coverage_table, interp_runs))
+def process_folder(folder, axis='time'):
+    # Pair coverage and time files by the run id in their names, not directory order
+    run_ids, runs = load_paired_runs(folder, ('coverage', 'time'))
+    coverage_data = read_coverage_data(runs['coverage'])
+    time_data = read_time_data(runs['time'])
     
-    avg_coverage, avg_overlap, std_overlap = interpolate_data(coverage_data, time_data)
+    if axis == 'coverage':
+        avg_coverage, avg_overlap, std_overlap = overlap_on_coverage(coverage_data, time_data)
+    else:
+        avg_coverage, avg_overlap, std_overlap = interpolate_data(coverage_data, time_data)
     
     return avg_coverage, avg_overlap, std_overlap
 
-def process_folders_set(folders):
-    results = {}
-    for name, folder in folders.items():
-        avg_coverage, avg_overlap, std_overlap = process_folder(folder)
-        results[name] = (avg_coverage, avg_overlap, std_overlap)
-    return results
+# Single Plot with all results
+def draw_overlap(fig, aggregates):
+    colors, results = aggregates['colors'], aggregates['results']
+    ax = fig.subplots()
 
-# Process all folders
-all_results = process_folders_set(folders)
+    for name, (avg_coverage, avg_overlap, std_overlap) in results.items():
+        ax.plot(avg_coverage, avg_overlap, label=name, color=colors[name], linewidth=3.5)
+        ax.fill_between(avg_coverage, avg_overlap - std_overlap, avg_overlap + std_overlap, color=colors[name], alpha=0.2)
 
-# Calculate and print raw differences at termination for each folder set
-# wsr_overlap_sim = all_results['WiSER-X (Simulation)'][1][-1]
-# baseline_1_overlap_sim = all_results['Baseline-1: Independent Exploration (Simulation)'][1][-1]
-# baseline_2_overlap_sim = all_results['Baseline-2: Full Information Exchange (Simulation)'][1][-1]
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.set_xlabel('Total Map Coverage Percent')
+    ax.set_ylabel('Average Coverage Overlap (%)')
+    ax.set_title('Robot Map Coverage Overlap')
+    ax.legend(fontsize='x-small', loc='upper left', framealpha=0.5)
 
-# raw_diff_sim_baseline_1 = wsr_overlap_sim - baseline_1_overlap_sim
-# raw_diff_sim_baseline_2 = wsr_overlap_sim - baseline_2_overlap_sim
+    fig.tight_layout()
 
-# print(f"Raw Difference in Termination Coverage Overlap (Simulation) - WSR vs Baseline 1: {raw_diff_sim_baseline_1:.2f}%")
-# print(f"Raw Difference in Termination Coverage Overlap (Simulation) - WSR vs Baseline 2: {raw_diff_sim_baseline_2:.2f}%")
+if __name__ == '__main__':
+    # Process all folders in parallel
+    all_results = run_folders(folders, functools.partial(process_folder, axis=overlap_axis()))
 
-# wsr_overlap_hw = all_results['WiSER-X (Hardware)'][1][-1]
-# baseline_1_overlap_hw = all_results['Baseline-1: Independent Exploration (Hardware)'][1][-1]
-# baseline_2_overlap_hw = all_results['Baseline-2: Full Information Exchange (Hardware)'][1][-1]
+    # Calculate and print raw differences at termination for each folder set
+    # wsr_overlap_sim = all_results['WiSER-X (Simulation)'][1][-1]
+    # baseline_1_overlap_sim = all_results['Baseline-1: Independent Exploration (Simulation)'][1][-1]
+    # baseline_2_overlap_sim = all_results['Baseline-2: Full Information Exchange (Simulation)'][1][-1]
 
-# raw_diff_hw_baseline_1 = wsr_overlap_hw - baseline_1_overlap_hw
-# raw_diff_hw_baseline_2 = wsr_overlap_hw - baseline_2_overlap_hw
+    # raw_diff_sim_baseline_1 = wsr_overlap_sim - baseline_1_overlap_sim
+    # raw_diff_sim_baseline_2 = wsr_overlap_sim - baseline_2_overlap_sim
 
-# print(f"Raw Difference in Termination Coverage Overlap (Hardware) - WSR vs Baseline 1: {raw_diff_hw_baseline_1:.2f}%")
-# print(f"Raw Difference in Termination Coverage Overlap (Hardware) - WSR vs Baseline 2: {raw_diff_hw_baseline_2:.2f}%")
+    # print(f"Raw Difference in Termination Coverage Overlap (Simulation) - WSR vs Baseline 1: {raw_diff_sim_baseline_1:.2f}%")
+    # print(f"Raw Difference in Termination Coverage Overlap (Simulation) - WSR vs Baseline 2: {raw_diff_sim_baseline_2:.2f}%")
 
-# Single Plot with all results
-fig, ax = plt.subplots(figsize=(10, 7))
+    # wsr_overlap_hw = all_results['WiSER-X (Hardware)'][1][-1]
+    # baseline_1_overlap_hw = all_results['Baseline-1: Independent Exploration (Hardware)'][1][-1]
+    # baseline_2_overlap_hw = all_results['Baseline-2: Full Information Exchange (Hardware)'][1][-1]
 
-for name, (avg_coverage, avg_overlap, std_overlap) in all_results.items():
-    ax.plot(avg_coverage, avg_overlap, label=name, color=colors[name], linewidth=3.5)
-    ax.fill_between(avg_coverage, avg_overlap - std_overlap, avg_overlap + std_overlap, color=colors[name], alpha=0.2)
+    # raw_diff_hw_baseline_1 = wsr_overlap_hw - baseline_1_overlap_hw
+    # raw_diff_hw_baseline_2 = wsr_overlap_hw - baseline_2_overlap_hw
 
-ax.spines['top'].set_visible(False)
-ax.spines['right'].set_visible(False)
-ax.set_xlabel('Total Map Coverage Percent')
-ax.set_ylabel('Average Coverage Overlap (%)')
-ax.set_title('Robot Map Coverage Overlap')
-ax.legend(fontsize='x-small', loc='upper left', framealpha=0.5)
+    # print(f"Raw Difference in Termination Coverage Overlap (Hardware) - WSR vs Baseline 1: {raw_diff_hw_baseline_1:.2f}%")
+    # print(f"Raw Difference in Termination Coverage Overlap (Hardware) - WSR vs Baseline 2: {raw_diff_hw_baseline_2:.2f}%")
 
-plt.tight_layout()
-plt.show()
+    output_figure('ablation_test_overlap', draw_overlap, {'colors': colors, 'results': all_results}, figsize=(10, 7), font_size=17)
@@ -5,6 +5,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 
+from coverage_axis import coverage_table
+from coverage_grid import interp_runs, pack_runs
+from figures import overlap_axis
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 17
@@ -68,15 +72,9 @@ def read_time_data(folder, limit_first_five=True):
 
 def interpolate_data(coverage_data, time_data):
     time_points = np.linspace(0, max(df['time_elapsed'].max() for df in time_data), 100)
-    all_interpolated_coverage = []
-    all_interpolated_overlap = []
-    
-    for coverage_df, time_df in zip(coverage_data, time_data):
-        interpolated_coverage = np.interp(time_points, time_df['time_elapsed'], time_df['coverage_percent'])
-        interpolated_overlap = np.interp(time_points, coverage_df['Time Elapsed (s)'], coverage_df['Coverage Overlap (%)'])
-        
-        all_interpolated_coverage.append(interpolated_coverage)
-        all_interpolated_overlap.append(interpolated_overlap)
+    # Every run on the grid in one batched pass per column
+    all_interpolated_coverage = interp_runs(time_points, *pack_runs(time_data))
+    all_interpolated_overlap = interp_runs(time_points, *pack_runs(coverage_data, 'Time Elapsed (s)', 'Coverage Overlap (%)'))
     
     avg_interpolated_coverage = np.mean(all_interpolated_coverage, axis=0)
     avg_interpolated_overlap = np.mean(all_interpolated_overlap, axis=0)
@@ -88,18 +86,29 @@ def interpolate_data(coverage_data, time_data):
     
     return avg_interpolated_coverage, avg_interpolated_overlap, std_interpolated_overlap
 
-def process_folder(folder, limit_first_five=True):
+# Average overlap per running-max coverage percent for WSR_OVERLAP_AXIS=coverage, all
+# runs binned in one pass, with the mean and std capped at 100%
+def overlap_on_coverage(coverage_data, time_data):
+    table = coverage_table(time_data, coverage_data)
+    avg_overlap = np.minimum(table['mean'].to_numpy(), 100)
+    std_overlap = np.minimum(np.nan_to_num(table['std'].to_numpy()), 100 - avg_overlap)
+    return table['coverage_percent'].to_numpy(), avg_overlap, std_overlap
+
+def process_folder(folder, limit_first_five=True, axis='time'):
     coverage_data = read_coverage_data(folder, limit_first_five)
     time_data = read_time_data(folder, limit_first_five)
     
-    avg_coverage, avg_overlap, std_overlap = interpolate_data(coverage_data, time_data)
+    if axis == 'coverage':
+        avg_coverage, avg_overlap, std_overlap = overlap_on_coverage(coverage_data, time_data)
+    else:
+        avg_coverage, avg_overlap, std_overlap = interpolate_data(coverage_data, time_data)
     
     return avg_coverage, avg_overlap, std_overlap
 
 # Process all folders with limiting for all folders
 all_results = {}
 for name, folder in folders.items():
-    avg_coverage, avg_overlap, std_overlap = process_folder(folder, limit_first_five=True)
+    avg_coverage, avg_overlap, std_overlap = process_folder(folder, limit_first_five=True, axis=overlap_axis())
     all_results[name] = (avg_coverage, avg_overlap, std_overlap)
 
 # Plotting all results on a single plot
@@ -1,9 +1,11 @@
 import os
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 
+from aligned_cache import aligned_matrix
+from run_store import open_store
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 17
@@ -23,33 +25,20 @@ colors = {
     'WSR': '#884E6D'
 }
 
-# Load data function
-def load_all_csv(directory):
-    data_frames = []
-    for filename in os.listdir(directory):
-        if filename.endswith(".csv"):
-            file_path = os.path.join(directory, filename)
-            df = pd.read_csv(file_path)
-            data_frames.append(df)
-    return data_frames
-
-# Average termination time and coverage calculations
-def average_termination_time(data_frames):
-    termination_times = [df['time_elapsed'].max() for df in data_frames]
+# Average termination time and coverage, read off the folder's memory-mapped run store
+def average_termination_time(store):
+    termination_times = store.run_max('time_elapsed')
     return np.mean(termination_times), termination_times
 
-def average_termination_coverage(data_frames):
-    termination_coverages = [df['coverage_percent'].iloc[-1] for df in data_frames]
+def average_termination_coverage(store):
+    termination_coverages = store.run_last('coverage_percent')
     return np.mean(termination_coverages)
 
 # Interpolation function
-def interpolate_coverage(data_frames, avg_term_time, avg_term_coverage):
+def interpolate_coverage(time_dir, avg_term_time, avg_term_coverage):
     time_points = np.linspace(0, avg_term_time, 100)
-    all_interpolated_coverage = []
-
-    for df in data_frames:
-        interpolated_coverage = np.interp(time_points, df['time_elapsed'], df['coverage_percent'])
-        all_interpolated_coverage.append(interpolated_coverage)
+    # Every run on the grid, memory-mapped from the aligned matrix cache
+    all_interpolated_coverage = aligned_matrix(time_dir, time_points)
 
     avg_interpolated_coverage = np.mean(all_interpolated_coverage, axis=0)
     std_interpolated_coverage = np.std(all_interpolated_coverage, axis=0)
@@ -69,10 +58,11 @@ def interpolate_coverage(data_frames, avg_term_time, avg_term_coverage):
 # Process all folders
 results = {}
 for name, folder in folders.items():
-    data_frames = load_all_csv(os.path.join(folder, 'time'))
-    avg_term_time, _ = average_termination_time(data_frames)
-    avg_term_coverage = min(average_termination_coverage(data_frames), 90)
-    time_points, avg_coverage, std_coverage = interpolate_coverage(data_frames, avg_term_time, avg_term_coverage)
+    time_dir = os.path.join(folder, 'time')
+    store = open_store(time_dir)
+    avg_term_time, _ = average_termination_time(store)
+    avg_term_coverage = min(average_termination_coverage(store), 90)
+    time_points, avg_coverage, std_coverage = interpolate_coverage(time_dir, avg_term_time, avg_term_coverage)
     results[name] = (time_points, avg_coverage, std_coverage)
 
 # Plotting all results on a single plot
@@ -5,6 +5,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 
+from coverage_grid import interp_runs, pack_runs
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 17
@@ -56,11 +58,8 @@ def average_termination_coverage(data_frames):
 # Interpolation function
 def interpolate_coverage(data_frames, avg_term_time, avg_term_coverage):
     time_points = np.linspace(0, avg_term_time, 100)
-    all_interpolated_coverage = []
-
-    for df in data_frames:
-        interpolated_coverage = np.interp(time_points, df['time_elapsed'], df['coverage_percent'])
-        all_interpolated_coverage.append(interpolated_coverage)
+    # Every run on the grid in one batched pass
+    all_interpolated_coverage = interp_runs(time_points, *pack_runs(data_frames))
 
     avg_interpolated_coverage = np.mean(all_interpolated_coverage, axis=0)
     std_interpolated_coverage = np.std(all_interpolated_coverage, axis=0)
@@ -0,0 +1,88 @@
+import os
+import re
+import json
+import hashlib
+import numpy as np
+
+from coverage_grid import interp_runs, pack_runs
+from run_store import open_store, store_path
+
+# (runs x grid) matrices of a folder interpolated onto a time grid, saved as .npy next to
+# the folder's run store and opened memory-mapped, so every worker process and notebook
+# reading the same matrix shares one page-cache copy instead of rebuilding it
+ALIGNED_VERSION = 1
+# Grids kept per folder and column pair. Grids derived from the data (e.g. up to the
+# average termination time) change whenever a run is added, so the least recently used
+# ones beyond this are removed
+MAX_GRIDS = 8
+
+
+def grid_key(points):
+    return hashlib.sha256(np.ascontiguousarray(points, dtype=np.float64).tobytes()).hexdigest()[:16]
+
+def _columns_slug(time_column, value_column):
+    return re.sub(r'[^A-Za-z0-9]+', '_', f'{time_column}__{value_column}').strip('_')
+
+# One file per folder, column pair and grid: <cache>/aligned/<folder>/<columns>_<points>_<grid hash>.npy
+def aligned_path(directory, points, time_column='time_elapsed', value_column='coverage_percent'):
+    return os.path.join(store_path(directory, 'aligned'), f'{_columns_slug(time_column, value_column)}_{len(points)}_{grid_key(points)}.npy')
+
+# Removes the least recently used grids of one column pair beyond keep, matrix and sidecar.
+# A reader that still has a removed matrix mapped keeps its pages until it closes it
+def _evict(directory, time_column, value_column, keep=MAX_GRIDS):
+    folder = store_path(directory, 'aligned')
+    pattern = re.compile(re.escape(_columns_slug(time_column, value_column)) + r'_\d+_[0-9a-f]{16}\.npy$')
+    used = []
+    for name in filter(pattern.match, os.listdir(folder)):
+        try:
+            used.append((os.stat(os.path.join(folder, name)).st_mtime_ns, os.path.join(folder, name)))
+        except FileNotFoundError:
+            pass
+    for _, path in sorted(used, reverse=True)[keep:]:
+        for stale in (path, os.path.splitext(path)[0] + '.json'):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+def _write_atomic(path, write):
+    tmp_path = f'{path}.tmp{os.getpid()}'
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+# np.interp of value_column over time_column for every run of directory at points, as a
+# read-only (runs x points) np.memmap in run file order. Built with interp_runs the first
+# time and rebuilt whenever the folder's run store sees a CSV added, removed or changed
+def aligned_matrix(directory, points, time_column='time_elapsed', value_column='coverage_percent'):
+    points = np.asarray(points, dtype=np.float64)
+    store = open_store(directory)
+    files = [[entry['name'], entry['signature']] for entry in store.manifest['files']]
+    path = aligned_path(directory, points, time_column, value_column)
+    meta_path = os.path.splitext(path)[0] + '.json'
+
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('version') == ALIGNED_VERSION and meta['files'] == files and os.path.exists(path):
+            # The mtime records the last use for _evict
+            os.utime(path)
+            return _open(path)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    matrix = interp_runs(points, *pack_runs(store.frames(), time_column, value_column))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write_atomic(path, lambda f: np.save(f, matrix))
+    _write_atomic(meta_path, lambda f: f.write(json.dumps({
+        'version': ALIGNED_VERSION, 'directory': directory, 'time_column': time_column,
+        'value_column': value_column, 'points': points.tolist(), 'files': files}).encode()))
+    _evict(directory, time_column, value_column)
+    return _open(path)
+
+# Empty matrices cannot be mapped, they are loaded instead
+def _open(path):
+    try:
+        return np.load(path, mmap_mode='r')
+    except ValueError:
+        return np.load(path)
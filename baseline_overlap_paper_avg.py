@@ -1,9 +1,10 @@
-import os
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 
+from coverage_axis import coverage_table
+from run_index import load_paired_runs
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 16
@@ -28,37 +29,32 @@ colors = {
     'WSR': '#6E954B'
 }
 
-def read_coverage_data(folder):
+def read_coverage_data(data_frames):
     coverage_data = []
-    for file_name in os.listdir(os.path.join(folder, 'coverage')):
-        if file_name.endswith('.csv'):
-            file_path = os.path.join(folder, 'coverage', file_name)
-            df = pd.read_csv(file_path)
-            df['Time Elapsed (s)'] = df['Time Elapsed (s)'].round()
-            df['Coverage Overlap (%)'] = df['Coverage Overlap (%)'].apply(lambda x: 5 if x <= 0 else x)
-            coverage_data.append(df[['Time Elapsed (s)', 'Coverage Overlap (%)']])
-    combined_coverage_df = pd.concat(coverage_data, ignore_index=True)
-    return combined_coverage_df
-
-def read_time_data(folder):
+    for df in data_frames:
+        df['Time Elapsed (s)'] = df['Time Elapsed (s)'].round()
+        df['Coverage Overlap (%)'] = df['Coverage Overlap (%)'].apply(lambda x: 5 if x <= 0 else x)
+        coverage_data.append(df[['Time Elapsed (s)', 'Coverage Overlap (%)']])
+    return coverage_data
+
+def read_time_data(data_frames):
     time_data = []
-    for file_name in os.listdir(os.path.join(folder, 'time')):
-        if file_name.endswith('.csv'):
-            file_path = os.path.join(folder, 'time', file_name)
-            df = pd.read_csv(file_path)
-            df['time_elapsed'] = df['time_elapsed'].round()
-            df['coverage_percent'] = df['coverage_percent'].round()
-            time_data.append(df[['time_elapsed', 'coverage_percent']])
-    combined_time_df = pd.concat(time_data, ignore_index=True)
-    return combined_time_df
+    for df in data_frames:
+        df['time_elapsed'] = df['time_elapsed'].round()
+        df['coverage_percent'] = df['coverage_percent'].round()
+        time_data.append(df[['time_elapsed', 'coverage_percent']])
+    return time_data
 
 def process_folder(folder):
-    coverage_df = read_coverage_data(folder)
-    time_df = read_time_data(folder)
-    
-    merged_df = pd.merge(coverage_df, time_df, left_on='Time Elapsed (s)', right_on='time_elapsed')
-    merged_df.drop(columns=['time_elapsed'], inplace=True)
-    grouped_df = merged_df.groupby('coverage_percent')['Coverage Overlap (%)'].agg(['mean', 'std']).reset_index()
+    # Pair coverage and time files by the run id in their names, so overlap is only
+    # matched to coverage of the same run
+    run_ids, runs = load_paired_runs(folder, ('coverage', 'time'))
+    coverage_data = read_coverage_data(runs['coverage'])
+    time_data = read_time_data(runs['time'])
+
+    # Mean and standard deviation of coverage overlap per coverage percent, every run
+    # re-indexed onto the running-max coverage axis, all runs binned in one pass
+    grouped_df = coverage_table(time_data, coverage_data)
     
     # Filter to include only coverage_percent between 10 and 90 (manual erorr before and after these points)
     filtered_df = grouped_df[(grouped_df['coverage_percent'] >= 10) & (grouped_df['coverage_percent'] <= 90)]
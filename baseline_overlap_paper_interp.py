@@ -1,12 +1,14 @@
-import os
-import pandas as pd
+import functools
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
 
-rcParams['font.family'] = 'serif'
-rcParams['font.serif'] = ['Times New Roman']
-rcParams['font.size'] = 17
+from batch_runner import run_groups
+from coverage_axis import coverage_table, table_bands
+from coverage_grid import interp_runs, pack_runs
+from figures import band_center, band_mode, fill_band, output_figure, overlap_axis
+from memo_cache import memoize
+from quantile_sketch import QuantileSketch
+from run_index import load_paired_runs
 
 # Define two sets of folders
 simulation_folders = {
@@ -21,46 +23,27 @@ hardware_folders = {
     'Baseline-2: Full Information Exchange': 'hw_env_1_baseline_2_consolodated',
 }
 
-# Used for plotting
-colors = {
-    'Baseline-1: Independent Exploration': '#CD797D',
-    'Baseline-2: Full Information Exchange': '#5B838F',
-    'WiSER-X': '#6E954B'
-}
-
-def read_coverage_data(folder):
+def read_coverage_data(data_frames):
     coverage_data = []
-    for file_name in os.listdir(os.path.join(folder, 'coverage')):
-        if file_name.endswith('.csv'):
-            file_path = os.path.join(folder, 'coverage', file_name)
-            df = pd.read_csv(file_path)
-            df['Time Elapsed (s)'] = df['Time Elapsed (s)'].round()
-            df['Coverage Overlap (%)'] = df['Coverage Overlap (%)'].apply(lambda x: 5 if x <= 0 else x)
-            coverage_data.append(df[['Time Elapsed (s)', 'Coverage Overlap (%)']])
+    for df in data_frames:
+        df['Time Elapsed (s)'] = df['Time Elapsed (s)'].round()
+        df['Coverage Overlap (%)'] = df['Coverage Overlap (%)'].apply(lambda x: 5 if x <= 0 else x)
+        coverage_data.append(df[['Time Elapsed (s)', 'Coverage Overlap (%)']])
     return coverage_data
 
-def read_time_data(folder):
+def read_time_data(data_frames):
     time_data = []
-    for file_name in os.listdir(os.path.join(folder, 'time')):
-        if file_name.endswith('.csv'):
-            file_path = os.path.join(folder, 'time', file_name)
-            df = pd.read_csv(file_path)
-            df['time_elapsed'] = df['time_elapsed'].round()
-            df['coverage_percent'] = df['coverage_percent'].round()
-            time_data.append(df[['time_elapsed', 'coverage_percent']])
+    for df in data_frames:
+        df['time_elapsed'] = df['time_elapsed'].round()
+        df['coverage_percent'] = df['coverage_percent'].round()
+        time_data.append(df[['time_elapsed', 'coverage_percent']])
     return time_data
 
 def interpolate_data(coverage_data, time_data):
     time_points = np.linspace(0, max(df['time_elapsed'].max() for df in time_data), 100)
-    all_interpolated_coverage = []
-    all_interpolated_overlap = []
-    
-    for coverage_df, time_df in zip(coverage_data, time_data):
-        interpolated_coverage = np.interp(time_points, time_df['time_elapsed'], time_df['coverage_percent'])
-        interpolated_overlap = np.interp(time_points, coverage_df['Time Elapsed (s)'], coverage_df['Coverage Overlap (%)'])
-        
-        all_interpolated_coverage.append(interpolated_coverage)
-        all_interpolated_overlap.append(interpolated_overlap)
+    # Every run on the grid in one batched pass per column
+    all_interpolated_coverage = interp_runs(time_points, *pack_runs(time_data))
+    all_interpolated_overlap = interp_runs(time_points, *pack_runs(coverage_data, 'Time Elapsed (s)', 'Coverage Overlap (%)'))
     
     avg_interpolated_coverage = np.mean(all_interpolated_coverage, axis=0)
     avg_interpolated_overlap = np.mean(all_interpolated_overlap, axis=0)
@@ -72,76 +55,115 @@ def interpolate_data(coverage_data, time_data):
     
     return avg_interpolated_coverage, avg_interpolated_overlap, std_interpolated_overlap
 
-def process_folder(folder):
-    coverage_data = read_coverage_data(folder)
-    time_data = read_time_data(folder)
+# Average overlap per running-max coverage percent for WSR_OVERLAP_AXIS=coverage, all
+# runs binned in one pass, with the mean and std capped at 100%
+def overlap_on_coverage(coverage_data, time_data):
+    table = coverage_table(time_data, coverage_data)
+    avg_overlap = np.minimum(table['mean'].to_numpy(), 100)
+    std_overlap = np.minimum(np.nan_to_num(table['std'].to_numpy()), 100 - avg_overlap)
+    return table['coverage_percent'].to_numpy(), avg_overlap, std_overlap
+
+# Quantile sketch of the overlap of every run on the same grid, for WSR_BANDS=quantile.
+# Runs are interpolated and added one at a time, the (runs x grid) matrix is never built
+def interpolate_bands(coverage_data, time_data):
+    time_points = np.linspace(0, max(df['time_elapsed'].max() for df in time_data), 100)
+    sketch = QuantileSketch(len(time_points))
+    for df in coverage_data:
+        sketch.update(np.interp(time_points, df['Time Elapsed (s)'], df['Coverage Overlap (%)']))
+    return sketch.bands()
+
+# Average overlap over the runs at the time the longest run terminates, where every
+# run holds its final value
+def termination_overlap(coverage_data, time_data):
+    end_time = np.array([max(df['time_elapsed'].max() for df in time_data)])
+    overlap = interp_runs(end_time, *pack_runs(coverage_data, 'Time Elapsed (s)', 'Coverage Overlap (%)'))
+    return min(overlap.mean(), 100)
+
+# Cached on disk, keyed on the folder's CSV file set, the axis and the source of the helpers below
+@memoize(depends=(read_coverage_data, read_time_data, interpolate_data, overlap_on_coverage, termination_overlap, coverage_table, interp_runs))
+def process_folder(folder, axis='time'):
+    # Pair coverage and time files by the run id in their names, not directory order
+    run_ids, runs = load_paired_runs(folder, ('coverage', 'time'))
+    coverage_data = read_coverage_data(runs['coverage'])
+    time_data = read_time_data(runs['time'])
     
-    avg_coverage, avg_overlap, std_overlap = interpolate_data(coverage_data, time_data)
+    if axis == 'coverage':
+        avg_coverage, avg_overlap, std_overlap = overlap_on_coverage(coverage_data, time_data)
+    else:
+        avg_coverage, avg_overlap, std_overlap = interpolate_data(coverage_data, time_data)
     
-    return avg_coverage, avg_overlap, std_overlap
-
-def process_folders_set(folders):
-    results = {}
-    for name, folder in folders.items():
-        avg_coverage, avg_overlap, std_overlap = process_folder(folder)
-        results[name] = (avg_coverage, avg_overlap, std_overlap)
-    return results
-
-simulation_results = process_folders_set(simulation_folders)
-hardware_results = process_folders_set(hardware_folders)
-
-# Calculate and print raw differences at termination for Simulation
-wsr_simulation_overlap = simulation_results['WiSER-X'][1][-1]
-baseline_1_simulation_overlap = simulation_results['Baseline-1: Independent Exploration'][1][-1]
-baseline_2_simulation_overlap = simulation_results['Baseline-2: Full Information Exchange'][1][-1]
-
-raw_diff_simulation_baseline_1 = wsr_simulation_overlap - baseline_1_simulation_overlap
-raw_diff_simulation_baseline_2 = wsr_simulation_overlap - baseline_2_simulation_overlap
-
-print(f"Raw Difference in Termination Coverage Overlap (Simulation) - WSR vs Baseline 1: {raw_diff_simulation_baseline_1:.2f}%")
-print(f"Raw Difference in Termination Coverage Overlap (Simulation) - WSR vs Baseline 2: {raw_diff_simulation_baseline_2:.2f}%")
-
-# Calculate and print raw differences at termination for Hardware
-wsr_hardware_overlap = hardware_results['WiSER-X'][1][-1]
-baseline_1_hardware_overlap = hardware_results['Baseline-1: Independent Exploration'][1][-1]
-baseline_2_hardware_overlap = hardware_results['Baseline-2: Full Information Exchange'][1][-1]
-
-raw_diff_hardware_baseline_1 = wsr_hardware_overlap - baseline_1_hardware_overlap
-raw_diff_hardware_baseline_2 = wsr_hardware_overlap - baseline_2_hardware_overlap
+    return avg_coverage, avg_overlap, std_overlap, termination_overlap(coverage_data, time_data)
 
-print(f"Raw Difference in Termination Coverage Overlap (Hardware) - WSR vs Baseline 1: {raw_diff_hardware_baseline_1:.2f}%")
-print(f"Raw Difference in Termination Coverage Overlap (Hardware) - WSR vs Baseline 2: {raw_diff_hardware_baseline_2:.2f}%")
+# Overlap quantiles on the same x-axis as process_folder for WSR_BANDS=quantile
+@memoize(depends=(read_coverage_data, read_time_data, interpolate_bands, coverage_table, table_bands, QuantileSketch))
+def process_folder_bands(folder, axis='time'):
+    run_ids, runs = load_paired_runs(folder, ('coverage', 'time'))
+    coverage_data, time_data = read_coverage_data(runs['coverage']), read_time_data(runs['time'])
+    if axis == 'coverage':
+        return table_bands(coverage_table(time_data, coverage_data, quantiles=True))
+    return interpolate_bands(coverage_data, time_data)
 
 # Plotting
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-
-# Simulation Results - Plot
-for name, (avg_coverage, avg_overlap, std_overlap) in simulation_results.items():
-    ax1.plot(avg_coverage, avg_overlap, label=f'{name}', color=colors[name], linewidth=3.5)
-    ax1.fill_between(avg_coverage, avg_overlap - std_overlap, avg_overlap + std_overlap, color=colors[name], alpha=0.2)
-
-ax1.spines['top'].set_visible(False)
-ax1.spines['right'].set_visible(False)
-ax1.set_xlabel('Total Map Coverage Percent')
-ax1.set_ylabel('Average Coverage Overlap (%)')
-ax1.set_title('Simulation')
-# ax1.set_xlim(5, 100)
-legend = ax1.legend(fontsize='x-small', loc='upper left')
-legend.get_frame().set_alpha(0.5)
-
-# Hardware Results - Plot
-for name, (avg_coverage, avg_overlap, std_overlap) in hardware_results.items():
-    ax2.plot(avg_coverage, avg_overlap, label=f'{name}', color=colors[name], linewidth=3.5)
-    ax2.fill_between(avg_coverage, avg_overlap - std_overlap, avg_overlap + std_overlap, color=colors[name], alpha=0.2)
-
-ax2.spines['top'].set_visible(False)
-ax2.spines['right'].set_visible(False)
-ax2.set_xlabel('Total Map Coverage Percent')
-ax2.set_ylabel('Average Coverage Overlap (%)')
-ax2.set_title('Hardware')
-ax2.set_xlim(5, 100)
-legend2 = ax2.legend(fontsize='x-small', loc='upper left')
-legend2.get_frame().set_alpha(0.5)
-
-plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-plt.show()
+def draw_overlap_panels(fig, aggregates):
+    colors = {
+        'Baseline-1: Independent Exploration': '#CD797D',
+        'Baseline-2: Full Information Exchange': '#5B838F',
+        'WiSER-X': '#6E954B'
+    }
+
+    axes = fig.subplots(1, 2)
+    for ax, (title, results) in zip(axes, aggregates.items()):
+        for name, (avg_coverage, avg_overlap, std_overlap, _) in results.items():
+            ax.plot(avg_coverage, band_center(avg_overlap, std_overlap), label=f'{name}', color=colors[name], linewidth=3.5)
+            fill_band(ax, avg_coverage, avg_overlap, std_overlap, color=colors[name], alpha=0.2)
+
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.set_xlabel('Total Map Coverage Percent')
+        ax.set_ylabel('Average Coverage Overlap (%)')
+        ax.set_title(title)
+        if title == 'Hardware':
+            ax.set_xlim(5, 100)
+        legend = ax.legend(fontsize='x-small', loc='upper left')
+        legend.get_frame().set_alpha(0.5)
+
+    fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+
+if __name__ == '__main__':
+    # Process every simulation and hardware folder in parallel
+    all_results = run_groups({'simulation': simulation_folders, 'hardware': hardware_folders}, functools.partial(process_folder, axis=overlap_axis()))
+    simulation_results = all_results['simulation']
+    hardware_results = all_results['hardware']
+
+    # Calculate and print raw differences at termination for Simulation
+    wsr_simulation_overlap = simulation_results['WiSER-X'][3]
+    baseline_1_simulation_overlap = simulation_results['Baseline-1: Independent Exploration'][3]
+    baseline_2_simulation_overlap = simulation_results['Baseline-2: Full Information Exchange'][3]
+
+    raw_diff_simulation_baseline_1 = wsr_simulation_overlap - baseline_1_simulation_overlap
+    raw_diff_simulation_baseline_2 = wsr_simulation_overlap - baseline_2_simulation_overlap
+
+    print(f"Raw Difference in Termination Coverage Overlap (Simulation) - WSR vs Baseline 1: {raw_diff_simulation_baseline_1:.2f}%")
+    print(f"Raw Difference in Termination Coverage Overlap (Simulation) - WSR vs Baseline 2: {raw_diff_simulation_baseline_2:.2f}%")
+
+    # Calculate and print raw differences at termination for Hardware
+    wsr_hardware_overlap = hardware_results['WiSER-X'][3]
+    baseline_1_hardware_overlap = hardware_results['Baseline-1: Independent Exploration'][3]
+    baseline_2_hardware_overlap = hardware_results['Baseline-2: Full Information Exchange'][3]
+
+    raw_diff_hardware_baseline_1 = wsr_hardware_overlap - baseline_1_hardware_overlap
+    raw_diff_hardware_baseline_2 = wsr_hardware_overlap - baseline_2_hardware_overlap
+
+    print(f"Raw Difference in Termination Coverage Overlap (Hardware) - WSR vs Baseline 1: {raw_diff_hardware_baseline_1:.2f}%")
+    print(f"Raw Difference in Termination Coverage Overlap (Hardware) - WSR vs Baseline 2: {raw_diff_hardware_baseline_2:.2f}%")
+
+    # Interquartile and 5-95% bands of the runs instead of the std with WSR_BANDS=quantile
+    if band_mode() == 'quantile':
+        bands = run_groups({'simulation': simulation_folders, 'hardware': hardware_folders}, functools.partial(process_folder_bands, axis=overlap_axis()))
+        simulation_results = {name: (avg_coverage, avg_overlap, bands['simulation'][name], end)
+                              for name, (avg_coverage, avg_overlap, _, end) in simulation_results.items()}
+        hardware_results = {name: (avg_coverage, avg_overlap, bands['hardware'][name], end)
+                            for name, (avg_coverage, avg_overlap, _, end) in hardware_results.items()}
+
+    output_figure('baseline_overlap_paper_interp', draw_overlap_panels,
+                  {'Simulation': simulation_results, 'Hardware': hardware_results}, figsize=(14, 6), font_size=17)
@@ -1,9 +1,10 @@
-import os
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 
+from aligned_cache import aligned_matrix
+from run_store import open_store
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 11
@@ -12,43 +13,32 @@ wsr_time_dir = 'wsr/time'
 baseline_1_time_dir = 'baseline_1/time'
 baseline_2_time_dir = 'baseline_2/time'
 
-def load_all_csv(directory):
-    data_frames = []
-    for filename in os.listdir(directory):
-        if filename.endswith(".csv"):
-            file_path = os.path.join(directory, filename)
-            df = pd.read_csv(file_path)
-            data_frames.append(df)
-    return data_frames
-
-wsr_data_frames = load_all_csv(wsr_time_dir)
-baseline_1_data_frames = load_all_csv(baseline_1_time_dir)
-baseline_2_data_frames = load_all_csv(baseline_2_time_dir)
-
-def average_termination_time(data_frames):
-    termination_times = [df['time_elapsed'].max() for df in data_frames]
+# Run stores of the folders, every column memory-mapped with the runs split by offsets
+wsr_store = open_store(wsr_time_dir)
+baseline_1_store = open_store(baseline_1_time_dir)
+baseline_2_store = open_store(baseline_2_time_dir)
+
+def average_termination_time(store):
+    termination_times = store.run_max('time_elapsed')
     return np.mean(termination_times)
 
-def average_termination_coverage(data_frames):
-    termination_coverages = [df['coverage_percent'].iloc[-1] for df in data_frames]
+def average_termination_coverage(store):
+    termination_coverages = store.run_last('coverage_percent')
     return np.mean(termination_coverages)
 
-avg_term_time_wsr = average_termination_time(wsr_data_frames)
-avg_term_time_baseline_1 = average_termination_time(baseline_1_data_frames)
-avg_term_time_baseline_2 = average_termination_time(baseline_2_data_frames)
+avg_term_time_wsr = average_termination_time(wsr_store)
+avg_term_time_baseline_1 = average_termination_time(baseline_1_store)
+avg_term_time_baseline_2 = average_termination_time(baseline_2_store)
 
-avg_term_coverage_wsr = min(average_termination_coverage(wsr_data_frames), 90)
-avg_term_coverage_baseline_1 = min(average_termination_coverage(baseline_1_data_frames), 90)
-avg_term_coverage_baseline_2 = min(average_termination_coverage(baseline_2_data_frames), 90)
+avg_term_coverage_wsr = min(average_termination_coverage(wsr_store), 90)
+avg_term_coverage_baseline_1 = min(average_termination_coverage(baseline_1_store), 90)
+avg_term_coverage_baseline_2 = min(average_termination_coverage(baseline_2_store), 90)
 
 # Interpolate coverage percent and calculate std deviation
-def interpolate_coverage(data_frames, avg_term_time, avg_term_coverage):
+def interpolate_coverage(time_dir, avg_term_time, avg_term_coverage):
     time_points = np.linspace(0, avg_term_time, 100)
-    all_interpolated_coverage = []
-
-    for df in data_frames:
-        interpolated_coverage = np.interp(time_points, df['time_elapsed'], df['coverage_percent'])
-        all_interpolated_coverage.append(interpolated_coverage)
+    # Every run on the grid, memory-mapped from the aligned matrix cache
+    all_interpolated_coverage = aligned_matrix(time_dir, time_points)
 
     avg_interpolated_coverage = np.mean(all_interpolated_coverage, axis=0)
     std_interpolated_coverage = np.std(all_interpolated_coverage, axis=0)
@@ -66,9 +56,9 @@ def interpolate_coverage(data_frames, avg_term_time, avg_term_coverage):
     return time_points, avg_interpolated_coverage, std_interpolated_coverage
 
 # Interpolate coverage percent
-time_points_wsr, avg_coverage_wsr, std_coverage_wsr = interpolate_coverage(wsr_data_frames, avg_term_time_wsr, avg_term_coverage_wsr)
-time_points_baseline_1, avg_coverage_baseline_1, std_coverage_baseline_1 = interpolate_coverage(baseline_1_data_frames, avg_term_time_baseline_1, avg_term_coverage_baseline_1)
-time_points_baseline_2, avg_coverage_baseline_2, std_coverage_baseline_2 = interpolate_coverage(baseline_2_data_frames, avg_term_time_baseline_2, avg_term_coverage_baseline_2)
+time_points_wsr, avg_coverage_wsr, std_coverage_wsr = interpolate_coverage(wsr_time_dir, avg_term_time_wsr, avg_term_coverage_wsr)
+time_points_baseline_1, avg_coverage_baseline_1, std_coverage_baseline_1 = interpolate_coverage(baseline_1_time_dir, avg_term_time_baseline_1, avg_term_coverage_baseline_1)
+time_points_baseline_2, avg_coverage_baseline_2, std_coverage_baseline_2 = interpolate_coverage(baseline_2_time_dir, avg_term_time_baseline_2, avg_term_coverage_baseline_2)
 
 # PLOTTING
 plt.figure(figsize=(12, 6))
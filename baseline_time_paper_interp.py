@@ -1,12 +1,10 @@
 import os
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
 
-rcParams['font.family'] = 'serif'
-rcParams['font.serif'] = ['Times New Roman']
-rcParams['font.size'] = 17
+from figures import band_center, band_mode, fill_band, output_figure
+from memo_cache import memoize
+from method_comparison import compare_folders
+from run_partials import update_partials
 
 # Define directories for each data set
 wsr_time_dir_set_1 = 'wsr_near_far/time'
@@ -17,60 +15,51 @@ wsr_time_dir_set_2 = 'hw_wsr_consolodated/time'
 baseline_1_time_dir_set_2 = 'hw_baseline_consolodated/time'
 baseline_2_time_dir_set_2 = 'hw_env_1_baseline_2_consolodated/time'
 
-def load_all_csv(directory):
-    data_frames = []
-    for filename in os.listdir(directory):
-        if filename.endswith(".csv"):
-            file_path = os.path.join(directory, filename)
-            df = pd.read_csv(file_path)
-            data_frames.append(df)
-    return data_frames
-
-# Load data for both sets
-wsr_data_frames_set_1 = load_all_csv(wsr_time_dir_set_1)
-baseline_1_data_frames_set_1 = load_all_csv(baseline_1_time_dir_set_1)
-baseline_2_data_frames_set_1 = load_all_csv(baseline_2_time_dir_set_1)
-
-wsr_data_frames_set_2 = load_all_csv(wsr_time_dir_set_2)
-baseline_1_data_frames_set_2 = load_all_csv(baseline_1_time_dir_set_2)
-baseline_2_data_frames_set_2 = load_all_csv(baseline_2_time_dir_set_2)
-
-def average_termination_time(data_frames):
-    termination_times = [df['time_elapsed'].max() for df in data_frames]
+# Load per-run partials for both sets, only runs added or changed since the last call are read
+wsr_partials_set_1 = update_partials(wsr_time_dir_set_1)
+baseline_1_partials_set_1 = update_partials(baseline_1_time_dir_set_1)
+baseline_2_partials_set_1 = update_partials(baseline_2_time_dir_set_1)
+
+wsr_partials_set_2 = update_partials(wsr_time_dir_set_2)
+baseline_1_partials_set_2 = update_partials(baseline_1_time_dir_set_2)
+baseline_2_partials_set_2 = update_partials(baseline_2_time_dir_set_2)
+
+def average_termination_time(partials):
+    termination_times = partials.termination_times()
     return np.mean(termination_times), termination_times
 
-def average_termination_coverage(data_frames):
-    termination_coverages = [df['coverage_percent'].iloc[-1] for df in data_frames]
+def average_termination_coverage(partials):
+    termination_coverages = partials.termination_coverages()
     return np.mean(termination_coverages)
 
 # Calculate average termination time and coverage for both sets
-avg_term_time_wsr_set_1, term_times_wsr_set_1 = average_termination_time(wsr_data_frames_set_1)
-avg_term_time_baseline_1_set_1, term_times_baseline_1_set_1 = average_termination_time(baseline_1_data_frames_set_1)
-avg_term_time_baseline_2_set_1, term_times_baseline_2_set_1 = average_termination_time(baseline_2_data_frames_set_1)
-
-avg_term_coverage_wsr_set_1 = min(average_termination_coverage(wsr_data_frames_set_1), 90)
-avg_term_coverage_baseline_1_set_1 = min(average_termination_coverage(baseline_1_data_frames_set_1), 90)
-avg_term_coverage_baseline_2_set_1 = min(average_termination_coverage(baseline_2_data_frames_set_1), 90)
-
-avg_term_time_wsr_set_2, term_times_wsr_set_2 = average_termination_time(wsr_data_frames_set_2)
-avg_term_time_baseline_1_set_2, term_times_baseline_1_set_2 = average_termination_time(baseline_1_data_frames_set_2)
-avg_term_time_baseline_2_set_2, term_times_baseline_2_set_2 = average_termination_time(baseline_2_data_frames_set_2)
-
-avg_term_coverage_wsr_set_2 = min(average_termination_coverage(wsr_data_frames_set_2), 90)
-avg_term_coverage_baseline_1_set_2 = min(average_termination_coverage(baseline_1_data_frames_set_2), 90)
-avg_term_coverage_baseline_2_set_2 = min(average_termination_coverage(baseline_2_data_frames_set_2), 90)
-
-# Interpolate coverage percent and calculate std deviation
-def interpolate_coverage(data_frames, avg_term_time, avg_term_coverage):
+avg_term_time_wsr_set_1, term_times_wsr_set_1 = average_termination_time(wsr_partials_set_1)
+avg_term_time_baseline_1_set_1, term_times_baseline_1_set_1 = average_termination_time(baseline_1_partials_set_1)
+avg_term_time_baseline_2_set_1, term_times_baseline_2_set_1 = average_termination_time(baseline_2_partials_set_1)
+
+avg_term_coverage_wsr_set_1 = min(average_termination_coverage(wsr_partials_set_1), 90)
+avg_term_coverage_baseline_1_set_1 = min(average_termination_coverage(baseline_1_partials_set_1), 90)
+avg_term_coverage_baseline_2_set_1 = min(average_termination_coverage(baseline_2_partials_set_1), 90)
+
+avg_term_time_wsr_set_2, term_times_wsr_set_2 = average_termination_time(wsr_partials_set_2)
+avg_term_time_baseline_1_set_2, term_times_baseline_1_set_2 = average_termination_time(baseline_1_partials_set_2)
+avg_term_time_baseline_2_set_2, term_times_baseline_2_set_2 = average_termination_time(baseline_2_partials_set_2)
+
+avg_term_coverage_wsr_set_2 = min(average_termination_coverage(wsr_partials_set_2), 90)
+avg_term_coverage_baseline_1_set_2 = min(average_termination_coverage(baseline_1_partials_set_2), 90)
+avg_term_coverage_baseline_2_set_2 = min(average_termination_coverage(baseline_2_partials_set_2), 90)
+
+# Mean and std of coverage percent at the time points, read off the folder statistics the
+# partials keep up to date one run at a time. Runs are linear between the partial grid
+# points, so the mean is exact there and the std is interpolated between them.
+# Cached on disk, keyed on the folder's CSV file set, the arguments and the band mode
+@memoize()
+def interpolate_coverage(time_dir, avg_term_time, avg_term_coverage, bands='std'):
+    partials = update_partials(time_dir)
     time_points = np.linspace(0, avg_term_time, 100)
-    all_interpolated_coverage = []
-
-    for df in data_frames:
-        interpolated_coverage = np.interp(time_points, df['time_elapsed'], df['coverage_percent'])
-        all_interpolated_coverage.append(interpolated_coverage)
-
-    avg_interpolated_coverage = np.mean(all_interpolated_coverage, axis=0)
-    std_interpolated_coverage = np.std(all_interpolated_coverage, axis=0)
+    grid, grid_mean, grid_std = partials.grid_mean_std()
+    avg_interpolated_coverage = np.interp(time_points, grid, grid_mean)
+    std_interpolated_coverage = np.interp(time_points, grid, grid_std)
 
     # Find the point where the average coverage reaches 90 or the average termination coverage, whichever is first
     for i in range(len(avg_interpolated_coverage)):
@@ -81,100 +70,96 @@ def interpolate_coverage(data_frames, avg_term_time, avg_term_coverage):
             avg_interpolated_coverage[-1] = avg_term_coverage
             std_interpolated_coverage[-1] = 0
             break
+
+    # Interquartile and 5-95% bands of the runs instead of the std with WSR_BANDS=quantile.
+    # The median is drawn as it is, only the mean's endpoint is forced to the termination coverage
+    if bands == 'quantile':
+        return time_points, avg_interpolated_coverage, partials.sketch(time_points).bands()
     
     return time_points, avg_interpolated_coverage, std_interpolated_coverage
 
 # Interpolate coverage percent for both sets
-time_points_wsr_set_1, avg_coverage_wsr_set_1, std_coverage_wsr_set_1 = interpolate_coverage(wsr_data_frames_set_1, avg_term_time_wsr_set_1, avg_term_coverage_wsr_set_1)
-time_points_baseline_1_set_1, avg_coverage_baseline_1_set_1, std_coverage_baseline_1_set_1 = interpolate_coverage(baseline_1_data_frames_set_1, avg_term_time_baseline_1_set_1, avg_term_coverage_baseline_1_set_1)
-time_points_baseline_2_set_1, avg_coverage_baseline_2_set_1, std_coverage_baseline_2_set_1 = interpolate_coverage(baseline_2_data_frames_set_1, avg_term_time_baseline_2_set_1, avg_term_coverage_baseline_2_set_1)
+time_points_wsr_set_1, avg_coverage_wsr_set_1, std_coverage_wsr_set_1 = interpolate_coverage(wsr_time_dir_set_1, avg_term_time_wsr_set_1, avg_term_coverage_wsr_set_1, band_mode())
+time_points_baseline_1_set_1, avg_coverage_baseline_1_set_1, std_coverage_baseline_1_set_1 = interpolate_coverage(baseline_1_time_dir_set_1, avg_term_time_baseline_1_set_1, avg_term_coverage_baseline_1_set_1, band_mode())
+time_points_baseline_2_set_1, avg_coverage_baseline_2_set_1, std_coverage_baseline_2_set_1 = interpolate_coverage(baseline_2_time_dir_set_1, avg_term_time_baseline_2_set_1, avg_term_coverage_baseline_2_set_1, band_mode())
 
-time_points_wsr_set_2, avg_coverage_wsr_set_2, std_coverage_wsr_set_2 = interpolate_coverage(wsr_data_frames_set_2, avg_term_time_wsr_set_2, avg_term_coverage_wsr_set_2)
-time_points_baseline_1_set_2, avg_coverage_baseline_1_set_2, std_coverage_baseline_1_set_2 = interpolate_coverage(baseline_1_data_frames_set_2, avg_term_time_baseline_1_set_2, avg_term_coverage_baseline_1_set_2)
-time_points_baseline_2_set_2, avg_coverage_baseline_2_set_2, std_coverage_baseline_2_set_2 = interpolate_coverage(baseline_2_data_frames_set_2, avg_term_time_baseline_2_set_2, avg_term_coverage_baseline_2_set_2)
+time_points_wsr_set_2, avg_coverage_wsr_set_2, std_coverage_wsr_set_2 = interpolate_coverage(wsr_time_dir_set_2, avg_term_time_wsr_set_2, avg_term_coverage_wsr_set_2, band_mode())
+time_points_baseline_1_set_2, avg_coverage_baseline_1_set_2, std_coverage_baseline_1_set_2 = interpolate_coverage(baseline_1_time_dir_set_2, avg_term_time_baseline_1_set_2, avg_term_coverage_baseline_1_set_2, band_mode())
+time_points_baseline_2_set_2, avg_coverage_baseline_2_set_2, std_coverage_baseline_2_set_2 = interpolate_coverage(baseline_2_time_dir_set_2, avg_term_time_baseline_2_set_2, avg_term_coverage_baseline_2_set_2, band_mode())
 
 # PLOTTING
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-
-baseline_1 = '#CD797D'
-wsr_line = '#6E954B'
-baseline_2 = '#5B838F'
-
-# Plot for Set 1
-ax1.plot(time_points_baseline_1_set_1, avg_coverage_baseline_1_set_1, linewidth=3.5, color=baseline_1, label='Baseline-1: Independent Exploration')
-ax1.fill_between(time_points_baseline_1_set_1, avg_coverage_baseline_1_set_1 - std_coverage_baseline_1_set_1, avg_coverage_baseline_1_set_1 + std_coverage_baseline_1_set_1, color=baseline_1, alpha=0.2)
-
-ax1.plot(time_points_wsr_set_1, avg_coverage_wsr_set_1, color=wsr_line, linewidth=3.5, label='WiSER-X')
-ax1.fill_between(time_points_wsr_set_1, avg_coverage_wsr_set_1 - std_coverage_wsr_set_1, avg_coverage_wsr_set_1 + std_coverage_wsr_set_1, color=wsr_line, alpha=0.2)
-
-ax1.plot(time_points_baseline_2_set_1, avg_coverage_baseline_2_set_1, linewidth=3.5, color=baseline_2, label='Baseline-2: Full Information Exchange')
-ax1.fill_between(time_points_baseline_2_set_1, avg_coverage_baseline_2_set_1 - std_coverage_baseline_2_set_1, avg_coverage_baseline_2_set_1 + std_coverage_baseline_2_set_1, color=baseline_2, alpha=0.2)
-
-ax1.scatter([time_points_wsr_set_1[-1]], [avg_coverage_wsr_set_1[-1]], color='green', s=60, edgecolor='black', zorder=7)
-ax1.scatter([time_points_baseline_1_set_1[-1]], [avg_coverage_baseline_1_set_1[-1]], s=60, color='red', edgecolor='black', zorder=7)
-ax1.scatter([time_points_baseline_2_set_1[-1]], [avg_coverage_baseline_2_set_1[-1]], s=60, color='blue', edgecolor='black', zorder=7)
-
-# Adding vertical lines for Set 1
-ax1.vlines(x=time_points_wsr_set_1[-1], ymin=0, ymax=avg_coverage_wsr_set_1[-1], colors='green', linestyles='dashed')
-ax1.vlines(x=time_points_baseline_1_set_1[-1], ymin=0, ymax=avg_coverage_baseline_1_set_1[-1], colors='red', linestyles='dashed')
-ax1.vlines(x=time_points_baseline_2_set_1[-1], ymin=0, ymax=avg_coverage_baseline_2_set_1[-1], colors='blue', linestyles='dashed')
-
-ax1.set_xlabel('Time Elapsed (s)')
-ax1.set_ylabel('Map Coverage Percent')
-ax1.set_title('Simulation')
-ax1.set_ylim(0, 100)
-ax1.set_yticks(np.arange(0, 101, 10))  # Correct method for setting yticks
-legend = ax1.legend(fontsize='x-small', loc='upper left')
-legend.get_frame().set_alpha(0.3)
-
-# Plot for Set 2
-ax2.plot(time_points_baseline_1_set_2, avg_coverage_baseline_1_set_2, linewidth=3.5, color=baseline_1, label='Baseline-1: Independent Exploration', zorder=1)
-ax2.fill_between(time_points_baseline_1_set_2, avg_coverage_baseline_1_set_2 - std_coverage_baseline_1_set_2, avg_coverage_baseline_1_set_2 + std_coverage_baseline_1_set_2, color=baseline_1, alpha=0.2, zorder=1)
-
-ax2.plot(time_points_wsr_set_2, avg_coverage_wsr_set_2, color=wsr_line, linewidth=3.5, label='WiSER-X', zorder=1)
-ax2.fill_between(time_points_wsr_set_2, avg_coverage_wsr_set_2 - std_coverage_wsr_set_2, avg_coverage_wsr_set_2 + std_coverage_wsr_set_2, color=wsr_line, alpha=0.2, zorder=1)
-
-ax2.plot(time_points_baseline_2_set_2, avg_coverage_baseline_2_set_2, linewidth=3.5, color=baseline_2, label='Baseline-2: Full Information Exchange', zorder=1)
-ax2.fill_between(time_points_baseline_2_set_2, avg_coverage_baseline_2_set_2 - std_coverage_baseline_2_set_2, avg_coverage_baseline_2_set_2 + std_coverage_baseline_2_set_2, color=baseline_2, alpha=0.2, zorder=1)
-
-# Adjust zorder for scatter points to ensure they are on top
-ax2.scatter([time_points_wsr_set_2[-1]], [avg_coverage_wsr_set_2[-1]], color='green', s=60, edgecolor='black', zorder=3)
-ax2.scatter([time_points_baseline_1_set_2[-1]], [avg_coverage_baseline_1_set_2[-1]], s=60, color='red', edgecolor='black', zorder=3)
-ax2.scatter([time_points_baseline_2_set_2[-1]], [avg_coverage_baseline_2_set_2[-1]], s=60, color='blue', edgecolor='black', zorder=3)
-
-# Adding vertical lines for Set 2 with appropriate zorder
-ax2.vlines(x=time_points_wsr_set_2[-1], ymin=0, ymax=avg_coverage_wsr_set_2[-1], colors='green', linestyles='dashed', zorder=2)
-ax2.vlines(x=time_points_baseline_1_set_2[-1], ymin=0, ymax=avg_coverage_baseline_1_set_2[-1], colors='red', linestyles='dashed', zorder=2)
-ax2.vlines(x=time_points_baseline_2_set_2[-1], ymin=0, ymax=avg_coverage_baseline_2_set_2[-1], colors='blue', linestyles='dashed', zorder=2)
-
-ax2.set_xlabel('Time Elapsed (s)')
-ax2.set_ylabel('Map Coverage Percent')
-ax2.set_title('Hardware')
-ax2.set_ylim(0, 100)
-ax2.set_yticks(np.arange(0, 101, 10))
-legend2 = ax2.legend(fontsize='x-small', loc='upper left')
-legend2.get_frame().set_alpha(0.3)
-
-# Remove top and right spines for both plots
-for ax in [ax1, ax2]:
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-
-plt.tight_layout(rect=[0.05, 0.05, 1, 0.95])
-
-plt.show()
+def draw_coverage_panels(fig, aggregates):
+    # (key, label, line color, end point color)
+    methods = [
+        ('baseline_1', 'Baseline-1: Independent Exploration', '#CD797D', 'red'),
+        ('wsr', 'WiSER-X', '#6E954B', 'green'),
+        ('baseline_2', 'Baseline-2: Full Information Exchange', '#5B838F', 'blue'),
+    ]
+
+    axes = fig.subplots(1, 2)
+    for ax, (title, panel) in zip(axes, aggregates.items()):
+        for key, label, color, _ in methods:
+            time_points, avg_coverage, std_coverage = panel[key]
+            ax.plot(time_points, band_center(avg_coverage, std_coverage), linewidth=3.5, color=color, label=label, zorder=1)
+            fill_band(ax, time_points, avg_coverage, std_coverage, color=color, alpha=0.2, zorder=1)
+
+        # End points and vertical lines on top of the bands
+        # at the end of the drawn center line, the median's own last value in quantile mode
+        for key, _, _, end_color in methods:
+            time_points, avg_coverage, std_coverage = panel[key]
+            end_coverage = band_center(avg_coverage, std_coverage)[-1]
+            ax.scatter([time_points[-1]], [end_coverage], color=end_color, s=60, edgecolor='black', zorder=3)
+            ax.vlines(x=time_points[-1], ymin=0, ymax=end_coverage, colors=end_color, linestyles='dashed', zorder=2)
+
+        ax.set_xlabel('Time Elapsed (s)')
+        ax.set_ylabel('Map Coverage Percent')
+        ax.set_title(title)
+        ax.set_ylim(0, 100)
+        ax.set_yticks(np.arange(0, 101, 10))
+        legend = ax.legend(fontsize='x-small', loc='upper left')
+        legend.get_frame().set_alpha(0.3)
+
+        # Remove top and right spines
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+
+    fig.tight_layout(rect=[0.05, 0.05, 1, 0.95])
+
+coverage_panels = {
+    'Simulation': {
+        'baseline_1': (time_points_baseline_1_set_1, avg_coverage_baseline_1_set_1, std_coverage_baseline_1_set_1),
+        'wsr': (time_points_wsr_set_1, avg_coverage_wsr_set_1, std_coverage_wsr_set_1),
+        'baseline_2': (time_points_baseline_2_set_1, avg_coverage_baseline_2_set_1, std_coverage_baseline_2_set_1),
+    },
+    'Hardware': {
+        'baseline_1': (time_points_baseline_1_set_2, avg_coverage_baseline_1_set_2, std_coverage_baseline_1_set_2),
+        'wsr': (time_points_wsr_set_2, avg_coverage_wsr_set_2, std_coverage_wsr_set_2),
+        'baseline_2': (time_points_baseline_2_set_2, avg_coverage_baseline_2_set_2, std_coverage_baseline_2_set_2),
+    },
+}
+
+output_figure('baseline_time_paper_interp', draw_coverage_panels, coverage_panels, figsize=(14, 6), font_size=17)
+
+# Compare the methods run against run within each start location (near / far, loc_1 / loc_3)
+# instead of zipping file lists that differ in order and length. Falls back to unpaired means
+comparison_set_1 = compare_folders(
+    {'wsr': os.path.dirname(wsr_time_dir_set_1), 'baseline_1': os.path.dirname(baseline_1_time_dir_set_1), 'baseline_2': os.path.dirname(baseline_2_time_dir_set_1)},
+    {'wsr': term_times_wsr_set_1, 'baseline_1': term_times_baseline_1_set_1, 'baseline_2': term_times_baseline_2_set_1})
+comparison_set_2 = compare_folders(
+    {'wsr': os.path.dirname(wsr_time_dir_set_2), 'baseline_1': os.path.dirname(baseline_1_time_dir_set_2), 'baseline_2': os.path.dirname(baseline_2_time_dir_set_2)},
+    {'wsr': term_times_wsr_set_2, 'baseline_1': term_times_baseline_1_set_2, 'baseline_2': term_times_baseline_2_set_2})
 
 # Calculate average percent time that WSR terminates before Baseline 1
-percent_time_wsr_before_baseline_1_set_1 = np.mean([(b1 - wsr) / b1 * 100 for wsr, b1 in zip(term_times_wsr_set_1, term_times_baseline_1_set_1)])
-percent_time_wsr_before_baseline_1_set_2 = np.mean([(b1 - wsr) / b1 * 100 for wsr, b1 in zip(term_times_wsr_set_2, term_times_baseline_1_set_2)])
+percent_time_wsr_before_baseline_1_set_1 = comparison_set_1.percent_difference().loc['wsr', 'baseline_1']
+percent_time_wsr_before_baseline_1_set_2 = comparison_set_2.percent_difference().loc['wsr', 'baseline_1']
 
 # Calculate average percent time that Baseline 2 terminates before WSR
-percent_time_baseline_2_before_wsr_set_1 = np.mean([(wsr - b2) / wsr * 100 for wsr, b2 in zip(term_times_wsr_set_1, term_times_baseline_2_set_1)])
-percent_time_baseline_2_before_wsr_set_2 = np.mean([(wsr - b2) / wsr * 100 for wsr, b2 in zip(term_times_wsr_set_2, term_times_baseline_2_set_2)])
+percent_time_baseline_2_before_wsr_set_1 = comparison_set_1.percent_difference().loc['baseline_2', 'wsr']
+percent_time_baseline_2_before_wsr_set_2 = comparison_set_2.percent_difference().loc['baseline_2', 'wsr']
 
 # Calculate how many times faster WSR terminates than Baseline 1
-wsr_faster_than_baseline_1_set_1 = np.mean([b1 / wsr for wsr, b1 in zip(term_times_wsr_set_1, term_times_baseline_1_set_1)])
-wsr_faster_than_baseline_1_set_2 = np.mean([b1 / wsr for wsr, b1 in zip(term_times_wsr_set_2, term_times_baseline_1_set_2)])
+wsr_faster_than_baseline_1_set_1 = comparison_set_1.ratio().loc['wsr', 'baseline_1']
+wsr_faster_than_baseline_1_set_2 = comparison_set_2.ratio().loc['wsr', 'baseline_1']
 
 # Print the results for Set 1
 print(f"Average Termination Time (Set 1) - WSR: {avg_term_time_wsr_set_1:.2f} s")
@@ -191,3 +176,11 @@ print(f"Average Termination Time (Set 2) - Baseline 2: {avg_term_time_baseline_2
 print(f"Average Percent Time WSR Terminates Before Baseline 1 (Set 2): {percent_time_wsr_before_baseline_1_set_2:.2f}%")
 print(f"Average Percent Time Baseline 2 Terminates Before WSR (Set 2): {percent_time_baseline_2_before_wsr_set_2:.2f}%")
 print(f"WSR is {wsr_faster_than_baseline_1_set_2:.2f} times faster than Baseline 1 (Set 2)")
+
+# 95% bootstrap confidence intervals, runs resampled within their start location
+for set_name, comparison in [('Set 1', comparison_set_1), ('Set 2', comparison_set_2)]:
+    percent_low, percent_high = comparison.percent_difference_ci(n_boot=100000)
+    ratio_low, ratio_high = comparison.ratio_ci(n_boot=100000)
+    print(f"95% CI of Percent Time WSR Terminates Before Baseline 1 ({set_name}): [{percent_low.loc['wsr', 'baseline_1']:.2f}, {percent_high.loc['wsr', 'baseline_1']:.2f}]%")
+    print(f"95% CI of Percent Time Baseline 2 Terminates Before WSR ({set_name}): [{percent_low.loc['baseline_2', 'wsr']:.2f}, {percent_high.loc['baseline_2', 'wsr']:.2f}]%")
+    print(f"95% CI of WSR Speedup over Baseline 1 ({set_name}): [{ratio_low.loc['wsr', 'baseline_1']:.2f}, {ratio_high.loc['wsr', 'baseline_1']:.2f}]x")
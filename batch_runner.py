@@ -0,0 +1,43 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Start method of the worker pools: the platform default (fork on Linux, spawn on macOS
+# and Windows) unless WSR_START_METHOD names another. Spawned workers re-import the
+# calling script, so scripts that start a pool keep their top-level work under an
+# if __name__ == '__main__': guard and hand over module-level functions
+def mp_context():
+    method = os.environ.get('WSR_START_METHOD')
+    return multiprocessing.get_context(method) if method else None
+
+# Pool size when the caller does not pass one: WSR_MAX_WORKERS, or one per CPU
+def default_workers():
+    value = os.environ.get('WSR_MAX_WORKERS')
+    return int(value) if value else None
+
+# Runs func(folder) for every folder of every experiment group on a process pool.
+# groups is {group: {label: folder}}, the same dicts the scripts already declare
+# (simulation_folders, hardware_folders, ...), and the results are merged back in
+# the parent in the same shape and order. A folder shared by several groups is only
+# processed once
+def run_groups(groups, func, max_workers=None):
+    tasks = [(group, label, folder) for group, folders in groups.items() for label, folder in folders.items()]
+    unique_folders = list(dict.fromkeys(folder for _, _, folder in tasks))
+    max_workers = default_workers() if max_workers is None else max_workers
+
+    if max_workers == 1 or len(unique_folders) <= 1:
+        outputs = [func(folder) for folder in unique_folders]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context()) as executor:
+            outputs = list(executor.map(func, unique_folders))
+    by_folder = dict(zip(unique_folders, outputs))
+
+    results = {group: {} for group in groups}
+    for group, label, folder in tasks:
+        results[group][label] = by_folder[folder]
+    return results
+
+# Single group shortcut for scripts that only declare one folders dict
+def run_folders(folders, func, max_workers=None):
+    return run_groups({None: folders}, func, max_workers)[None]
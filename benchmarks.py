@@ -0,0 +1,265 @@
+import os
+import ast
+import json
+import time
+import shutil
+import argparse
+import platform
+import tracemalloc
+
+import numpy as np
+
+from aligned_cache import aligned_matrix
+from coverage_grid import align_runs, asof_coverage, grid_mean_std, interp_runs, pack_runs
+from failure_alignment import FailureRuns
+from quantile_sketch import QuantileSketch, merge_all
+from robots import fleet_summary
+from run_index import load_paired_runs
+from run_partials import PARTIALS_DIR, update_partials
+from run_store import CACHE_ROOT, load_all_csv, store_path
+from running_stats import RunningStats
+from synthetic_runs import generate_corpus
+
+# Generated corpora are kept here and reused across benchmark runs
+CORPUS_DIR = os.path.join(CACHE_ROOT, 'synthetic')
+
+
+# The analysis scripts run everything at import time, so only their imports and
+# function definitions are executed. Memoized functions are unwrapped so every
+# call is measured, not a cache hit
+def load_script_functions(script):
+    with open(script) as f:
+        tree = ast.parse(f.read(), script)
+    tree.body = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef))]
+    namespace = {'__name__': os.path.splitext(os.path.basename(script))[0], '__file__': script}
+    exec(compile(tree, script, 'exec'), namespace)
+    return {name: getattr(value, '__wrapped__', value) for name, value in namespace.items()
+            if callable(value) and getattr(value, '__module__', None) == namespace['__name__']}
+
+def corpus_folder(n_runs, n_robots, sample_rate, failure_rate, seed=0):
+    name = f'runs{n_runs}_robots{n_robots}_rate{sample_rate:g}_fail{failure_rate:g}_seed{seed}'
+    folder = os.path.join(CORPUS_DIR, name)
+    time_dir = os.path.join(folder, 'time')
+    if not os.path.isdir(time_dir) or len(os.listdir(time_dir)) != n_runs:
+        shutil.rmtree(folder, ignore_errors=True)
+        generate_corpus(folder, n_runs, n_robots, sample_rate, failure_rate, seed)
+    return folder
+
+
+# Each benchmark takes a corpus folder and returns (setup, run), or None when the
+# corpus has nothing for it (e.g. no failure files). setup is called before every
+# repetition and is not timed
+def bench_load_all_csv_cold(folder):
+    time_dir = os.path.join(folder, 'time')
+    return lambda: shutil.rmtree(store_path(time_dir), ignore_errors=True), lambda: load_all_csv(time_dir)
+
+def bench_load_all_csv_warm(folder):
+    time_dir = os.path.join(folder, 'time')
+    load_all_csv(time_dir)
+    return None, lambda: load_all_csv(time_dir)
+
+def bench_load_paired_runs(folder):
+    load_paired_runs(folder, ('coverage', 'time'))
+    return None, lambda: load_paired_runs(folder, ('coverage', 'time'))
+
+def bench_align_runs(folder):
+    data_frames = load_all_csv(os.path.join(folder, 'time'))
+    for df in data_frames:
+        df['time_elapsed'] = df['time_elapsed'].round().astype(int)
+    avg_termination_coverage = np.mean([df['coverage_percent'].max() for df in data_frames])
+    avg_time_elapsed = int(np.mean([df['time_elapsed'].max() for df in data_frames]))
+
+    def run():
+        seconds, grid = align_runs(data_frames, avg_time_elapsed, avg_termination_coverage)
+        return grid_mean_std(grid[:, :avg_time_elapsed + 1])
+    return None, run
+
+def bench_interpolate_coverage(folder):
+    functions = load_script_functions('baseline_time_paper_interp.py')
+    time_dir = os.path.join(folder, 'time')
+    partials = update_partials(time_dir)
+    avg_term_time, _ = functions['average_termination_time'](partials)
+    avg_term_coverage = min(functions['average_termination_coverage'](partials), 90)
+    return None, lambda: functions['interpolate_coverage'](time_dir, avg_term_time, avg_term_coverage)
+
+# Batched interpolation of every run onto the 100-point grid, into a reused output buffer
+def bench_interp_runs(folder):
+    times, values, lengths = pack_runs(load_all_csv(os.path.join(folder, 'time')))
+    time_points = np.linspace(0, np.mean(times[np.arange(len(times)), lengths - 1]), 100)
+    out = np.empty((len(times), len(time_points)))
+    return None, lambda: interp_runs(time_points, times, values, lengths, out)
+
+# The same 1000-point matrix reopened from the memory-mapped cache, after one build in setup
+def bench_aligned_matrix_warm(folder):
+    time_dir = os.path.join(folder, 'time')
+    time_points = np.linspace(0, 600, 1000)
+    return lambda: aligned_matrix(time_dir, time_points), lambda: aligned_matrix(time_dir, time_points)
+
+# Folder partials rebuilt from scratch, the cost before any run has been seen
+def bench_update_partials(folder):
+    time_dir = os.path.join(folder, 'time')
+    return lambda: shutil.rmtree(os.path.join(time_dir, PARTIALS_DIR), ignore_errors=True), lambda: update_partials(time_dir)
+
+def bench_calculate_average_coverage(folder):
+    if not os.listdir(os.path.join(folder, 'failure')):
+        return None
+    functions = load_script_functions('failure_analysis.py')
+    return None, lambda: functions['calculate_average_coverage'](
+        os.path.join(folder, 'time'), os.path.join(folder, 'failure'), 'Failure Coverage (%)')
+
+# Per-run failure alignment and recovery metrics over every failure trial
+def bench_failure_runs(folder):
+    run_ids, runs = load_paired_runs(folder, ('time', 'failure'))
+    if not run_ids:
+        return None
+
+    def run():
+        failure_runs = FailureRuns(runs['time'], runs['failure'], trial_ids=run_ids)
+        return failure_runs.metrics(), failure_runs.aligned()
+    return None, run
+
+def bench_asof_coverage(folder):
+    data_frames = load_all_csv(os.path.join(folder, 'time'))
+    if 'merged_12_coverage' not in data_frames[0]:
+        return None
+    times = np.unique(np.concatenate([df['time_elapsed'].to_numpy() for df in data_frames]))
+    switch_time = np.mean([df['time_elapsed'].max() for df in data_frames]) / 3
+    return None, lambda: asof_coverage(data_frames, times, switch_time)
+
+def bench_noise_overlap(folder):
+    functions = load_script_functions('noise_overlap.py')
+    return None, lambda: functions['process_folder'](folder)
+
+def bench_baseline_overlap(folder):
+    functions = load_script_functions('baseline_overlap_paper_interp.py')
+    return None, lambda: functions['process_folder'](folder)
+
+def bench_running_stats(folder):
+    data_frames = load_all_csv(os.path.join(folder, 'time'))
+    time_steps = np.linspace(0, np.mean([df['time_elapsed'].max() for df in data_frames]), 1000)
+
+    def run():
+        stats = RunningStats(len(time_steps))
+        for df in data_frames:
+            coverage_interp = np.interp(time_steps, df['time_elapsed'], df['coverage_percent'])
+            stats.update(coverage_interp, coverage_interp > 0)
+        return stats.mean, stats.std()
+    return None, run
+
+# Per-time-point quantile bands of a folder, one sketch per half of the runs merged
+# like the sketches of two workers would be
+def bench_quantile_sketch(folder):
+    time_points = np.linspace(0, 600, 1000)
+    grid = interp_runs(time_points, *pack_runs(load_all_csv(os.path.join(folder, 'time'))))
+    halves = np.array_split(grid, 2)
+    return None, lambda: merge_all(QuantileSketch(len(time_points)).update_batch(half) for half in halves).bands()
+
+def bench_fleet_summary(folder):
+    data_frames = load_all_csv(os.path.join(folder, 'time'))
+    return None, lambda: fleet_summary(data_frames)
+
+BENCHMARKS = {
+    'load_all_csv_cold': bench_load_all_csv_cold,
+    'load_all_csv_warm': bench_load_all_csv_warm,
+    'load_paired_runs': bench_load_paired_runs,
+    'align_runs': bench_align_runs,
+    'interpolate_coverage': bench_interpolate_coverage,
+    'interp_runs': bench_interp_runs,
+    'aligned_matrix_warm': bench_aligned_matrix_warm,
+    'update_partials': bench_update_partials,
+    'calculate_average_coverage': bench_calculate_average_coverage,
+    'failure_runs': bench_failure_runs,
+    'asof_coverage': bench_asof_coverage,
+    'noise_overlap': bench_noise_overlap,
+    'baseline_overlap': bench_baseline_overlap,
+    'running_stats': bench_running_stats,
+    'quantile_sketch': bench_quantile_sketch,
+    'fleet_summary': bench_fleet_summary,
+}
+
+
+# Best wall time over `repeat` runs, then one extra run under tracemalloc for the
+# peak Python allocation (tracing slows the code down, so it is never timed)
+def measure(run, setup=None, repeat=3):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(times), 'mean_seconds': float(np.mean(times)), 'peak_bytes': peak}
+
+def run_benchmarks(sizes, names=None, n_robots=3, sample_rate=1.0, failure_rate=0.5, repeat=3, seed=0):
+    names = names or list(BENCHMARKS)
+    results = []
+    for n_runs in sizes:
+        folder = corpus_folder(n_runs, n_robots, sample_rate, failure_rate, seed)
+        for name in names:
+            bench = BENCHMARKS[name](folder)
+            if bench is None:
+                continue
+            setup, run = bench
+            result = {'benchmark': name, 'runs': n_runs, 'robots': n_robots,
+                      'sample_rate': sample_rate, 'failure_rate': failure_rate}
+            result.update(measure(run, setup, repeat))
+            results.append(result)
+            print(f"{name:28s} runs={n_runs:<6d} {result['seconds']:9.4f} s  peak {result['peak_bytes'] / 2 ** 20:9.1f} MiB")
+    return results
+
+def _result_key(result):
+    return (result['benchmark'], result['runs'], result['robots'], result['sample_rate'], result['failure_rate'])
+
+# Compares against a previous results file. Returns the entries whose time or peak
+# memory grew by more than `tolerance` (0.2 = 20%)
+def compare_results(results, baseline, tolerance=0.2):
+    previous = {_result_key(r): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(_result_key(result))
+        if old is None:
+            continue
+        time_ratio = result['seconds'] / max(old['seconds'], 1e-9)
+        memory_ratio = result['peak_bytes'] / max(old['peak_bytes'], 1)
+        flag = ''
+        if time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance:
+            regressions.append(result)
+            flag = '  REGRESSION'
+        print(f"{result['benchmark']:28s} runs={result['runs']:<6d} time x{time_ratio:6.2f}  memory x{memory_ratio:6.2f}{flag}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time and memory-profile the analysis entry points on synthetic corpora')
+    parser.add_argument('--runs', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--robots', type=int, default=3)
+    parser.add_argument('--sample-rate', type=float, default=1.0)
+    parser.add_argument('--failure-rate', type=float, default=0.5)
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='benchmark_results.json')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.runs, args.benchmarks, args.robots, args.sample_rate,
+                             args.failure_rate, args.repeat, args.seed)
+    with open(args.out, 'w') as f:
+        json.dump({'python': platform.python_version(), 'numpy': np.__version__,
+                   'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_results(results, json.load(f)['results'], args.tolerance)
+        if regressions:
+            raise SystemExit(f'{len(regressions)} benchmark(s) regressed')
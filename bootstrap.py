@@ -0,0 +1,72 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_runner import default_workers, mp_context
+
+# Resample matrices larger than this (n_boot x n_runs entries) are split over worker processes
+PARALLEL_THRESHOLD = 20_000_000
+CHUNK_SIZE = 5_000_000
+
+
+# Statistics take (n_boot x n_runs) resampled arrays and reduce over the last axis.
+# They are plain module functions so worker processes can receive them
+def mean(values):
+    return values.mean(axis=-1)
+
+# Mean of the per-run ratio b / a, e.g. "WSR is X times faster than Baseline 1".
+# Unpaired (the default) both samples are redrawn independently and must be the same size,
+# use ratio_of_means for samples of different sizes
+def ratio(a, b):
+    return (b / a).mean(axis=-1)
+
+# Ratio of the two means, for unpaired samples of different sizes
+def ratio_of_means(a, b):
+    return b.mean(axis=-1) / a.mean(axis=-1)
+
+# Mean of the per-run percent difference (b - a) / b * 100
+def percent_difference(a, b):
+    return ((b - a) / b * 100).mean(axis=-1)
+
+# Paired samples are matched run for run, so a length mismatch means runs would be
+# dropped or mis-paired and is an error instead of a silent truncation
+def _prepare(samples, paired):
+    samples = [np.asarray(sample, dtype=np.float64) for sample in samples]
+    if paired and len({len(sample) for sample in samples}) > 1:
+        raise ValueError(f'paired samples differ in length {[len(sample) for sample in samples]}')
+    return samples
+
+def _chunk_statistics(statistic, samples, n_boot, paired, seed):
+    rng = np.random.default_rng(seed)
+    if paired:
+        index = rng.integers(0, len(samples[0]), size=(n_boot, len(samples[0])))
+        return statistic(*(sample[index] for sample in samples))
+    return statistic(*(sample[rng.integers(0, len(sample), size=(n_boot, len(sample)))] for sample in samples))
+
+# Bootstrap distribution of statistic(*samples): each resample is one row of an
+# (n_boot x n_runs) index matrix, so all resamples are evaluated in one NumPy pass.
+# Samples are resampled independently unless paired=True, where samples of the same
+# length (runs matched by position) share the index matrix. Large n_boot is split into
+# chunks with independent seeds and spread over a process pool
+def bootstrap_distribution(statistic, *samples, n_boot=10000, paired=False, seed=0, max_workers=None):
+    samples = _prepare(samples, paired)
+    n_runs = max(len(sample) for sample in samples)
+
+    rows_per_chunk = max(CHUNK_SIZE // max(n_runs, 1), 1)
+    sizes = [min(rows_per_chunk, n_boot - start) for start in range(0, n_boot, rows_per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    max_workers = default_workers() if max_workers is None else max_workers
+
+    if n_boot * n_runs <= PARALLEL_THRESHOLD or max_workers == 1 or len(sizes) == 1:
+        parts = [_chunk_statistics(statistic, samples, size, paired, s) for size, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context()) as executor:
+            parts = list(executor.map(_chunk_statistics, [statistic] * len(sizes), [samples] * len(sizes),
+                                      sizes, [paired] * len(sizes), seeds))
+    return np.concatenate(parts)
+
+# Point estimate and percentile confidence interval (low, high) at `level` percent
+def bootstrap_ci(statistic, *samples, n_boot=10000, level=95, paired=False, seed=0, max_workers=None):
+    estimate = statistic(*(sample[None, :] for sample in _prepare(samples, paired)))[0]
+    distribution = bootstrap_distribution(statistic, *samples, n_boot=n_boot, paired=paired, seed=seed, max_workers=max_workers)
+    low, high = np.percentile(distribution, [(100 - level) / 2, 100 - (100 - level) / 2])
+    return estimate, (low, high)
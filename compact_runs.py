@@ -0,0 +1,200 @@
+import os
+import json
+import zlib
+import struct
+import argparse
+import numpy as np
+import pandas as pd
+
+from run_store import list_csv_files
+
+# Compact binary copy of a run CSV: one zlib block per column, each column stored
+# with whichever lossless encoding compresses smallest
+MAGIC = b'WSRZ'
+FORMAT_VERSION = 1
+SUFFIX = '.wsrz'
+
+
+# Parses a run CSV with exact float round-tripping, the reference the binary format must reproduce
+def read_csv_exact(path):
+    return pd.read_csv(path, float_precision='round_trip')
+
+def _rle(values):
+    if len(values) == 0:
+        return values, np.zeros(0, dtype=np.uint32)
+    same = values[1:] == values[:-1]
+    if values.dtype.kind == 'f':
+        same |= np.isnan(values[1:]) & np.isnan(values[:-1])
+    starts = np.concatenate([[0], np.flatnonzero(~same) + 1])
+    lengths = np.diff(np.concatenate([starts, [len(values)]])).astype(np.uint32)
+    return values[starts], lengths
+
+# float32 when every value survives the cast, float64 otherwise
+def _float_payload(values):
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+        return 'f4', narrow.tobytes()
+    return 'f8', values.tobytes()
+
+def _itemsize(encoding):
+    return 4 if encoding in ('f4', 'bitdelta4') else 8
+
+# Groups byte k of every value together, which zlib compresses much better for numeric columns
+def _shuffle(raw, itemsize):
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, itemsize).T.tobytes()
+
+def _unshuffle(raw, itemsize):
+    return np.frombuffer(raw, dtype=np.uint8).reshape(itemsize, -1).T.tobytes()
+
+# Candidate encodings of one numeric column as (encoding, bytes). With float32=True
+# float columns are narrowed first, which is lossy but roughly halves the size again
+def _candidates(values, float32=False):
+    if values.dtype.kind == 'f' and float32:
+        values = values.astype(np.float32)
+        yield 'f4', values.tobytes()
+        yield 'bitdelta4', np.diff(values.view(np.int32), prepend=np.int32(0)).tobytes()
+        run_values, lengths = _rle(values)
+        yield 'rle-f4', struct.pack('<I', len(run_values)) + run_values.tobytes() + lengths.tobytes()
+    elif values.dtype.kind == 'f':
+        values = values.astype(np.float64)
+        dtype, raw = _float_payload(values)
+        yield dtype, raw
+        # Delta of the IEEE bit patterns, exact for timestamps and other slowly moving columns
+        yield 'bitdelta', np.diff(values.view(np.int64), prepend=np.int64(0)).tobytes()
+        run_values, lengths = _rle(values)
+        run_dtype, run_raw = _float_payload(run_values)
+        yield f'rle-{run_dtype}', struct.pack('<I', len(run_values)) + run_raw + lengths.tobytes()
+    else:
+        values = values.astype(np.int64)
+        yield 'i8', values.tobytes()
+        yield 'intdelta', np.diff(values, prepend=np.int64(0)).tobytes()
+        run_values, lengths = _rle(values)
+        yield 'rle-i8', struct.pack('<I', len(run_values)) + run_values.tobytes() + lengths.tobytes()
+
+# Smallest zlib block over the candidates, fixed-width ones also tried byte-shuffled
+def _encode_column(values, float32=False):
+    options = []
+    for encoding, raw in _candidates(values, float32):
+        options.append((encoding, zlib.compress(raw, 9)))
+        if not encoding.startswith('rle-'):
+            options.append((f'{encoding}+shuffle', zlib.compress(_shuffle(raw, _itemsize(encoding)), 9)))
+    return min(options, key=lambda option: len(option[1]))
+
+def _decode(encoding, raw):
+    if encoding.endswith('+shuffle'):
+        encoding = encoding[:-len('+shuffle')]
+        raw = _unshuffle(raw, _itemsize(encoding))
+    if encoding in ('f4', 'f8'):
+        return np.frombuffer(raw, dtype=encoding).astype(np.float64)
+    if encoding == 'i8':
+        return np.frombuffer(raw, dtype=np.int64).copy()
+    if encoding == 'bitdelta':
+        return np.cumsum(np.frombuffer(raw, dtype=np.int64)).view(np.float64)
+    if encoding == 'bitdelta4':
+        return np.cumsum(np.frombuffer(raw, dtype=np.int32), dtype=np.int32).view(np.float32).astype(np.float64)
+    if encoding == 'intdelta':
+        return np.cumsum(np.frombuffer(raw, dtype=np.int64))
+    if encoding.startswith('rle-'):
+        dtype = encoding[4:]
+        n_runs, = struct.unpack_from('<I', raw)
+        width = np.dtype(dtype).itemsize * n_runs
+        run_values = np.frombuffer(raw, dtype=dtype, count=n_runs, offset=4)
+        lengths = np.frombuffer(raw, dtype=np.uint32, offset=4 + width)
+        values = np.repeat(run_values, lengths)
+        return values.astype(np.float64) if dtype != 'i8' else values
+    if encoding == 'text':
+        return np.array(json.loads(raw.decode()), dtype=object)
+    raise ValueError(f'unknown column encoding {encoding!r}')
+
+def encode_frame(df, float32=False):
+    columns = []
+    blocks = []
+    for name in df.columns:
+        series = df[name]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            encoding, block = _encode_column(series.to_numpy(), float32)
+        else:
+            encoding, block = 'text', zlib.compress(json.dumps(series.tolist()).encode(), 9)
+        columns.append({'name': name, 'dtype': str(series.dtype), 'encoding': encoding, 'bytes': len(block)})
+        blocks.append(block)
+
+    header = json.dumps({'version': FORMAT_VERSION, 'rows': len(df), 'columns': columns}).encode()
+    return MAGIC + struct.pack('<I', len(header)) + header + b''.join(blocks)
+
+def decode_frame(data):
+    if data[:4] != MAGIC:
+        raise ValueError('not a compact run file')
+    header_size, = struct.unpack_from('<I', data, 4)
+    header = json.loads(data[8:8 + header_size])
+    if header['version'] != FORMAT_VERSION:
+        raise ValueError(f"unsupported compact run version {header['version']}")
+
+    offset = 8 + header_size
+    columns = {}
+    for column in header['columns']:
+        raw = zlib.decompress(data[offset:offset + column['bytes']])
+        offset += column['bytes']
+        columns[column['name']] = pd.Series(_decode(column['encoding'], raw)).astype(column['dtype'])
+    return pd.DataFrame(columns)
+
+def write_run(df, path, float32=False):
+    tmp_path = f'{path}.tmp{os.getpid()}'
+    with open(tmp_path, 'wb') as f:
+        f.write(encode_frame(df, float32))
+    os.replace(tmp_path, path)
+
+def read_run(path):
+    with open(path, 'rb') as f:
+        return decode_frame(f.read())
+
+# Writes the compact file back out in the original CSV schema
+def export_csv(path, csv_path):
+    read_run(path).to_csv(csv_path, index=False)
+
+# Same columns, dtypes and values (NaN == NaN) as the CSV
+def frames_equal(a, b):
+    return (list(a.columns) == list(b.columns) and list(a.dtypes) == list(b.dtypes)
+            and all(np.array_equal(a[c].to_numpy(), b[c].to_numpy(), equal_nan=a[c].dtype.kind == 'f') for c in a.columns))
+
+# The frame a float32 file decodes to: float columns rounded through float32
+def narrow_frame(df):
+    df = df.copy()
+    for name in df.columns:
+        if df[name].dtype.kind == 'f':
+            df[name] = df[name].astype(np.float32).astype(df[name].dtype)
+    return df
+
+# Mirrors every CSV under src into dst as .wsrz files, checking each one round-trips.
+# Returns the total (csv bytes, compact bytes)
+def convert_tree(src, dst, float32=False):
+    csv_bytes = compact_bytes = 0
+    dst_root = os.path.abspath(dst)
+    for root, dirs, files in os.walk(src):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.') and os.path.abspath(os.path.join(root, d)) != dst_root)
+        if not any(f.endswith('.csv') for f in files):
+            continue
+        out_dir = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(out_dir, exist_ok=True)
+        for name in list_csv_files(root):
+            df = read_csv_exact(os.path.join(root, name))
+            out_path = os.path.join(out_dir, os.path.splitext(name)[0] + SUFFIX)
+            write_run(df, out_path, float32)
+            if not frames_equal(narrow_frame(df) if float32 else df, read_run(out_path)):
+                raise ValueError(f'{os.path.join(root, name)} does not round-trip')
+            csv_bytes += os.path.getsize(os.path.join(root, name))
+            compact_bytes += os.path.getsize(out_path)
+    return csv_bytes, compact_bytes
+
+# The runs of a converted folder in file name order, what load_all_csv returns for it
+def load_all_compact(directory):
+    return [read_run(os.path.join(directory, f)) for f in sorted(os.listdir(directory)) if f.endswith(SUFFIX)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert run CSVs to the compact binary format')
+    parser.add_argument('src')
+    parser.add_argument('dst')
+    parser.add_argument('--float32', action='store_true', help='narrow float columns to float32 (lossy)')
+    args = parser.parse_args()
+    csv_bytes, compact_bytes = convert_tree(args.src, args.dst, args.float32)
+    print(f'{csv_bytes / 2 ** 20:.1f} MiB of CSV -> {compact_bytes / 2 ** 20:.1f} MiB compact ({csv_bytes / max(compact_bytes, 1):.1f}x)')
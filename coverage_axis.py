@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from coverage_grid import running_max, stack_column
+from quantile_sketch import BAND_QUANTILES, QuantileSketch
+
+
+# Coverage bin of every sample: the run's running max of coverage (so a dip back
+# down never re-enters a lower bin) rounded to the bin width. monotone=False bins
+# the raw coverage instead
+def coverage_bins(coverage, run_ids, bin_width=1, monotone=True):
+    if monotone:
+        coverage = running_max(coverage, run_ids)
+    return np.rint(coverage / bin_width) * bin_width
+
+# count / mean / m2 per bin in one pass over the stacked samples, the layout
+# RunningStats and the Chan merge use, so results from several folders can be combined
+def binned_stats(bins, values):
+    labels, inverse = np.unique(bins, return_inverse=True)
+    count = np.bincount(inverse, minlength=len(labels)).astype(np.float64)
+    mean = np.bincount(inverse, values, minlength=len(labels)) / count
+    m2 = np.bincount(inverse, (values - mean[inverse]) ** 2, minlength=len(labels))
+    return pd.DataFrame({'count': count, 'mean': mean, 'm2': m2}, index=pd.Index(labels, name='coverage'))
+
+# Quantiles per bin from a QuantileSketch over the bins, one q<percent> column per
+# quantile (q5, q25, q50, ...). Returns the sketch too so folders can be merged
+def binned_quantiles(bins, values, qs=BAND_QUANTILES, compression=100):
+    labels, inverse = np.unique(bins, return_inverse=True)
+    sketch = QuantileSketch(len(labels), compression).update_points(inverse, values)
+    table = pd.DataFrame({f'q{100 * q:g}': row for q, row in zip(qs, sketch.quantiles(qs))}, index=pd.Index(labels, name='coverage'))
+    return table, sketch
+
+# Every (time/ sample, value sample) pair of the same run and rounded second as a
+# coverage bin and a value, like an inner merge on the second (see resample_on_coverage)
+def coverage_pairs(time_frames, value_frames, bin_width=1, monotone=True,
+                   time_column='time_elapsed', coverage_column='coverage_percent',
+                   value_time_column='Time Elapsed (s)', value_column='Coverage Overlap (%)'):
+    seconds, runs = stack_column(time_frames, time_column)
+    coverage, _ = stack_column(time_frames, coverage_column)
+    bins = coverage_bins(coverage, runs, bin_width, monotone)
+    value_seconds, value_runs = stack_column(value_frames, value_time_column)
+    values, _ = stack_column(value_frames, value_column)
+
+    # (run, second) keys on both sides, value samples sorted by key
+    seconds, value_seconds = np.rint(seconds), np.rint(value_seconds)
+    low = min(seconds.min(initial=0), value_seconds.min(initial=0))
+    span = max(seconds.max(initial=0), value_seconds.max(initial=0)) - low + 1
+    keys = runs * span + (seconds - low)
+    value_keys = value_runs * span + (value_seconds - low)
+    order = np.argsort(value_keys, kind='stable')
+    value_keys, values = value_keys[order], values[order]
+
+    # Every time/ sample expands into the value samples sharing its key
+    starts = np.searchsorted(value_keys, keys, side='left')
+    matches = np.searchsorted(value_keys, keys, side='right') - starts
+    pair_bins = np.repeat(bins, matches)
+    pair_offsets = np.arange(matches.sum()) - np.repeat(np.cumsum(matches) - matches, matches)
+    pair_values = values[np.repeat(starts, matches) + pair_offsets]
+    return pair_bins, pair_values
+
+# Re-indexes every run onto a common coverage axis. Value samples (e.g. overlap from
+# coverage/) are matched to coverage samples (from time/) of the same run and the same
+# rounded second, every matching pair counts once like an inner merge on the second,
+# and each pair is binned by the coverage of its time/ sample. Returns binned_stats
+def resample_on_coverage(time_frames, value_frames, bin_width=1, monotone=True,
+                         time_column='time_elapsed', coverage_column='coverage_percent',
+                         value_time_column='Time Elapsed (s)', value_column='Coverage Overlap (%)'):
+    return binned_stats(*coverage_pairs(time_frames, value_frames, bin_width, monotone, time_column,
+                                        coverage_column, value_time_column, value_column))
+
+# Per coverage bin statistics of every run in one vectorized pass: coverage_pairs pairs
+# the samples of all runs at once on their (run, second) keys and binned_stats reduces
+# the pairs with one bincount per statistic over the bins. Returns a coverage_percent /
+# count / mean / std (sample std, NaN below two samples) table. quantiles=True adds the
+# q<percent> columns of a QuantileSketch fed the same pairs
+def coverage_table(time_frames, value_frames, bin_width=1, monotone=True, quantiles=False, compression=100,
+                   time_column='time_elapsed', coverage_column='coverage_percent',
+                   value_time_column='Time Elapsed (s)', value_column='Coverage Overlap (%)'):
+    bins, values = coverage_pairs(time_frames, value_frames, bin_width, monotone, time_column,
+                                  coverage_column, value_time_column, value_column)
+    total = binned_stats(bins, values)
+
+    table = pd.DataFrame({
+        'coverage_percent': total.index.to_numpy(),
+        'count': total['count'].to_numpy(),
+        'mean': total['mean'].to_numpy(),
+        'std': np.sqrt(total['m2'] / (total['count'] - 1)).where(total['count'] > 1).to_numpy(),
+    })
+    if quantiles:
+        labels = table['coverage_percent'].to_numpy()
+        sketch = QuantileSketch(len(labels), compression).update_points(np.searchsorted(labels, bins), values)
+        for q, row in zip(BAND_QUANTILES, sketch.quantiles(BAND_QUANTILES)):
+            table[f'q{100 * q:g}'] = row
+    return table
+
+# The median, interquartile and 5-95% bands of a coverage_table with
+# quantiles, in the shape fill_band draws
+def table_bands(table):
+    return {'median': table['q50'].to_numpy(), 'iqr': (table['q25'].to_numpy(), table['q75'].to_numpy()),
+            'outer': (table['q5'].to_numpy(), table['q95'].to_numpy())}
@@ -0,0 +1,235 @@
+import warnings
+import numpy as np
+
+
+# Concatenates one column of every run, returning the values and the run index of each row
+def stack_column(data_frames, column):
+    lengths = np.array([len(df) for df in data_frames], dtype=np.int64)
+    values = np.concatenate([df[column].to_numpy(dtype=np.float64) for df in data_frames]) if len(data_frames) else np.empty(0)
+    run_ids = np.repeat(np.arange(len(data_frames)), lengths)
+    return values, run_ids
+
+# Forward fills NaNs along the last axis, leading NaNs are left in place
+def forward_fill(grid):
+    index = np.where(np.isnan(grid), 0, np.arange(grid.shape[-1]))
+    np.maximum.accumulate(index, axis=-1, out=index)
+    return np.take_along_axis(grid, index, axis=-1)
+
+# Running max of every run at once, NaN samples are treated as the lowest value seen.
+# A segmented scan: each of log2(longest run) doubling steps takes the max with the
+# sample 2^k rows back wherever that sample belongs to the same run. Values are
+# only compared, never shifted into offset ranges, so the result is exact
+def running_max(values, run_ids):
+    values = np.asarray(values, dtype=np.float64)
+    run_ids = np.asarray(run_ids)
+    finite = np.isfinite(values)
+    result = np.where(finite, values, values[finite].min(initial=0))
+    shift = 1
+    while shift < len(result):
+        same = run_ids[shift:] == run_ids[:-shift]
+        if not same.any():
+            break
+        result[shift:] = np.where(same, np.maximum(result[shift:], result[:-shift]), result[shift:])
+        shift *= 2
+    return result
+
+# Stacks every run onto an integer-second grid as one (runs x seconds) matrix.
+# The first sample of each second is kept, gaps are forward filled and runs that
+# stop before avg_time_elapsed are extended with the extrapolate_coverage rule:
+# a straight line up to avg_termination_coverage when the run ended short of it,
+# otherwise the run's max coverage held flat. The grid spans the longest run so
+# individual trajectories can still be plotted past the average termination time;
+# each run is NaN after its last sample or avg_time_elapsed, whichever is later,
+# so it stops where the extrapolated DataFrame of the run used to stop.
+def align_runs(data_frames, avg_time_elapsed, avg_termination_coverage,
+               time_column='time_elapsed', value_column='coverage_percent'):
+    times, run_ids = stack_column(data_frames, time_column)
+    values, _ = stack_column(data_frames, value_column)
+    times = np.rint(times).astype(np.int64)
+
+    n_runs = len(data_frames)
+    max_times = np.full(n_runs, -1, dtype=np.int64)
+    max_values = np.full(n_runs, np.nan)
+    np.maximum.at(max_times, run_ids, times)
+    np.fmax.at(max_values, run_ids, values)
+
+    n_seconds = int(max(avg_time_elapsed, max_times.max(initial=0))) + 1
+    seconds = np.arange(n_seconds)
+    grid = np.full((n_runs, n_seconds), np.nan)
+
+    # np.unique returns the first row of each (run, second) pair, matching values[0] in the old loop
+    valid = times >= 0
+    keys = run_ids[valid] * n_seconds + times[valid]
+    keys, first = np.unique(keys, return_index=True)
+    grid.flat[keys] = values[valid][first]
+    grid = forward_fill(grid)
+
+    # Extrapolate every run that stopped early out to the average termination time
+    span = avg_time_elapsed - max_times
+    short = (max_values < avg_termination_coverage) & (span > 0)
+    slope = np.where(short, (avg_termination_coverage - max_values) / np.where(span > 0, span, 1), 0.0)
+    extrapolated = max_values[:, None] + slope[:, None] * (seconds[None, :] - max_times[:, None])
+    tail = (seconds[None, :] > max_times[:, None]) & (seconds[None, :] <= avg_time_elapsed)
+    grid[tail] = extrapolated[tail]
+    grid[seconds[None, :] > np.maximum(max_times, avg_time_elapsed)[:, None]] = np.nan
+
+    return seconds, grid
+
+# Mean and std across runs for every grid column, ignoring runs without data there
+def grid_mean_std(grid):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmean(grid, axis=0), np.nanstd(grid, axis=0)
+
+# Binary search of many sorted slices of one flat array at once: for every target, the
+# first index in [lo, hi) whose value is >= target (side='left') or > target
+# (side='right'), hi when there is none. All targets bisect in lockstep, branch free
+def segment_search(values, lo, hi, targets, side='left'):
+    lo, hi, targets = np.broadcast_arrays(lo, hi, targets)
+    lo, hi = lo.copy(), hi.copy()
+    if len(values) == 0:
+        return lo
+    for _ in range(int((hi - lo).max(initial=0)).bit_length()):
+        mid = (lo + hi) >> 1
+        active = lo < hi
+        value = values[np.minimum(mid, len(values) - 1)]
+        before = value < targets if side == 'left' else value <= targets
+        lo = np.where(active & before, mid + 1, lo)
+        hi = np.where(active & ~before, mid, hi)
+    return lo
+
+# Packs ragged runs into (runs x max_len) time and value buffers plus the length of
+# every run. Time padding is +inf so a search never lands in it, value padding is NaN
+def pack_runs(data_frames, time_column='time_elapsed', value_column='coverage_percent'):
+    lengths = np.array([len(df) for df in data_frames], dtype=np.intp)
+    width = lengths.max(initial=0)
+    filled = np.arange(width)[None, :] < lengths[:, None]
+    times = np.full((len(data_frames), width), np.inf)
+    values = np.full((len(data_frames), width), np.nan)
+    times[filled] = stack_column(data_frames, time_column)[0]
+    values[filled] = stack_column(data_frames, value_column)[0]
+    return times, values, lengths
+
+# np.interp of every packed run at points (one grid shared by all runs, or one row per
+# run) in a single pass, returning a (runs x points) matrix. segment_search over all
+# rows at once finds the last sample at or before each point, then the same
+# lerp as np.interp (ends held flat, exact samples returned as is), so the result
+# matches the per-run np.interp loop bit for bit. out, when given, is filled in place
+def interp_runs(points, times, values, lengths, out=None):
+    n_runs, width = times.shape
+    points = np.broadcast_to(np.asarray(points, dtype=np.float64), (n_runs, np.shape(points)[-1]))
+    if out is None:
+        out = np.empty(points.shape)
+    if width == 0:
+        out.fill(np.nan)
+        return out
+    rows = np.arange(n_runs)[:, None]
+
+    # Last sample at or before each point, every row searched as its own slice of the flat buffer
+    row_starts = rows * width
+    index = segment_search(times.reshape(-1), row_starts, row_starts + lengths[:, None], points, side='right') - row_starts - 1
+
+    left = np.clip(index, 0, width - 1)
+    right = np.minimum(left + 1, width - 1)
+    x0, x1 = times[rows, left], times[rows, right]
+    y0, y1 = values[rows, left], values[rows, right]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (y1 - y0) / (x1 - x0)
+        np.subtract(points, x0, out=out)
+        out *= slope
+        out += y0
+        # np.interp's fallback for infinite slopes: lerp back from the right sample instead
+        fallback = np.isnan(out)
+        if fallback.any():
+            retry = slope * (points - x1) + y1
+            retry = np.where(np.isnan(retry) & (y0 == y1), y0, retry)
+            out[fallback] = retry[fallback]
+
+    last = values[np.arange(n_runs), np.maximum(lengths - 1, 0)][:, None]
+    np.copyto(out, y0, where=x0 == points)
+    np.copyto(out, np.broadcast_to(last, out.shape), where=index >= lengths[:, None] - 1)
+    np.copyto(out, np.broadcast_to(values[:, :1], out.shape), where=index < 0)
+    return out
+
+# As-of lookup of every run at every query time: the last sample with
+# time_elapsed <= t, or the run's first sample when t precedes all of them.
+# Queries up to switch_time read before_column and later ones read after_column,
+# so a failure run can switch to merged_12_coverage once the robot drops out.
+# All runs are answered by one searchsorted over run-offset keys, returning a
+# (times x runs) matrix.
+def asof_coverage(data_frames, times, switch_time=np.inf, before_column='coverage_percent',
+                  after_column='merged_12_coverage', time_column='time_elapsed'):
+    times = np.asarray(times, dtype=np.float64)
+    sample_times, run_ids = stack_column(data_frames, time_column)
+
+    # Sort each run by time, keeping file order for ties like the boolean mask did
+    order = np.lexsort((sample_times, run_ids))
+    sample_times, run_ids = sample_times[order], run_ids[order]
+
+    # Shift every run into its own disjoint key range so one sorted array covers them all
+    low = min(sample_times.min(), times.min(initial=np.inf))
+    span = max(sample_times.max(), times.max(initial=-np.inf)) - low + 1
+    keys = run_ids * span + (sample_times - low)
+    n_runs = len(data_frames)
+    query_keys = np.arange(n_runs)[None, :] * span + (times[:, None] - low)
+
+    index = np.searchsorted(keys, query_keys, side='right') - 1
+    starts = np.searchsorted(run_ids, np.arange(n_runs), side='left')
+    row = order[np.maximum(index, starts[None, :])]
+
+    # Queries before a run's first sample fall back to its first row in the file
+    first_rows = np.cumsum([0] + [len(df) for df in data_frames[:-1]])
+    before_first = times[:, None] < sample_times[starts][None, :]
+    row = np.where(before_first, first_rows[None, :], row)
+
+    before, _ = stack_column(data_frames, before_column)
+    if after_column is None or after_column == before_column:
+        return before[row]
+    after, _ = stack_column(data_frames, after_column)
+    return np.where(times[:, None] <= switch_time, before[row], after[row])
+
+
+class CoverageIndex:
+    # Time-to-coverage lookups for a set of runs. Each run's coverage is replaced by
+    # its running max, which is monotone, so "first time coverage reaches X%" is the
+    # first sample where the running max is >= X and a binary search answers it.
+    # Every (threshold, run) pair bisects its own run's slice of the stacked column in
+    # lockstep (segment_search), so any number of thresholds x runs is one vectorized
+    # pass. stacked, when given, is an already stacked (times, coverage, run_ids)
+    # triple of the runs to use instead of the columns
+    def __init__(self, data_frames, time_column='time_elapsed', coverage_column='coverage_percent', stacked=None):
+        self.n_runs = len(data_frames)
+        if stacked is None:
+            self.times, run_ids = stack_column(data_frames, time_column)
+            coverage, _ = stack_column(data_frames, coverage_column)
+        else:
+            self.times, coverage, run_ids = stacked
+        self.starts = np.searchsorted(run_ids, np.arange(self.n_runs + 1), side='left')
+
+        # Running max per run, samples before a run's first finite value never reach a threshold
+        finite = np.isfinite(coverage)
+        self.running_max = np.where(running_max(finite, run_ids) > 0, running_max(coverage, run_ids), -np.inf)
+
+    # (thresholds x runs) matrix of the first time each run reaches each threshold, NaN if it never does.
+    # A (thresholds x runs) array gives every run its own thresholds
+    def times_to(self, thresholds):
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        if thresholds.ndim < 2:
+            thresholds = np.atleast_1d(thresholds)[:, None]
+        thresholds = np.broadcast_to(thresholds, (len(thresholds), self.n_runs))
+        index = segment_search(self.running_max, self.starts[:-1], self.starts[1:], thresholds)
+
+        last = max(len(self.times) - 1, 0)
+        reached = (index < self.starts[1:][None, :]) & (self.running_max[np.minimum(index, last)] >= thresholds)
+        return np.where(reached, self.times[np.minimum(index, last)], np.nan)
+
+    # First time every run reaches one threshold
+    def time_to(self, threshold):
+        return self.times_to([threshold])[0]
+
+    # Fraction of runs that reached each threshold by each time, a (thresholds x times) CDF
+    def cdf(self, thresholds, times):
+        reach = np.sort(self.times_to(thresholds), axis=1)
+        times = np.asarray(times, dtype=np.float64)
+        counts = np.array([np.searchsorted(row, times, side='right') for row in reach])
+        return counts / max(self.n_runs, 1)
@@ -0,0 +1,161 @@
+import os
+import re
+import json
+import numpy as np
+import pandas as pd
+
+from run_store import CACHE_ROOT, list_csv_files
+
+CATALOG_PATH = os.path.join(CACHE_ROOT, 'catalog.json')
+CATALOG_VERSION = 1
+
+# Column order of the catalog table
+CATALOG_COLUMNS = ['folder', 'study', 'platform', 'environment', 'method', 'location', 'noise_deg', 'noise_cm',
+                   'variant', 'merged', 'members', 'runs', 'sub_folders']
+
+NOISE_FOLDER = re.compile(r'^(\d+)_(\d+)(?:_(c|far))?$')
+MERGED_TOKENS = ('consolodated', 'consolidated')
+
+
+# Metadata encoded in one folder name:
+#   2_1, 10_20_far, 30_1_c        noise study, <deg>_<cm>, far start or combined (_c) set
+#   hw_env_1_baseline_2_loc_3     hardware, environment 1, baseline 2, start location 3
+#   wsr_near_far, *_consolodated  merged sets of several start locations
+#   wsr_failure_late, ablation_beta, far_wsr_slow_updated ...
+def parse_folder_name(name):
+    info = {'folder': name, 'study': 'baseline', 'platform': 'sim', 'environment': np.nan, 'method': 'wsr',
+            'location': 'near', 'noise_deg': np.nan, 'noise_cm': np.nan, 'variant': '', 'merged': False}
+
+    match = NOISE_FOLDER.match(name)
+    if match:
+        info.update(study='noise', noise_deg=int(match.group(1)), noise_cm=int(match.group(2)))
+        if match.group(3) == 'far':
+            info['location'] = 'far'
+        elif match.group(3) == 'c':
+            info.update(location='near_far', merged=True)
+        return info
+
+    rest = name
+    if rest.startswith('hw_'):
+        info['platform'] = 'hw'
+        rest = rest[3:]
+    match = re.search(r'env_(\d+)', rest)
+    if match:
+        info['environment'] = int(match.group(1))
+
+    match = re.search(r'baseline_(\d+)', rest)
+    if match:
+        info['method'] = f'baseline_{match.group(1)}'
+    elif rest.startswith('baseline'):
+        info['method'] = 'baseline_1'
+    elif 'baseline' in rest:
+        info['method'] = 'baseline'
+    elif 'manual' in rest:
+        info['method'] = 'manual'
+
+    match = re.search(r'loc_(\d+)', rest)
+    if 'near_far' in rest:
+        info.update(location='near_far', merged=True)
+    elif match:
+        info['location'] = f'loc_{match.group(1)}'
+    elif re.search(r'(^|_)far(_|$)', rest):
+        info['location'] = 'far'
+    if any(token in rest for token in MERGED_TOKENS):
+        info.update(merged=True, location='all' if info['location'] == 'near' else info['location'])
+
+    if rest.startswith('ablation_'):
+        info.update(study='ablation', variant=rest[len('ablation_'):])
+    elif 'failure' in rest:
+        info['study'] = 'failure'
+    elif 'slow' in rest:
+        info['study'] = 'slow'
+    elif info['platform'] == 'hw':
+        info['study'] = 'hardware'
+    for token in ('late', 'updated'):
+        if rest.endswith(token):
+            info['variant'] = token
+    return info
+
+# CSV counts of every sub folder (time, coverage, failure, main, ...)
+def _sub_folders(path):
+    return {d: len(list_csv_files(os.path.join(path, d))) for d in sorted(os.listdir(path))
+            if os.path.isdir(os.path.join(path, d)) and not d.startswith('.')}
+
+def _experiment_folders(root):
+    return [d for d in sorted(os.listdir(root)) if not d.startswith('.') and os.path.isdir(os.path.join(root, d))
+            and _sub_folders(os.path.join(root, d))]
+
+# Directory mtimes of every experiment folder and its sub folders, changes when runs are added or removed
+def _tree_signature(root):
+    signature = []
+    for name in _experiment_folders(root):
+        path = os.path.join(root, name)
+        signature.append([name, os.stat(path).st_mtime_ns] +
+                         [os.stat(os.path.join(path, d)).st_mtime_ns for d in _sub_folders(path)])
+    return signature
+
+# Scans root once: one row per experiment folder with its parsed metadata, its run
+# counts and the folders it merges (folders whose time/ runs are a strict subset of its own)
+def scan_catalog(root='.'):
+    rows = []
+    run_files = {}
+    for name in _experiment_folders(root):
+        path = os.path.join(root, name)
+        info = parse_folder_name(name)
+        info['sub_folders'] = _sub_folders(path)
+        counts = info['sub_folders']
+        info['runs'] = counts.get('time') or counts.get('main') or max(counts.values())
+        rows.append(info)
+        time_dir = os.path.join(path, 'time')
+        run_files[name] = set(list_csv_files(time_dir)) if os.path.isdir(time_dir) else set()
+
+    for info in rows:
+        files = run_files[info['folder']]
+        info['members'] = [other for other, other_files in run_files.items()
+                           if other != info['folder'] and other_files and other_files < files]
+        if info['members']:
+            info['merged'] = True
+    return rows
+
+def _to_frame(rows):
+    catalog = pd.DataFrame(rows, columns=CATALOG_COLUMNS)
+    catalog['environment'] = catalog['environment'].astype('Int64')
+    catalog['noise_deg'] = catalog['noise_deg'].astype('Int64')
+    catalog['noise_cm'] = catalog['noise_cm'].astype('Int64')
+    catalog['merged'] = catalog['merged'].astype(bool)
+    catalog['runs'] = catalog['runs'].astype(int)
+    return catalog.set_index('folder', drop=False)
+
+# The catalog of root as a typed table, cached in CATALOG_PATH and rescanned only
+# when a folder or sub folder was added, removed or changed
+def load_catalog(root='.'):
+    signature = _tree_signature(root)
+    try:
+        with open(CATALOG_PATH) as f:
+            cached = json.load(f)
+        if cached.get('version') == CATALOG_VERSION and cached['root'] == os.path.abspath(root) and cached['signature'] == signature:
+            return _to_frame(cached['rows'])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    rows = scan_catalog(root)
+    os.makedirs(os.path.dirname(CATALOG_PATH), exist_ok=True)
+    tmp_path = f'{CATALOG_PATH}.tmp{os.getpid()}'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': CATALOG_VERSION, 'root': os.path.abspath(root), 'signature': signature,
+                   'rows': [{k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in row.items()} for row in rows]}, f)
+    os.replace(tmp_path, CATALOG_PATH)
+    return _to_frame(rows)
+
+# Folders matching a DataFrame.query expression, e.g.
+# select_folders("study == 'noise' and location == 'far' and noise_deg <= 10")
+def select_folders(expression, root='.', sort_by=None):
+    selected = load_catalog(root).query(expression)
+    if sort_by:
+        selected = selected.sort_values(sort_by)
+    return list(selected['folder'])
+
+
+if __name__ == '__main__':
+    with pd.option_context('display.width', 200, 'display.max_rows', None, 'display.max_columns', None):
+        print(load_catalog().drop(columns=['folder', 'members', 'sub_folders']))
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+from coverage_grid import CoverageIndex, segment_search, stack_column
+from robots import robot_rows
+from run_index import load_paired_runs
+
+
+# Failed robot and coverage at failure from one failure file. The coverage column is
+# named per experiment ('Failure Coverage (%)', 'Manual Failure Coverage (%)')
+def failure_record(failure_data, robot_column='Robot'):
+    robots = robot_rows(failure_data, robot_column)
+    coverage_column = [c for c in failure_data.columns if c != robot_column][0]
+    return robots[robot_column].iloc[0], float(robots[coverage_column].iloc[0])
+
+
+class FailureRuns:
+    # Failure trials aligned on each run's own failure instant instead of one average.
+    # A run fails the first time its coverage reaches the coverage its failure file
+    # recorded; before that it is read from before_column, after it from after_column
+    # (the merged map of the robots left), like asof_coverage's switch_time. Every
+    # metric is one vectorized pass over all runs stacked together
+    def __init__(self, data_frames, failure_frames, before_column='coverage_percent',
+                 after_column='merged_12_coverage', time_column='time_elapsed', trial_ids=None):
+        self.n_runs = len(data_frames)
+        self.trial_ids = list(range(self.n_runs)) if trial_ids is None else list(trial_ids)
+        records = [failure_record(df) for df in failure_frames]
+        self.failed_robots = [robot for robot, _ in records]
+        self.failure_coverage = np.array([coverage for _, coverage in records], dtype=np.float64)
+
+        times, run_ids = stack_column(data_frames, time_column)
+        before, _ = stack_column(data_frames, before_column)
+        after, _ = stack_column(data_frames, after_column)
+        self.failure_times = CoverageIndex(data_frames, stacked=(times, before, run_ids)).times_to(self.failure_coverage[None, :])[0]
+
+        # Samples sorted by time within each run, keeping file order for ties
+        order = np.lexsort((times, run_ids))
+        self.times, self.run_ids = times[order], run_ids[order]
+        self.before, self.after = before[order], after[order]
+        self.starts = np.searchsorted(self.run_ids, np.arange(self.n_runs + 1), side='left')
+        starts = self.starts
+        has_samples = starts[1:] > starts[:-1]
+        self.start_times = np.where(has_samples, self.times[np.minimum(starts[:-1], len(self.times) - 1)], np.nan)
+        self.end_times = np.where(has_samples, self.times[np.maximum(starts[1:] - 1, 0)], np.nan)
+        self.final_coverage = np.where(has_samples, self.after[np.maximum(starts[1:] - 1, 0)], np.nan)
+
+        # after_column samples past the failure only, for the time-to-recover searches
+        post = self.times > self.failure_times[self.run_ids]
+        self.recovery_index = CoverageIndex(data_frames, stacked=(self.times, np.where(post, self.after, np.nan), self.run_ids))
+
+    # Offsets from the failure every run has samples for at least one of, every step seconds
+    def default_offsets(self, step=1):
+        first = np.nanmin(self.start_times - self.failure_times)
+        last = np.nanmax(self.end_times - self.failure_times)
+        return np.arange(np.floor(first / step), np.ceil(last / step) + 1) * step
+
+    # (runs x offsets) coverage at each offset from the run's failure (t = 0, negative
+    # before it): the last sample at or before that instant. Offsets outside a run's
+    # samples, and runs that never reach their failure coverage, are NaN padding
+    def aligned(self, offsets=None, step=1):
+        offsets = self.default_offsets(step) if offsets is None else np.asarray(offsets, dtype=np.float64)
+        query = self.failure_times[:, None] + offsets[None, :]
+        valid = ((query >= self.start_times[:, None]) & (query <= self.end_times[:, None])) & np.isfinite(query)
+        query = np.where(valid, query, self.start_times[:, None])
+
+        # Last sample at or before each query, searched within the query's own run
+        index = segment_search(self.times, self.starts[:-1, None], self.starts[1:, None], query, side='right') - 1
+        index = np.clip(index, 0, max(len(self.times) - 1, 0))
+
+        values = np.where(offsets[None, :] <= 0, self.before[index], self.after[index])
+        return offsets, np.where(valid, values, np.nan)
+
+    # Coverage gained between the failure and the end of the run
+    def regained(self):
+        return self.final_coverage - self.failure_coverage
+
+    # Average coverage regained per second between the failure and the end of the run
+    def recovery_speed(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.regained() / (self.end_times - self.failure_times)
+
+    # (runs x offsets - 1) coverage regained per second over the aligned grid after the failure
+    def regained_per_second(self, offsets=None, step=1):
+        offsets, grid = self.aligned(offsets, step)
+        after = offsets >= 0
+        return offsets[after][1:], np.diff(grid[:, after], axis=1) / np.diff(offsets[after])
+
+    # (levels x runs) seconds from the failure until after_column reaches each level,
+    # NaN when it never does. relative=True measures levels in coverage points gained
+    # over the coverage at failure, so 0 is getting back to where the run failed
+    def time_to_recover(self, levels, relative=False):
+        levels = np.atleast_1d(np.asarray(levels, dtype=np.float64))
+        thresholds = levels[:, None] + (self.failure_coverage[None, :] if relative else 0)
+        return self.recovery_index.times_to(np.broadcast_to(thresholds, (len(levels), self.n_runs))) - self.failure_times
+
+    # One row per run with the failure and recovery metrics, plus one
+    # regain_<X>_time column per relative level in regain_levels
+    def metrics(self, regain_levels=(0, 10, 20)):
+        table = pd.DataFrame({
+            'failed_robot': self.failed_robots,
+            'failure_time': self.failure_times,
+            'failure_coverage': self.failure_coverage,
+            'termination_time': self.end_times,
+            'final_coverage': self.final_coverage,
+            'regained': self.regained(),
+            'recovery_speed': self.recovery_speed(),
+        }, index=pd.Index(self.trial_ids, name='run_id'))
+        for level, times in zip(regain_levels, self.time_to_recover(regain_levels, relative=True)):
+            table[f'regain_{level:g}_time'] = times
+        return table
+
+
+# Failure runs of one experiment folder, each time/ run joined to its failure file by run id
+def load_failure_runs(folder, **columns):
+    run_ids, runs = load_paired_runs(folder, ('time', 'failure'))
+    return FailureRuns(runs['time'], runs['failure'], trial_ids=run_ids, **columns)
@@ -1,9 +1,15 @@
 import pandas as pd
 import glob
+import warnings
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 import numpy as np
 
+from coverage_grid import CoverageIndex, asof_coverage
+from figures import band_center, band_mode, fill_band, head_band
+from quantile_sketch import QuantileSketch
+from robots import robot_rows
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 11
@@ -13,7 +19,7 @@ def process_file_pair(main_file, failure_file, failure_column):
     main_data = pd.read_csv(main_file)
     failure_data = pd.read_csv(failure_file)
     
-    tb3_robots = failure_data[failure_data['Robot'].isin(['tb3_1', 'tb3_2', 'tb3_3'])]
+    tb3_robots = robot_rows(failure_data)
     failure_coverage = tb3_robots[failure_column].values[0]
     
     return main_data, failure_coverage
@@ -39,49 +45,41 @@ def calculate_average_coverage(main_folder, failure_folder, failure_column):
     average_failure_coverage = sum(all_failure_coverages) / len(all_failure_coverages)
     
     # Uses average failure percentage to calculate the average failure time
-    failure_times = []
-    for main_data in all_main_data:
-        # Find the time when coverage percent first reaches or exceeds the average failure coverage
-        failure_time = main_data[main_data['coverage_percent'] >= average_failure_coverage]['time_elapsed'].values[0]
-        failure_times.append(failure_time)
-
-    average_failure_time = sum(failure_times) / len(failure_times)
+    # First time each run's coverage reaches it, one binary search over the running max of every run
+    failure_times = CoverageIndex(all_main_data).time_to(average_failure_coverage)
+
+    # Runs that never reach the average failure coverage have no failure time and are
+    # left out of the average instead of turning it into NaN
+    missed = np.isnan(failure_times)
+    if missed.all():
+        raise ValueError(f'{main_folder}: no run reaches the average failure coverage {average_failure_coverage:.2f}%')
+    if missed.any():
+        warnings.warn(f'{main_folder}: {missed.sum()} of {len(failure_times)} runs never reach '
+                      f'{average_failure_coverage:.2f}% coverage, left out of the average failure time')
+    average_failure_time = np.nanmean(failure_times)
 
     # Calculate the average total exploration time across all runs
     total_exploration_times = [main_data['time_elapsed'].max() for main_data in all_main_data]
     average_total_exploration_time = sum(total_exploration_times) / len(total_exploration_times)
 
     # Collect all unique time values across all runs
-    all_times = sorted(list(set(time for main_data in all_main_data for time in main_data['time_elapsed'] if time < 650)))
+    all_times = np.unique(np.concatenate([main_data['time_elapsed'].to_numpy() for main_data in all_main_data]))
+    all_times = all_times[all_times < 650]
     
+    # Coverage of every run at every time step, 'coverage_percent' up to the average
+    # failure time and 'merged_12_coverage' after it
+    coverage_matrix = asof_coverage(all_main_data, all_times, average_failure_time)
+
     # Calculate the average coverage for each time step and standard deviation
-    average_coverage = []
-    coverage_std_devs = []
-
-    for time in all_times:
-        coverages = []
-        for main_data in all_main_data:
-            if time <= average_failure_time:
-                # Before average failure time, use 'coverage_percent'
-                valid_times = main_data[main_data['time_elapsed'] <= time]['coverage_percent']
-                if not valid_times.empty:
-                    coverage = valid_times.values[-1]
-                else:
-                    coverage = main_data['coverage_percent'].values[0]  # Handle case where no valid times found
-                coverages.append(coverage)
-            else:
-                # After average failure time, use 'merged_12_coverage'
-                valid_times = main_data[main_data['time_elapsed'] <= time]['merged_12_coverage']
-                if not valid_times.empty:
-                    coverage = valid_times.values[-1]
-                else:
-                    coverage = main_data['merged_12_coverage'].values[0]  # Handle case where no valid times found
-                coverages.append(coverage)
-
-        # Calculate the average coverage at this time step
-        average_coverage.append(sum(coverages) / len(coverages))
-        # Calculate the standard deviation of the coverage at this time step
-        coverage_std_devs.append(np.std(coverages))
+    average_coverage = coverage_matrix.mean(axis=1)
+    coverage_std_devs = coverage_matrix.std(axis=1)
+
+    # Interquartile and 5-95% bands of the runs instead of the std with WSR_BANDS=quantile
+    if band_mode() == 'quantile':
+        sketch = QuantileSketch(len(all_times))
+        for run in coverage_matrix.T:
+            sketch.update(run)
+        coverage_std_devs = sketch.bands()
     
     # Calculate the average terminating coverage
     average_terminating_coverage = sum(terminating_merged_12_coverage) / len(terminating_merged_12_coverage)
@@ -107,31 +105,27 @@ plt.figure(figsize=(10, 6))
 wsr_valid_indices = [i for i, t in enumerate(wsr_times) if t <= wsr_avg_termination_time]
 wsr_valid_times = [wsr_times[i] for i in wsr_valid_indices]
 wsr_valid_coverage = [wsr_coverage[i] for i in wsr_valid_indices]
-wsr_valid_std_dev = [wsr_std_dev[i] for i in wsr_valid_indices]
+wsr_valid_std_dev = head_band(wsr_std_dev, len(wsr_valid_indices))
 
-plt.plot(wsr_valid_times, wsr_valid_coverage, label='WSR Coverage Percent', 
+plt.plot(wsr_valid_times, band_center(wsr_valid_coverage, wsr_valid_std_dev), label='WSR Coverage Percent', 
          color=wsr_line_color, 
          linewidth=3)
-plt.fill_between(wsr_valid_times, 
-                 np.array(wsr_valid_coverage) - np.array(wsr_valid_std_dev), 
-                 np.array(wsr_valid_coverage) + np.array(wsr_valid_std_dev), 
-                 color=wsr_line_color, 
-                 alpha=0.3)
+fill_band(plt.gca(), wsr_valid_times, np.array(wsr_valid_coverage), wsr_valid_std_dev,
+          color=wsr_line_color,
+          alpha=0.3)
 
 # Plot Manual data up to its average termination time
 manual_valid_indices = [i for i, t in enumerate(manual_times) if t <= manual_avg_termination_time]
 manual_valid_times = [manual_times[i] for i in manual_valid_indices]
 manual_valid_coverage = [manual_coverage[i] for i in manual_valid_indices]
-manual_valid_std_dev = [manual_std_dev[i] for i in manual_valid_indices]
+manual_valid_std_dev = head_band(manual_std_dev, len(manual_valid_indices))
 
-plt.plot(manual_valid_times, manual_valid_coverage, label='Manual Coverage Percent', 
+plt.plot(manual_valid_times, band_center(manual_valid_coverage, manual_valid_std_dev), label='Manual Coverage Percent', 
          color=manual_line_color,
          linewidth=3)
-plt.fill_between(manual_valid_times, 
-                 np.array(manual_valid_coverage) - np.array(manual_valid_std_dev), 
-                 np.array(manual_valid_coverage) + np.array(manual_valid_std_dev), 
-                 color=manual_line_color, 
-                 alpha=0.3)
+fill_band(plt.gca(), manual_valid_times, np.array(manual_valid_coverage), manual_valid_std_dev,
+          color=manual_line_color,
+          alpha=0.3)
 
 plt.axvline(x=wsr_failure_time,  color=wsr_failure_point_color, alpha=0.9, linewidth=2)
 plt.axvline(x=manual_failure_time, color=manual_failure_point_color, linestyle='--', alpha=0.9, linewidth=2)
@@ -1,9 +1,14 @@
 import pandas as pd
 import glob
+import warnings
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 import numpy as np
 
+from coverage_grid import CoverageIndex, asof_coverage
+from memo_cache import memoize
+from robots import robot_rows
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 16
@@ -13,7 +18,7 @@ def process_file_pair(main_file, failure_file, failure_column):
     main_data = pd.read_csv(main_file)
     failure_data = pd.read_csv(failure_file)
     
-    tb3_robots = failure_data[failure_data['Robot'].isin(['tb3_1', 'tb3_2', 'tb3_3'])]
+    tb3_robots = robot_rows(failure_data)
     failure_coverage = tb3_robots[failure_column].values[0]
     
     return main_data, failure_coverage
@@ -38,12 +43,18 @@ def calculate_average_coverage(main_folder, failure_folder, failure_column):
     average_failure_coverage = sum(all_failure_coverages) / len(all_failure_coverages)
     
     # Calculate the average failure time
-    failure_times = []
-    for main_data in all_main_data:
-        failure_time = main_data[main_data['coverage_percent'] >= average_failure_coverage]['time_elapsed'].values[0]
-        failure_times.append(failure_time)
+    # First time each run's coverage reaches it, one binary search over the running max of every run
+    failure_times = CoverageIndex(all_main_data).time_to(average_failure_coverage)
     
-    average_failure_time = sum(failure_times) / len(failure_times)
+    # Runs that never reach the average failure coverage have no failure time and are
+    # left out of the average instead of turning it into NaN
+    missed = np.isnan(failure_times)
+    if missed.all():
+        raise ValueError(f'{main_folder}: no run reaches the average failure coverage {average_failure_coverage:.2f}%')
+    if missed.any():
+        warnings.warn(f'{main_folder}: {missed.sum()} of {len(failure_times)} runs never reach '
+                      f'{average_failure_coverage:.2f}% coverage, left out of the average failure time')
+    average_failure_time = np.nanmean(failure_times)
     
     # Calculate the average total exploration time across all runs
     total_exploration_times = [main_data['time_elapsed'].max() for main_data in all_main_data]
@@ -69,26 +80,15 @@ manual_data, manual_failure_time, manual_terminating_coverage, manual_avg_termin
 # Calculate the combined average failure time
 combined_avg_failure_time = (wsr_failure_time + manual_failure_time) / 2
 
+# Cached on the run data, the failure / termination times and the as-of lookup's source
+@memoize(depends=(asof_coverage,))
 def compute_average_coverage(all_main_data, combined_avg_failure_time, wsr_avg_termination_time):
-    all_times = sorted(list(set(time for main_data in all_main_data for time in main_data['time_elapsed'] if time < 650)))
+    all_times = np.unique(np.concatenate([main_data['time_elapsed'].to_numpy() for main_data in all_main_data]))
+    all_times = all_times[all_times < 650]
     
-    average_coverage = []
-    coverage_std_devs = []
-
-    for time in all_times:
-        coverages = []
-        for main_data in all_main_data:
-            if time <= combined_avg_failure_time:
-                valid_times = main_data[main_data['time_elapsed'] <= time]['coverage_percent']
-                coverage = valid_times.values[-1] if not valid_times.empty else main_data['coverage_percent'].values[0]
-                coverages.append(coverage)
-            else:
-                valid_times = main_data[main_data['time_elapsed'] <= time]['merged_12_coverage']
-                coverage = valid_times.values[-1] if not valid_times.empty else main_data['merged_12_coverage'].values[0]
-                coverages.append(coverage)
-
-        average_coverage.append(sum(coverages) / len(coverages))
-        coverage_std_devs.append(np.std(coverages))
+    coverage_matrix = asof_coverage(all_main_data, all_times, combined_avg_failure_time)
+    average_coverage = coverage_matrix.mean(axis=1)
+    coverage_std_devs = coverage_matrix.std(axis=1)
     
     valid_indices = [i for i, t in enumerate(all_times) if t <= wsr_avg_termination_time]
     valid_times = [all_times[i] for i in valid_indices]
@@ -0,0 +1,153 @@
+import os
+import sys
+import json
+import runpy
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_runner import mp_context
+from memo_cache import function_source, update_hash
+
+FORMATS = ('pdf', 'png')
+
+# Scripts whose figures are built through output_figure, the only ones render_all and
+# the CLI's --out can write headless. The other plotting scripts still set rcParams at
+# import time and end in a blocking plt.show()
+FIGURE_SCRIPTS = [
+    'baseline_time_paper_interp.py',
+    'baseline_overlap_paper_interp.py',
+    'ablation_test_overlap.py',
+    'noise_overlap.py',
+]
+
+
+# Headless output goes here when WSR_FIGURE_DIR is set, otherwise figures open interactively
+def figure_dir():
+    return os.environ.get('WSR_FIGURE_DIR')
+
+# Band shading of the figure scripts, set through WSR_BANDS: 'std' (mean +- std, the
+# paper figures) or 'quantile' (interquartile and 5-95% bands from quantile_sketch)
+def band_mode():
+    return os.environ.get('WSR_BANDS', 'std')
+
+# x-axis of the interpolated overlap figures, set through WSR_OVERLAP_AXIS: 'time' (mean
+# overlap against mean coverage on a shared 100-point time grid, the paper figures) or
+# 'coverage' (overlap binned per running-max coverage percent by coverage_axis)
+def overlap_axis():
+    return os.environ.get('WSR_OVERLAP_AXIS', 'time')
+
+# Shades the spread around a curve: spread is a std array (center +- spread) or the
+# bands dict of QuantileSketch.bands(), drawn as the 5-95% range with the interquartile
+# range on top of it
+def fill_band(ax, x, center, spread, color, alpha=0.2, **kwargs):
+    if not isinstance(spread, dict):
+        return ax.fill_between(x, center - spread, center + spread, color=color, alpha=alpha, **kwargs)
+    ax.fill_between(x, *spread['outer'], color=color, alpha=alpha / 2, linewidth=0, **kwargs)
+    return ax.fill_between(x, *spread['iqr'], color=color, alpha=alpha, **kwargs)
+
+# The line drawn through a band: the mean for a std spread, the median for quantile bands
+def band_center(center, spread):
+    return spread['median'] if isinstance(spread, dict) else center
+
+# The first n grid points of a spread, for curves cut off at their termination
+def head_band(spread, n):
+    if not isinstance(spread, dict):
+        return spread[:n]
+    return {name: tuple(b[:n] for b in band) if isinstance(band, tuple) else band[:n] for name, band in spread.items()}
+
+# The serif paper style every script used to set through rcParams at import time
+def paper_style(font_size=17):
+    return {
+        'font.family': 'serif',
+        'font.serif': ['Times New Roman'],
+        'font.size': font_size,
+    }
+
+# Hash of everything that decides how a figure looks: the aggregate arrays, the
+# draw function's source and the figure options. Unchanged hash -> skip the render
+def aggregate_hash(draw, aggregates, **options):
+    digest = hashlib.sha256()
+    digest.update(function_source(draw).encode())
+    update_hash(digest, aggregates)
+    update_hash(digest, options)
+    return digest.hexdigest()
+
+# Renders one figure with the Agg canvas (no pyplot, no GUI) to out_dir/name.{pdf,png}.
+# draw(fig, aggregates) only gets precomputed arrays, never raw CSVs.
+# Returns the written paths, or [] when the stored hash says nothing changed
+def render_figure(name, draw, aggregates, out_dir=None, formats=FORMATS, figsize=(10, 6), font_size=17, force=False):
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    out_dir = out_dir or figure_dir() or 'figures'
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, f'{name}.{fmt}') for fmt in formats]
+    hash_path = os.path.join(out_dir, f'{name}.json')
+
+    digest = aggregate_hash(draw, aggregates, formats=list(formats), figsize=list(figsize), font_size=font_size)
+    if not force and all(os.path.exists(p) for p in paths):
+        try:
+            with open(hash_path) as f:
+                if json.load(f).get('hash') == digest:
+                    return []
+        except (OSError, ValueError):
+            pass
+
+    with matplotlib.rc_context(paper_style(font_size)):
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        draw(fig, aggregates)
+        for path in paths:
+            fig.savefig(path)
+
+    with open(hash_path, 'w') as f:
+        json.dump({'hash': digest, 'outputs': paths}, f)
+    return paths
+
+# Opens the figure in a pyplot window, the scripts' old interactive behaviour
+def show_figure(draw, aggregates, figsize=(10, 6), font_size=17):
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    with matplotlib.rc_context(paper_style(font_size)):
+        fig = plt.figure(figsize=figsize)
+        draw(fig, aggregates)
+        plt.show()
+
+# Writes the figure when WSR_FIGURE_DIR is set (batch / CI use), otherwise shows it
+def output_figure(name, draw, aggregates, figsize=(10, 6), font_size=17):
+    if figure_dir():
+        return render_figure(name, draw, aggregates, figsize=figsize, font_size=font_size)
+    show_figure(draw, aggregates, figsize=figsize, font_size=font_size)
+    return []
+
+# Raises ValueError for scripts that never call output_figure: run headless they would
+# open a pyplot window and block instead of writing their figure
+def check_figure_scripts(scripts):
+    unconverted = []
+    for script in scripts:
+        with open(script) as f:
+            if 'output_figure(' not in f.read():
+                unconverted.append(script)
+    if unconverted:
+        raise ValueError(f"not rendered through output_figure: {', '.join(unconverted)}")
+
+# Scripts run inside a render_all worker process their folders serially, so their
+# run_groups calls do not start a second pool under the first one
+def _run_figure_script(script, out_dir):
+    os.environ['WSR_FIGURE_DIR'] = out_dir
+    os.environ['WSR_MAX_WORKERS'] = '1'
+    runpy.run_path(script, run_name='__main__')
+
+# Regenerates the FIGURE_SCRIPTS figures without any window, one worker process per script.
+# Every script still computes its aggregates (memoized ones come from the memo cache),
+# only the drawing of figures whose aggregates and draw code are unchanged is skipped
+def render_all(out_dir='figures', scripts=FIGURE_SCRIPTS, max_workers=None):
+    check_figure_scripts(scripts)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context()) as executor:
+        list(executor.map(_run_figure_script, scripts, [out_dir] * len(scripts)))
+
+
+if __name__ == '__main__':
+    render_all(*sys.argv[1:2])
@@ -0,0 +1,218 @@
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from run_index import parse_run_id
+from running_stats import RunningStats
+
+# Time / value columns averaged live for each sub folder, same as the offline scripts,
+# plus the value that replaces samples <= 0 (the overlap scripts' `5 if x <= 0 else x`)
+LIVE_COLUMNS = {
+    'time': ('time_elapsed', 'coverage_percent', None),
+    'coverage': ('Time Elapsed (s)', 'Coverage Overlap (%)', 5),
+}
+
+
+class CsvTail:
+    # Follows one CSV that a robot is still writing. Only the bytes appended since
+    # the last read are parsed, and a trailing half-written line is left for the
+    # next read. A file that shrinks or is replaced starts over from the header
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.columns = None
+        self.inode = None
+
+    # Returns (new rows or None, reset). reset is True when previously read rows are no longer valid
+    def read_new(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None, False
+
+        reset = False
+        if self.inode is not None and (stat.st_ino != self.inode or stat.st_size < self.offset):
+            reset = True
+            self.offset = 0
+            self.columns = None
+        self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return None, reset
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return None, reset
+
+        if self.columns is None:
+            header_end = chunk.index(b'\n') + 1
+            self.columns = chunk[:header_end].decode().strip().split(',')
+            self.offset += header_end
+            chunk = chunk[header_end:]
+            end -= header_end
+            if end == 0:
+                return None, reset
+
+        self.offset += end
+        rows = pd.read_csv(io.BytesIO(chunk[:end]), header=None, names=self.columns)
+        return rows, reset
+
+
+class LiveGrid:
+    # Running mean / std across runs on the integer-second grid of align_runs: first
+    # sample of each second, gaps forward filled, NaN before a run's first sample.
+    # Every second up to a run's latest sample is final, so appended rows are folded
+    # into a RunningStats per second and never revisited
+    def __init__(self, time_column, value_column, nonpositive=None):
+        self.time_column = time_column
+        self.value_column = value_column
+        self.nonpositive = nonpositive
+        self.runs = {}
+        self.stats = RunningStats(0)
+
+    def _reserve(self, n_seconds):
+        if n_seconds > len(self.stats.count):
+            grown = RunningStats(max(n_seconds, 2 * len(self.stats.count)))
+            size = len(self.stats.count)
+            for name in ('count', 'mean', 'm2', 'min', 'max'):
+                getattr(grown, name)[:size] = getattr(self.stats, name)
+            self.stats = grown
+
+    # Adds one run's grid values for seconds start..stop-1, NaN seconds are skipped
+    def _update(self, start, values):
+        self._reserve(start + len(values))
+        padded = np.zeros(len(self.stats.count))
+        padded[start:start + len(values)] = values
+        mask = np.zeros(len(padded), dtype=bool)
+        mask[start:start + len(values)] = np.isfinite(values)
+        self.stats.update(padded, mask)
+
+    def append(self, run_id, rows):
+        run = self.runs.setdefault(run_id, {'values': np.zeros(0), 'length': 0})
+        seconds = np.rint(rows[self.time_column].to_numpy(dtype=np.float64)).astype(np.int64)
+        values = rows[self.value_column].to_numpy(dtype=np.float64)
+        if self.nonpositive is not None:
+            values = np.where(values <= 0, self.nonpositive, values)
+
+        # Seconds already on the grid keep their first sample
+        new = seconds >= run['length']
+        seconds, first = np.unique(seconds[new], return_index=True)
+        if len(seconds) == 0:
+            return 0
+        values = values[new][first]
+
+        # Forward fill from the run's last second, seconds before its first sample stay NaN
+        start, stop = run['length'], seconds[-1] + 1
+        positions = np.arange(start, stop)
+        index = np.searchsorted(seconds, positions, side='right') - 1
+        previous = run['values'][start - 1] if start else np.nan
+        filled = np.where(index >= 0, values[np.maximum(index, 0)], previous)
+
+        if stop > len(run['values']):
+            grown = np.zeros(max(stop, 2 * len(run['values'])))
+            grown[:start] = run['values'][:start]
+            run['values'] = grown
+        run['values'][start:stop] = filled
+        run['length'] = stop
+
+        self._update(start, filled)
+        return stop - start
+
+    # Removes a run, used when its file was rewritten. The statistics are rebuilt
+    # from the remaining runs' grids instead of subtracting the run back out
+    def drop(self, run_id):
+        if self.runs.pop(run_id, None) is None:
+            return
+        self.stats = RunningStats(len(self.stats.count))
+        for run in self.runs.values():
+            self._update(0, run['values'][:run['length']])
+
+    # (seconds, mean, std) over the runs that have data at each second, NaN where none has
+    def mean_std(self):
+        n_seconds = max((run['length'] for run in self.runs.values()), default=0)
+        count = self.stats.count[:n_seconds]
+        mean = np.where(count > 0, self.stats.mean[:n_seconds], np.nan)
+        std = np.where(count > 0, self.stats.std()[:n_seconds], np.nan)
+        return np.arange(n_seconds), mean, std
+
+
+class LiveFolder:
+    # Tails every CSV under folder/time and folder/coverage and keeps one LiveGrid
+    # per sub folder. New files are picked up on the next poll
+    def __init__(self, folder, kinds=LIVE_COLUMNS):
+        self.folder = folder
+        self.kinds = {kind: columns for kind, columns in kinds.items() if os.path.isdir(os.path.join(folder, kind))}
+        self.tails = {kind: {} for kind in self.kinds}
+        self.grids = {kind: LiveGrid(*columns) for kind, columns in self.kinds.items()}
+
+    # One polling pass: stat every file and parse only what was appended. Returns the number of new rows
+    def poll(self):
+        n_rows = 0
+        for kind, tails in self.tails.items():
+            directory = os.path.join(self.folder, kind)
+            for name in sorted(os.listdir(directory)):
+                if name.endswith('.csv') and name not in tails:
+                    tails[name] = CsvTail(os.path.join(directory, name))
+
+            grid = self.grids[kind]
+            for name, tail in tails.items():
+                run_id = parse_run_id(name)
+                run_id = name if run_id is None else run_id
+                rows, reset = tail.read_new()
+                if reset:
+                    grid.drop(run_id)
+                if rows is not None and len(rows):
+                    grid.append(run_id, rows)
+                    n_rows += len(rows)
+        return n_rows
+
+# Polls the folder every `interval` seconds and calls callback(live_folder) whenever
+# rows were appended. Stops after max_polls passes (None runs until interrupted)
+def follow(folder, callback, interval=0.5, max_polls=None):
+    live = LiveFolder(folder)
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        if live.poll():
+            callback(live)
+        polls += 1
+        time.sleep(interval)
+    return live
+
+# Average trajectory plot that redraws in place as runs progress
+def plot_live(folder, interval=0.5):
+    import matplotlib.pyplot as plt
+
+    plt.ion()
+    fig, axes = plt.subplots(1, len(LIVE_COLUMNS), figsize=(14, 6))
+    artists = {}
+    for ax, (kind, (_, value_column, _)) in zip(axes, LIVE_COLUMNS.items()):
+        line, = ax.plot([], [], color='#5B838F', linewidth=2)
+        artists[kind] = (ax, line, None)
+        ax.set_xlabel('Time Elapsed (s)')
+        ax.set_ylabel(value_column)
+
+    def redraw(live):
+        for kind, (seconds, mean, std) in ((k, g.mean_std()) for k, g in live.grids.items()):
+            ax, line, band = artists[kind]
+            line.set_data(seconds, mean)
+            if band is not None:
+                band.remove()
+            band = ax.fill_between(seconds, mean - std, mean + std, color='#5B838F', alpha=0.2)
+            artists[kind] = (ax, line, band)
+            ax.set_title(f'{kind}: {len(live.grids[kind].runs)} runs')
+            ax.relim()
+            ax.autoscale_view()
+        fig.canvas.draw_idle()
+        plt.pause(0.001)
+
+    follow(folder, redraw, interval)
+
+
+if __name__ == '__main__':
+    plot_live(sys.argv[1], *map(float, sys.argv[2:3]))
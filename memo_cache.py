@@ -0,0 +1,207 @@
+import os
+import sys
+import types
+import pickle
+import inspect
+import hashlib
+import functools
+
+import numpy as np
+import pandas as pd
+
+from compact_runs import SUFFIX
+from run_store import CACHE_ROOT, file_signature
+
+# Disk-backed results of the expensive aggregation functions, bounded in size with LRU eviction
+MEMO_DIR = os.path.join(CACHE_ROOT, 'memo')
+MAX_BYTES = int(os.environ.get('WSR_MEMO_MAX_BYTES', 512 * 1024 * 1024))
+# Helper modules of this repository (run_store, coverage_grid, ...) live next to this file
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def update_hash(digest, value):
+    if isinstance(value, np.ndarray):
+        digest.update(f'{value.dtype}{value.shape}'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr(value.name).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, dict):
+        digest.update(f'dict{len(value)}'.encode())
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            update_hash(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            update_hash(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+# Source code of a function, so editing a constant such as the 100-point grid or
+# the 90% cap changes every key that depends on it
+def function_source(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return f'{func.__module__}.{func.__qualname__}'
+
+# Cache entries are named after the defining module and the function, so the
+# process_folder of one script never reads another script's results. Scripts run
+# as __main__ (or through runpy) are named after their file
+def qualified_name(func):
+    module = func.__module__
+    if module == '__main__' or module.startswith('<'):
+        module = os.path.splitext(os.path.basename(func.__globals__.get('__file__', module)))[0]
+    return f'{module}.{func.__qualname__}'
+
+def _project_module(value):
+    module = value if isinstance(value, types.ModuleType) else sys.modules.get(getattr(value, '__module__', None) or '')
+    path = getattr(module, '__file__', None)
+    if path and os.path.dirname(os.path.abspath(path)) == PROJECT_DIR:
+        return module
+    return None
+
+def _global_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+# Repository modules a function can reach: the modules of every global it (or a nested
+# lambda / comprehension) refers to, followed through all globals of those modules,
+# so load_paired_runs pulls in run_index and run_store. The caller's own module is left
+# out, its relevant source is hashed function by function
+def helper_modules(func):
+    own = func.__module__
+    found = {}
+    stack = [{name: func.__globals__[name] for name in _global_names(func.__code__) if name in func.__globals__}]
+    while stack:
+        for value in stack.pop().values():
+            module = _project_module(value)
+            if module is not None and module.__name__ != own and module.__name__ not in found:
+                found[module.__name__] = module
+                stack.append(vars(module))
+    return found
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path, signature):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+# Source hash of every helper module reachable from the functions, in name order
+def helper_signature(functions):
+    modules = {}
+    for func in functions:
+        if hasattr(func, '__code__'):
+            modules.update(helper_modules(func))
+    return [[name, _file_digest(modules[name].__file__, tuple(file_signature(modules[name].__file__)))]
+            for name in sorted(modules)]
+
+# mtime / size of every CSV and compact_runs file under a folder (or of a single file),
+# the same invalidation rule as the run store. Folders converted to .wsrz hold no CSVs
+def source_signature(path):
+    if os.path.isfile(path):
+        return [[os.path.basename(path), file_signature(path)]]
+    signature = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for f in sorted(files):
+            if f.endswith(('.csv', SUFFIX)):
+                file_path = os.path.join(root, f)
+                signature.append([os.path.relpath(file_path, path), file_signature(file_path)])
+    return signature
+
+def memo_key(func, args, kwargs, depends=()):
+    digest = hashlib.sha256()
+    for f in (func,) + tuple(depends):
+        digest.update(function_source(f).encode())
+    update_hash(digest, helper_signature((func,) + tuple(depends)))
+    for value in list(args) + [kwargs]:
+        # Folder arguments are keyed by their file set, not by their name alone
+        if isinstance(value, str) and os.path.exists(value):
+            value = (value, source_signature(value))
+        update_hash(digest, value)
+    return digest.hexdigest()
+
+def _entry_path(name, key):
+    return os.path.join(MEMO_DIR, f'{name}-{key}.pkl')
+
+def _entries():
+    try:
+        names = os.listdir(MEMO_DIR)
+    except FileNotFoundError:
+        return []
+    entries = []
+    for name in names:
+        if name.endswith('.pkl'):
+            path = os.path.join(MEMO_DIR, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+# Deletes least recently used entries until the cache fits in max_bytes
+def enforce_limit(max_bytes=None):
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+# Explicit eviction: every entry of one function (by name), or the whole cache
+def evict(name=None):
+    for _, _, path in _entries():
+        if name is None or os.path.basename(path).startswith(f'{name}-'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+def clear():
+    evict()
+
+# Caches func's return value on disk, keyed on its source, the source of the
+# helpers listed in `depends` (the script's own functions), the source of every
+# repository module they reach, its arguments (DataFrames and arrays by content,
+# folder paths by their CSV file set) and the parameters it was called with
+def memoize(depends=(), max_bytes=None):
+    def decorator(func):
+        name = qualified_name(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            path = _entry_path(name, memo_key(func, args, kwargs, depends))
+            try:
+                with open(path, 'rb') as f:
+                    result = pickle.load(f)
+                # Touch the entry so LRU eviction sees it as recently used
+                os.utime(path)
+                return result
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+
+            result = func(*args, **kwargs)
+            os.makedirs(MEMO_DIR, exist_ok=True)
+            tmp_path = f'{path}.tmp{os.getpid()}'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            enforce_limit(max_bytes)
+            return result
+
+        wrapper.evict = functools.partial(evict, name)
+        return wrapper
+    return decorator
@@ -0,0 +1,153 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+
+from run_store import list_csv_files
+
+# Start-location tokens in folder names: wsr_far, hw_wsr_loc_3, ... Folders without one are near starts
+LOCATION_PATTERNS = [
+    (re.compile(r'_loc_(\d+)$'), 'loc_{}'),
+    (re.compile(r'_far$'), 'far'),
+]
+
+
+def location_label(folder_name):
+    for pattern, label in LOCATION_PATTERNS:
+        match = pattern.search(folder_name)
+        if match:
+            return label.format(*match.groups())
+    return 'near'
+
+# Start location of every run of a merged folder (wsr_near_far, hw_wsr_consolodated),
+# read off the per-location sibling folders that hold the same run files.
+# Runs in file name order, None for a run no sibling accounts for
+def run_strata(folder, kind='time'):
+    parent, name = os.path.split(os.path.normpath(folder))
+    parent = parent or '.'
+    files = list_csv_files(os.path.join(folder, kind))
+    strata = {}
+    for sibling in sorted(os.listdir(parent)):
+        path = os.path.join(parent, sibling, kind)
+        if sibling == name or not os.path.isdir(path):
+            continue
+        sibling_files = set(list_csv_files(path))
+        if sibling_files and sibling_files < set(files):
+            for f in sibling_files:
+                strata.setdefault(f, location_label(sibling))
+    return [strata.get(f) for f in files]
+
+
+def _ratio(a, b):
+    return b / a
+
+def _percent_difference(a, b):
+    return (b - a) / b * 100
+
+
+class MethodComparison:
+    # Method-vs-method tables of a per-run metric (e.g. termination time). Runs of two
+    # methods are compared only within the same start location when both methods have
+    # every run labelled and share a location; every (a, b) run pair inside a location
+    # counts once. Method pairs without such a pairing fall back to the unpaired ratio
+    # of means. All pairs come out of one set of matrix products over the stacked runs
+    def __init__(self, values, strata=None):
+        strata = strata or {}
+        self.methods = list(values)
+        self.values = np.concatenate([np.asarray(values[m], dtype=np.float64) for m in self.methods])
+        self.method_ids = np.repeat(np.arange(len(self.methods)), [len(values[m]) for m in self.methods])
+
+        labels = []
+        self.labelled = np.zeros(len(self.methods), dtype=bool)
+        for i, m in enumerate(self.methods):
+            method_strata = strata.get(m)
+            if method_strata is not None and len(method_strata) == len(values[m]) and None not in method_strata:
+                self.labelled[i] = True
+                labels.extend(method_strata)
+            else:
+                labels.extend([None] * len(values[m]))
+        self.strata = np.array(labels, dtype=object)
+
+    # One-hot (methods x runs) membership matrix
+    def _membership(self):
+        return (self.method_ids[None, :] == np.arange(len(self.methods))[:, None]).astype(np.float64)
+
+    def _same_stratum(self):
+        labelled = self.strata != None
+        return (self.strata[:, None] == self.strata[None, :]) & labelled[:, None] & labelled[None, :]
+
+    # Number of matched run pairs for every method pair, 0 where the comparison is unpaired
+    def pair_counts(self):
+        membership = self._membership()
+        counts = membership @ self._same_stratum().astype(np.float64) @ membership.T
+        counts[~(self.labelled[:, None] & self.labelled[None, :])] = 0
+        return counts
+
+    # (k x methods x methods) tables for k weightings of the runs (resample counts, or
+    # all ones for the plain table). table[a, b] is the weighted mean of pair(x_a, x_b)
+    # over matched run pairs, or pair(mean_a, mean_b) where the methods are unpaired
+    def _weighted_tables(self, pair, weights):
+        membership = self._membership()
+        same = self._same_stratum()
+        pair_values = np.where(same, pair(self.values[:, None], self.values[None, :]), 0)
+        same = same.astype(np.float64)
+
+        n_methods = len(self.methods)
+        sums = np.empty((len(weights), n_methods, n_methods))
+        counts = np.empty_like(sums)
+        for a in range(n_methods):
+            method_weights = weights * membership[a]
+            sums[:, a, :] = ((method_weights @ pair_values) * weights) @ membership.T
+            counts[:, a, :] = ((method_weights @ same) * weights) @ membership.T
+
+        means = (weights * self.values) @ membership.T / (weights @ membership.T)
+        paired = self.pair_counts() > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(paired, sums / np.where(counts > 0, counts, 1), pair(means[:, :, None], means[:, None, :]))
+
+    def _table(self, pair):
+        table = self._weighted_tables(pair, np.ones((1, len(self.values))))[0]
+        return pd.DataFrame(table, index=self.methods, columns=self.methods)
+
+    # Resample counts for n_boot bootstrap draws, runs are redrawn within their
+    # (method, start location) cell so every resample keeps the same pairing
+    def _resample_weights(self, rng, n_boot):
+        weights = np.zeros((n_boot, len(self.values)))
+        cells = {}
+        for i, key in enumerate(zip(self.method_ids, self.strata)):
+            cells.setdefault(key, []).append(i)
+        for members in cells.values():
+            weights[:, members] = rng.multinomial(len(members), np.full(len(members), 1 / len(members)), size=n_boot)
+        return weights
+
+    # Percentile CI tables (low, high) of pair over n_boot stratified resamples
+    def _bootstrap(self, pair, n_boot=10000, level=95, seed=0, chunk=5000):
+        rng = np.random.default_rng(seed)
+        tables = np.concatenate([self._weighted_tables(pair, self._resample_weights(rng, min(chunk, n_boot - start)))
+                                 for start in range(0, n_boot, chunk)])
+        low, high = np.percentile(tables, [(100 - level) / 2, 100 - (100 - level) / 2], axis=0)
+        return (pd.DataFrame(low, index=self.methods, columns=self.methods),
+                pd.DataFrame(high, index=self.methods, columns=self.methods))
+
+    # ratio()[a][b]: how many times larger b's metric is than a's (b / a)
+    def ratio(self):
+        return self._table(_ratio)
+
+    # percent_difference()[a][b]: (b - a) / b * 100, e.g. how much earlier a terminates than b
+    def percent_difference(self):
+        return self._table(_percent_difference)
+
+    def ratio_ci(self, n_boot=10000, level=95, seed=0):
+        return self._bootstrap(_ratio, n_boot, level, seed)
+
+    def percent_difference_ci(self, n_boot=10000, level=95, seed=0):
+        return self._bootstrap(_percent_difference, n_boot, level, seed)
+
+    def paired(self):
+        return pd.DataFrame(self.pair_counts() > 0, index=self.methods, columns=self.methods)
+
+
+# Comparison of the per-run values of several experiment folders, keyed by method name.
+# Start locations are discovered from the sibling per-location folders
+def compare_folders(folders, values, kind='time'):
+    return MethodComparison(values, {method: run_strata(folder, kind) for method, folder in folders.items()})
@@ -4,8 +4,11 @@ import os
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 
+from experiment_catalog import load_catalog
 
-folders = ["2_1_c", "5_10_c", "10_20_c", "30_1_c"]
+# Combined near / far noise sets, lowest noise first
+catalog = load_catalog()
+folders = list(catalog.query("study == 'noise' and location == 'near_far'").sort_values('noise_deg')['folder'])
 main_directory = ""
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman'] 
@@ -80,9 +83,8 @@ colors = ["#F6B379", "#CD797D", "#A1C185", "#5B838F",]
 
 for folder, color in zip(folders, colors):
     time_steps = np.arange(0, len(avg_coverage[folder]))
-    # Parse the folder name for the label
-    num1, num2, _ = folder.split('_')
-    label = f"{num1} deg, {num2} cm"
+    # Label from the noise parameters in the catalog
+    label = f"{catalog.loc[folder, 'noise_deg']} deg, {catalog.loc[folder, 'noise_cm']} cm"
     plt.plot(time_steps, avg_coverage[folder], label=label, color=color, linewidth=2.5)
     plt.fill_between(time_steps, 
                      np.array(avg_coverage[folder]) - np.array(std_coverage[folder]),
@@ -4,8 +4,11 @@ import os
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 
+from experiment_catalog import load_catalog
 
-folders = ["2_1_c", "5_10_c", "10_20_c", "30_1_c"]
+# Combined near / far noise sets, lowest noise first
+catalog = load_catalog()
+folders = list(catalog.query("study == 'noise' and location == 'near_far'").sort_values('noise_deg')['folder'])
 main_directory = ""
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman'] 
@@ -104,8 +107,8 @@ bar_positions = np.arange(len(folders))  # Positions for the bars
 plt.bar(bar_positions, sorted_avg_coverages, bar_width, color=sorted_colors, 
         yerr=sorted_std_coverages, capsize=5, alpha=0.8)
 
-# Parse the folder name for the x-tick labels
-xtick_labels = [f"{folder.split('_')[0]} deg, {folder.split('_')[1]} cm" for folder in sorted_folders]
+# X-tick labels from the noise parameters in the catalog
+xtick_labels = [f"{catalog.loc[folder, 'noise_deg']} deg, {catalog.loc[folder, 'noise_cm']} cm" for folder in sorted_folders]
 plt.xticks(bar_positions, xtick_labels)
 
 plt.yticks(np.arange(0, 101, 10))
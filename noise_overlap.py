@@ -1,12 +1,7 @@
-import os
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-
-rcParams['font.family'] = 'serif'
-rcParams['font.serif'] = ['Times New Roman']
-rcParams['font.size'] = 11
+from batch_runner import run_folders
+from coverage_axis import coverage_table, table_bands
+from figures import band_center, band_mode, fill_band, output_figure
+from run_index import load_paired_runs
 
 folders = {
     '2, 1': '2_1',
@@ -20,62 +15,63 @@ colors = {
     '30, 100': '#6E954B'
 }
 
-def read_coverage_data(folder):
+def read_coverage_data(data_frames):
     coverage_data = []
-    for file_name in os.listdir(os.path.join(folder, 'coverage')):
-        if file_name.endswith('.csv'):
-            file_path = os.path.join(folder, 'coverage', file_name)
-            df = pd.read_csv(file_path)
-            df['Time Elapsed (s)'] = df['Time Elapsed (s)'].round()
-            df['Coverage Overlap (%)'] = df['Coverage Overlap (%)'].apply(lambda x: 5 if x <= 0 else x)
-            coverage_data.append(df[['Time Elapsed (s)', 'Coverage Overlap (%)']])
-    combined_coverage_df = pd.concat(coverage_data, ignore_index=True)
-    return combined_coverage_df
+    for df in data_frames:
+        df['Time Elapsed (s)'] = df['Time Elapsed (s)'].round()
+        df['Coverage Overlap (%)'] = df['Coverage Overlap (%)'].apply(lambda x: 5 if x <= 0 else x)
+        coverage_data.append(df[['Time Elapsed (s)', 'Coverage Overlap (%)']])
+    return coverage_data
 
-def read_time_data(folder):
+def read_time_data(data_frames):
     time_data = []
-    for file_name in os.listdir(os.path.join(folder, 'time')):
-        if file_name.endswith('.csv'):
-            file_path = os.path.join(folder, 'time', file_name)
-            df = pd.read_csv(file_path)
-            df['time_elapsed'] = df['time_elapsed'].round()
-            df['coverage_percent'] = df['coverage_percent'].round()
-            time_data.append(df[['time_elapsed', 'coverage_percent']])
-    combined_time_df = pd.concat(time_data, ignore_index=True)
-    return combined_time_df
+    for df in data_frames:
+        df['time_elapsed'] = df['time_elapsed'].round()
+        df['coverage_percent'] = df['coverage_percent'].round()
+        time_data.append(df[['time_elapsed', 'coverage_percent']])
+    return time_data
 
 def process_folder(folder):
-    coverage_df = read_coverage_data(folder)
-    time_df = read_time_data(folder)
-    
-    merged_df = pd.merge(coverage_df, time_df, left_on='Time Elapsed (s)', right_on='time_elapsed')
-    
-    # Drop the duplicate time_elapsed column
-    merged_df.drop(columns=['time_elapsed'], inplace=True)
-    
-    # Group by coverage_percent and calculate the mean and standard deviation of coverage overlap
-    grouped_df = merged_df.groupby('coverage_percent')['Coverage Overlap (%)'].agg(['mean', 'std']).reset_index()
+    # Pair coverage and time files by the run id in their names, so overlap is only
+    # matched to coverage of the same run
+    run_ids, runs = load_paired_runs(folder, ('coverage', 'time'))
+    coverage_data = read_coverage_data(runs['coverage'])
+    time_data = read_time_data(runs['time'])
+
+    # Bin the overlap of every run by its running-max coverage percent in one pass: mean
+    # and std per bin, plus the quantiles for the interquartile and 5-95% bands in
+    # quantile mode
+    grouped_df = coverage_table(time_data, coverage_data, quantiles=band_mode() == 'quantile')
     
     # Filter the dataframe to include only coverage_percent between 10 and 90
     filtered_df = grouped_df[(grouped_df['coverage_percent'] >= 10) & (grouped_df['coverage_percent'] <= 90)]
     
     return filtered_df
 
-# Process each folder and store the results in a dictionary
-results = {}
-for name, folder in folders.items():
-    results[name] = process_folder(folder)
-
 # Plot coverage percent vs average coverage overlap with standard deviation shading for each dataset
-plt.figure(figsize=(10, 6))
+def draw_noise_overlap(fig, aggregates):
+    colors, results = aggregates['colors'], aggregates['results']
+    ax = fig.subplots()
+
+    for name, (coverage_percent, mean, std) in results.items():
+        ax.plot(coverage_percent, band_center(mean, std), label=f'{name}', color=colors[name], linewidth=2)
+        fill_band(ax, coverage_percent, mean, std, color=colors[name], alpha=0.2)
+
+    ax.set_xlabel('Total Map Coverage Percent')
+    ax.set_ylabel('Average Coverage Overlap (%)')
+    ax.set_title('Robot Map Coverage Overlap')
+    ax.legend()
+    ax.grid(True)
+
+# The std, or with WSR_BANDS=quantile the median, interquartile and 5-95% bands
+def spread(df):
+    if 'q50' not in df:
+        return df['std'].to_numpy()
+    return table_bands(df)
 
-for name, df in results.items():
-    plt.plot(df['coverage_percent'], df['mean'], label=f'{name}', color=colors[name], linewidth=2)
-    plt.fill_between(df['coverage_percent'], df['mean'] - df['std'], df['mean'] + df['std'], color=colors[name], alpha=0.2)
+if __name__ == '__main__':
+    # Process each folder in parallel and store the results in a dictionary
+    results = run_folders(folders, process_folder)
 
-plt.xlabel('Total Map Coverage Percent')
-plt.ylabel('Average Coverage Overlap (%)')
-plt.title('Robot Map Coverage Overlap')
-plt.legend()
-plt.grid(True)
-plt.show()
+    curves = {name: (df['coverage_percent'].to_numpy(), df['mean'].to_numpy(), spread(df)) for name, df in results.items()}
+    output_figure('noise_overlap', draw_noise_overlap, {'colors': colors, 'results': curves}, figsize=(10, 6), font_size=11)
@@ -0,0 +1,137 @@
+import numpy as np
+
+from coverage_grid import interp_runs
+
+# Quantiles behind the band figures: 5-95% range, interquartile range and median
+BAND_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class QuantileSketch:
+    # Streaming quantiles for every point of a grid in bounded memory, a merging
+    # t-digest kept for all points at once. Each point holds at most
+    # compression / 2 + 1 weighted centroids (means and weights as (points x slots)
+    # arrays). New samples are appended as unit centroids, then every point is
+    # sorted and its centroids are regrouped by the arcsine scale function in one
+    # bincount, so the tails keep small centroids and the middle gets big ones.
+    # A point that has seen up to about compression / 3 samples keeps them all and
+    # its quantiles match np.quantile. Sketches from different folders or worker
+    # processes are combined with merge, like RunningStats
+    def __init__(self, n_points, compression=100):
+        self.n_points = n_points
+        self.compression = compression
+        self.slots = int(compression) // 2 + 1
+        self.means = np.full((n_points, 0), np.nan)
+        self.weights = np.zeros((n_points, 0))
+        self.min = np.full(n_points, np.inf)
+        self.max = np.full(n_points, -np.inf)
+
+    # Samples seen at every grid point
+    @property
+    def count(self):
+        return self.weights.sum(axis=1)
+
+    # Folds (points x k) centroids into the sketch, zero weights are empty slots
+    def _absorb(self, means, weights):
+        means = np.concatenate([self.means, means], axis=1)
+        weights = np.concatenate([self.weights, weights], axis=1)
+        order = np.argsort(np.where(weights > 0, means, np.inf), axis=1, kind='stable')
+        means = np.take_along_axis(means, order, axis=1)
+        weights = np.take_along_axis(weights, order, axis=1)
+
+        # Centroid of every slot from the quantile at its center, through the k1 scale
+        # function: slot = floor(compression / (2 pi) * asin(2q - 1) + compression / 4)
+        total = weights.sum(axis=1, keepdims=True)
+        q = (np.cumsum(weights, axis=1) - weights / 2) / np.where(total > 0, total, 1)
+        k = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1)) + self.compression / 4
+        slot = np.clip(np.floor(k).astype(np.intp), 0, self.slots - 1)
+
+        cells = (np.arange(self.n_points)[:, None] * self.slots + slot).reshape(-1)
+        size = self.n_points * self.slots
+        merged_weights = np.bincount(cells, weights.reshape(-1), minlength=size).reshape(self.n_points, self.slots)
+        sums = np.bincount(cells, (weights * np.where(weights > 0, means, 0)).reshape(-1), minlength=size)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            merged_means = np.where(merged_weights > 0, sums.reshape(self.n_points, self.slots) / merged_weights, np.nan)
+
+        # Slots are in order of their means already, the empty ones are moved to the end
+        order = np.argsort(merged_weights == 0, axis=1, kind='stable')
+        self.means = np.take_along_axis(merged_means, order, axis=1)
+        self.weights = np.take_along_axis(merged_weights, order, axis=1)
+        return self
+
+    # Adds one sample per grid point (e.g. one interpolated run). Points where mask
+    # is False, and NaN samples, are skipped
+    def update(self, values, mask=None):
+        return self.update_batch(np.asarray(values, dtype=np.float64)[None, :], None if mask is None else np.asarray(mask)[None, :])
+
+    # Adds a (runs x grid) block at once
+    def update_batch(self, values, mask=None):
+        values = np.asarray(values, dtype=np.float64)
+        valid = np.isfinite(values) if mask is None else np.asarray(mask, dtype=bool) & np.isfinite(values)
+        self.min = np.fmin(self.min, np.where(valid, values, np.inf).min(axis=0, initial=np.inf))
+        self.max = np.fmax(self.max, np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf))
+        return self._absorb(np.where(valid, values, np.nan).T, valid.T.astype(np.float64))
+
+    # Adds samples that each belong to one grid point (index), any number per point,
+    # e.g. overlap samples binned on the coverage axis
+    def update_points(self, index, values):
+        index = np.asarray(index, dtype=np.intp)
+        values = np.asarray(values, dtype=np.float64)
+        order = np.argsort(index, kind='stable')
+        index, values = index[order], values[order]
+        counts = np.bincount(index, minlength=self.n_points)
+        rank = np.arange(len(index)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        block = np.full((counts.max(initial=0), self.n_points), np.nan)
+        block[rank, index] = values
+        return self.update_batch(block)
+
+    # Combines another sketch of the same grid into this one
+    def merge(self, other):
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        return self._absorb(other.means, other.weights)
+
+    # (quantiles x grid) values at each of qs, NaN at points without samples. A centroid
+    # of weight w starting at rank r stands for ranks r .. r + w - 1 and sits at their
+    # middle; ranks in between are interpolated linearly, with the exact min and max at
+    # the ends, which is np.quantile's linear rule whenever every centroid is one sample
+    def quantiles(self, qs):
+        qs = np.atleast_1d(np.asarray(qs, dtype=np.float64))
+        count = self.count
+        filled = (self.weights > 0).sum(axis=1)
+        rows = np.arange(self.n_points)
+
+        ranks = np.full((self.n_points, self.weights.shape[1] + 2), np.inf)
+        values = np.full(ranks.shape, np.nan)
+        ranks[:, 0], values[:, 0] = 0, self.min
+        centers = np.cumsum(self.weights, axis=1) - (self.weights + 1) / 2
+        ranks[:, 1:-1] = np.where(self.weights > 0, centers, np.inf)
+        values[:, 1:-1] = self.means
+        ranks[rows, filled + 1], values[rows, filled + 1] = np.maximum(count - 1, 0), self.max
+
+        result = interp_runs(qs[None, :] * np.maximum(count - 1, 0)[:, None], ranks, values, filled + 2)
+        result[count == 0] = np.nan
+        return result.T
+
+    def median(self):
+        return self.quantiles([0.5])[0]
+
+    # Median, interquartile range and 5-95% range of every grid point, the shape
+    # fill_band draws in place of mean +- std
+    def bands(self):
+        q05, q25, q50, q75, q95 = self.quantiles(BAND_QUANTILES)
+        return {'median': q50, 'iqr': (q25, q75), 'outer': (q05, q95)}
+
+
+# Combines the sketches produced by several workers into one. Like running_stats.merge_all,
+# an empty iterable needs n_points to build an empty sketch from
+def merge_all(sketches, n_points=None, compression=100):
+    sketches = list(sketches)
+    if not sketches and n_points is None:
+        raise ValueError('merge_all needs at least one sketch or n_points')
+    if sketches:
+        n_points, compression = sketches[0].n_points, sketches[0].compression
+    total = QuantileSketch(n_points, compression)
+    for s in sketches:
+        total.merge(s)
+    return total
@@ -0,0 +1,83 @@
+import os
+import warnings
+import numpy as np
+
+from coverage_grid import forward_fill
+from run_index import parse_run_id
+from run_store import open_store
+
+# Map regions of the divide-and-conquer baseline, one sub folder each (slow_baseline/bottom/time, ...)
+REGIONS = ['bottom', 'upper_left', 'upper_right']
+
+
+class RegionRuns:
+    # Every run of a divide-and-conquer experiment where each region is explored and
+    # logged separately. All region runs are loaded once and stacked on a shared
+    # integer-second grid as a (runs x regions x seconds) array: the max coverage of
+    # each second (groupby max), forward filled, NaN before a region's first sample.
+    # The nth file of every region (in run id order) belongs to run n
+    def __init__(self, folder, regions=REGIONS, kind='time', time_column='time_elapsed', coverage_column='coverage_percent'):
+        self.folder = folder
+        self.regions = list(regions)
+
+        stores = [open_store(os.path.join(folder, region, kind)) for region in self.regions]
+        orders = [sorted(range(len(store)), key=lambda i: parse_run_id(store.files[i])) for store in stores]
+        self.n_runs = min(len(order) for order in orders)
+        # Regions with a different number of runs cannot all be paired, the extra runs are reported
+        counts = {region: len(order) for region, order in zip(self.regions, orders)}
+        if len(set(counts.values())) > 1:
+            warnings.warn(f'{folder}: regions have different run counts {counts}, '
+                          f'only the first {self.n_runs} runs of each are merged')
+        self.files = [[store.files[i] for i in order[:self.n_runs]] for store, order in zip(stores, orders)]
+
+        # Every region run as one stacked column, tagged with its (run, region) cell
+        times, coverage, cells = [np.empty(0)], [np.empty(0)], [np.empty(0, dtype=np.int64)]
+        for r, (store, order) in enumerate(zip(stores, orders)):
+            for run, i in enumerate(order[:self.n_runs]):
+                times.append(np.asarray(store.run_column(i, time_column), dtype=np.float64))
+                coverage.append(np.asarray(store.run_column(i, coverage_column), dtype=np.float64))
+                cells.append(np.full(len(times[-1]), run * len(self.regions) + r))
+        times, coverage, cells = np.concatenate(times), np.concatenate(coverage), np.concatenate(cells)
+
+        # (runs x regions) last raw time of every region run
+        self.end_times = np.full(self.n_runs * len(self.regions), np.nan)
+        np.fmax.at(self.end_times, cells, times)
+        self.end_times = self.end_times.reshape(self.n_runs, len(self.regions))
+
+        # Max coverage of every (run, region, second) cell in one unbuffered reduction
+        valid = np.rint(times) >= 0
+        seconds = np.rint(times[valid]).astype(np.int64)
+        self.n_seconds = int(seconds.max(initial=0)) + 1
+        self.grid = np.full((self.n_runs, len(self.regions), self.n_seconds), np.nan)
+        np.fmax.at(self.grid.reshape(-1), cells[valid] * self.n_seconds + seconds, coverage[valid])
+        self.grid = forward_fill(self.grid)
+
+    # Last rounded second of every run, the latest of its regions
+    def termination_seconds(self):
+        return np.rint(self.end_times.max(axis=1)).astype(np.int64)
+
+    # Last raw time of every run, the latest of its regions
+    def termination_times(self):
+        return self.end_times.max(axis=1)
+
+    # (runs x seconds) total map coverage: the regions' coverage weighted and summed.
+    # weights default to an equal 1 / n_regions share of the map per region. Seconds
+    # before every region has a sample, or past the run's termination, are NaN
+    def combined(self, weights=None):
+        if weights is None:
+            weighted = self.grid / len(self.regions)
+        else:
+            weighted = self.grid * np.asarray(weights, dtype=np.float64)[None, :, None]
+        total = weighted.sum(axis=1)
+        total[np.arange(self.n_seconds)[None, :] > self.termination_seconds()[:, None]] = np.nan
+        return total
+
+
+# Coverage rows kept only while they are at most cap, then every run forward filled
+# onto seconds 0..n_seconds-1 (0 before its first kept row). The array form of
+# filtering each run's rows, reindexing to range(n_seconds), ffill() and fillna(0)
+def capped_alignment(total, n_seconds, cap=99):
+    kept = np.where(total <= cap, total, np.nan)
+    if kept.shape[1] < n_seconds:
+        kept = np.pad(kept, ((0, 0), (0, n_seconds - kept.shape[1])), constant_values=np.nan)
+    return np.nan_to_num(forward_fill(kept)[:, :n_seconds], nan=0.0)
@@ -0,0 +1,56 @@
+import re
+import numpy as np
+
+# Per-robot coverage columns of the time schema: r_<k>_per
+ROBOT_COVERAGE_COLUMN = re.compile(r'^r_(\d+)_per$')
+# Robot names used in the failure files (tb3_1, tb3_2, ...)
+ROBOT_NAME = r'^tb3_\d+$'
+
+
+def _robot_columns(columns, pattern):
+    found = {}
+    for column in columns:
+        match = pattern.match(column)
+        if match:
+            found[int(match.group(1))] = column
+    return dict(sorted(found.items()))
+
+# Robot ids present in a time frame, discovered from its r_k_per columns
+def robot_ids(df):
+    return list(_robot_columns(df.columns, ROBOT_COVERAGE_COLUMN))
+
+# (samples x robots) C-contiguous array of per-robot coverage, columns ordered by robot id
+def robot_coverage(df):
+    columns = _robot_columns(df.columns, ROBOT_COVERAGE_COLUMN)
+    return list(columns), np.ascontiguousarray(df[list(columns.values())].to_numpy(dtype=np.float64))
+
+# The robot with the lowest final (max) coverage of a run, the one slowed down in the
+# slow-robot experiments. Ties go to the lowest robot id
+def slowest_robot(ids, coverage):
+    return ids[int(np.argmin(coverage.max(axis=0, initial=0)))]
+
+# Last time each robot still reports coverage, one reduction over the sample axis
+def robot_termination_times(time, coverage):
+    time = np.asarray(time, dtype=np.float64)
+    active = coverage > 0
+    last = np.where(active, time[:, None], -np.inf).max(axis=0)
+    return np.where(active.any(axis=0), last, np.nan)
+
+# Per-robot termination time and final (max) coverage for every run, as
+# (runs x robots) arrays over the union of robot ids. Robots a run does not have are NaN
+def fleet_summary(data_frames, time_column='time_elapsed'):
+    runs = [robot_coverage(df) for df in data_frames]
+    ids = sorted(set(r for run_ids, _ in runs for r in run_ids))
+    position = {r: i for i, r in enumerate(ids)}
+
+    termination = np.full((len(runs), len(ids)), np.nan)
+    final_coverage = np.full((len(runs), len(ids)), np.nan)
+    for i, ((run_ids, coverage), df) in enumerate(zip(runs, data_frames)):
+        slots = [position[r] for r in run_ids]
+        termination[i, slots] = robot_termination_times(df[time_column], coverage)
+        final_coverage[i, slots] = coverage.max(axis=0, initial=0)
+    return ids, termination, final_coverage
+
+# Failure file rows that belong to a robot, whatever the fleet size
+def robot_rows(failure_data, column='Robot'):
+    return failure_data[failure_data[column].astype(str).str.match(ROBOT_NAME)]
@@ -0,0 +1,109 @@
+import os
+import bisect
+import re
+import warnings
+
+from run_store import list_csv_files, open_store
+
+# Sub folders an experiment folder may hold. The early failure experiments log their
+# time series to main/ instead of time/, and failure files live in either spelling
+RUN_KINDS = ('coverage', 'time')
+KIND_DIRS = {'coverage': ('coverage',), 'time': ('time', 'main')}
+FAILURE_DIRS = ('failure', 'failures')
+
+
+# Trailing epoch of a run file: exploration_test_1720710820.csv,
+# AOA_exploration_test_1720710820.csv and failed_1723646369.csv all parse the same way
+def parse_run_id(file_name):
+    match = re.search(r'(\d+)(?=\D*$)', os.path.splitext(file_name)[0])
+    return int(match.group(1)) if match else None
+
+
+class RunIndex:
+    # Keyed run table for one experiment folder: runs[run_id][kind] -> file name.
+    # Files that could not be keyed or joined are kept in `unmatched`
+    def __init__(self, folder):
+        self.folder = folder
+        self.dirs = {}
+        self.runs = {}
+        self.unmatched = {}
+
+        for kind in RUN_KINDS:
+            for kind_dir in KIND_DIRS[kind]:
+                if os.path.isdir(os.path.join(folder, kind_dir)):
+                    self.dirs[kind] = kind_dir
+                    self._add_files(kind)
+                    break
+
+        for failure_dir in FAILURE_DIRS:
+            if os.path.isdir(os.path.join(folder, failure_dir)):
+                self.dirs['failure'] = failure_dir
+                self._add_failures()
+                break
+
+    def _add_files(self, kind):
+        for file_name in list_csv_files(os.path.join(self.folder, self.dirs[kind])):
+            run_id = parse_run_id(file_name)
+            if run_id is None or kind in self.runs.get(run_id, {}):
+                self.unmatched.setdefault(kind, []).append(file_name)
+                continue
+            self.runs.setdefault(run_id, {})[kind] = file_name
+
+    # Failure files are stamped when the robot drops out, before the run's own file
+    # is written, so each one belongs to the first run at or after its epoch. When
+    # several failures land on one run the latest is kept and the rest are reported
+    def _add_failures(self):
+        run_ids = sorted(self.runs)
+        failures = []
+        for file_name in list_csv_files(os.path.join(self.folder, self.dirs['failure'])):
+            failure_id = parse_run_id(file_name)
+            if failure_id is None:
+                self.unmatched.setdefault('failure', []).append(file_name)
+            else:
+                failures.append((failure_id, file_name))
+
+        for failure_id, file_name in sorted(failures):
+            position = bisect.bisect_left(run_ids, failure_id)
+            if position == len(run_ids):
+                self.unmatched.setdefault('failure', []).append(file_name)
+                continue
+            owner = self.runs[run_ids[position]]
+            if 'failure' in owner:
+                self.unmatched.setdefault('failure', []).append(owner['failure'])
+            owner['failure'] = file_name
+
+    def path(self, run_id, kind):
+        return os.path.join(self.folder, self.dirs[kind], self.runs[run_id][kind])
+
+    # Run ids that have a file of every requested kind, in epoch order. Runs missing
+    # one of the kinds are reported instead of being silently dropped or mis-paired
+    def paired(self, *kinds, warn=True):
+        kinds = kinds or tuple(self.dirs)
+        complete = {r for r, files in self.runs.items() if all(k in files for k in kinds)}
+        run_ids = sorted(complete)
+        if warn:
+            missing = sorted(r for r, files in self.runs.items() if any(k in files for k in kinds) and r not in complete)
+            dropped = {k: v for k, v in self.unmatched.items() if k in kinds}
+            if missing or dropped:
+                warnings.warn(f'{self.folder}: {len(missing)} runs without all of {kinds} {missing}, '
+                              f'unmatched files {dropped}')
+        return run_ids
+
+
+def build_run_index(folder):
+    return RunIndex(folder)
+
+# Loads the requested kinds for every fully matched run, joined by run id.
+# Returns the run ids and a {kind: [DataFrame per run]} dict in the same order
+def load_paired_runs(folder, kinds=RUN_KINDS):
+    index = build_run_index(folder)
+    absent = {kind: KIND_DIRS.get(kind, FAILURE_DIRS) for kind in kinds if kind not in index.dirs}
+    if absent:
+        raise ValueError(f'{folder}: no sub folder for {list(absent)}, looked for {absent}')
+    run_ids = index.paired(*kinds)
+    runs = {}
+    for kind in kinds:
+        store = open_store(os.path.join(folder, index.dirs[kind]))
+        position = {name: i for i, name in enumerate(store.files)}
+        runs[kind] = [store.frame(position[index.runs[r][kind]]) for r in run_ids]
+    return run_ids, runs
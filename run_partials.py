@@ -0,0 +1,173 @@
+import os
+import re
+import json
+import numpy as np
+import pandas as pd
+
+from quantile_sketch import QuantileSketch
+from run_store import file_signature, list_csv_files
+from running_stats import RunningStats
+
+# Per-run partial aggregates are kept inside the experiment folder, next to the CSVs
+PARTIALS_DIR = '.wsr_partials'
+PARTIALS_VERSION = 2
+# Resolution of the fixed time grid every run is interpolated onto once
+GRID_STEP = 0.1
+STATS_FIELDS = ('count', 'mean', 'm2', 'min', 'max')
+
+
+def _save_npy(path, values):
+    tmp_path = f'{path}.tmp{os.getpid()}.npy'
+    np.save(tmp_path, values)
+    os.replace(tmp_path, path)
+
+# The manifest and the folder statistics are one file, so they are replaced together
+# and a crash or a concurrent updater can never pair totals with the wrong run list
+def _save_state(path, manifest, stats):
+    tmp_path = f'{path}.tmp{os.getpid()}.npz'
+    np.savez(tmp_path, manifest=np.array(json.dumps(manifest)), **{name: getattr(stats, name) for name in STATS_FIELDS})
+    os.replace(tmp_path, path)
+
+
+class RunPartials:
+    # Per-run termination time / coverage and coverage interpolated on a fixed
+    # GRID_STEP grid, plus the folder-level RunningStats (count / mean / M2) of those
+    # grids. Runs hold their last value past their end, the same as np.interp does,
+    # so a longer run only extends the statistics with the final values of the others
+    def __init__(self, directory, time_column='time_elapsed', value_column='coverage_percent', step=GRID_STEP):
+        self.directory = directory
+        self.time_column = time_column
+        self.value_column = value_column
+        self.step = step
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', f'{time_column}-{value_column}-{step:g}').strip('_')
+        self.path = os.path.join(directory, PARTIALS_DIR, slug)
+        self.manifest, self.stats = self._read_state()
+
+    def _state_path(self):
+        return os.path.join(self.path, 'state.npz')
+
+    def _read_state(self):
+        try:
+            with np.load(self._state_path()) as state:
+                manifest = json.loads(str(state['manifest']))
+                stats = RunningStats(len(state['count']))
+                for name in STATS_FIELDS:
+                    setattr(stats, name, state[name])
+            if manifest.get('version') == PARTIALS_VERSION:
+                return manifest, stats
+        except (OSError, ValueError, KeyError):
+            pass
+        return {'version': PARTIALS_VERSION, 'runs': {}}, RunningStats(0)
+
+    def _grid_path(self, name):
+        return os.path.join(self.path, f'{name}.npy')
+
+    def _run_partial(self, name):
+        df = pd.read_csv(os.path.join(self.directory, name))
+        time = df[self.time_column].to_numpy(dtype=np.float64)
+        values = df[self.value_column].to_numpy(dtype=np.float64)
+        grid = np.interp(np.arange(int(np.ceil(time.max() / self.step)) + 1) * self.step, time, values)
+        entry = {
+            'signature': file_signature(os.path.join(self.directory, name)),
+            'termination_time': float(time.max()),
+            'termination_coverage': float(values[-1]),
+            'final': float(grid[-1]),
+        }
+        return entry, grid
+
+    # Extends the statistics to n grid points. Every run seen so far is flat at its
+    # final value there, so the new points all get the statistics of the final values
+    def _extend(self, n):
+        old = len(self.stats.count)
+        if n <= old:
+            return
+        finals = RunningStats(1)
+        for entry in self.manifest['runs'].values():
+            finals.update([entry['final']])
+        extended = RunningStats(n)
+        for name in STATS_FIELDS:
+            getattr(extended, name)[:old] = getattr(self.stats, name)
+            getattr(extended, name)[old:] = getattr(finals, name)[0]
+        self.stats = extended
+
+    def _add(self, name, entry, grid):
+        self._extend(len(grid))
+        padded = np.full(len(self.stats.count), entry['final'])
+        padded[:len(grid)] = grid
+        self.stats.update(padded)
+        self.manifest['runs'][name] = entry
+
+    # Rebuilds the statistics from the stored per-run grids, used when runs were
+    # removed or changed, since a Welford update cannot be taken back out exactly
+    def _recompute(self):
+        runs = self.manifest['runs']
+        self.manifest['runs'] = {}
+        self.stats = RunningStats(0)
+        for name, entry in runs.items():
+            self._add(name, entry, np.load(self._grid_path(name)))
+
+    # Processes only the CSVs that were added or changed since the last call
+    def update(self):
+        files = list_csv_files(self.directory)
+        runs = self.manifest['runs']
+        stale = [name for name in runs
+                 if name not in files or runs[name]['signature'] != file_signature(os.path.join(self.directory, name))]
+        new = [name for name in files if name not in runs or name in stale]
+        if not stale and not new:
+            return self
+
+        os.makedirs(self.path, exist_ok=True)
+        for name in stale:
+            del runs[name]
+            if name not in files:
+                os.remove(self._grid_path(name))
+        if stale:
+            self._recompute()
+
+        for name in new:
+            entry, grid = self._run_partial(name)
+            _save_npy(self._grid_path(name), grid)
+            self._add(name, entry, grid)
+
+        _save_state(self._state_path(), self.manifest, self.stats)
+        # Separate totals and manifest of the version 1 layout
+        for legacy in ('total.npy', 'total_sq.npy', 'manifest.json'):
+            if os.path.exists(os.path.join(self.path, legacy)):
+                os.remove(os.path.join(self.path, legacy))
+        return self
+
+    def __len__(self):
+        return len(self.manifest['runs'])
+
+    # Per-run values in file name order, the order load_all_csv returns the runs in
+    def termination_times(self):
+        return [self.manifest['runs'][name]['termination_time'] for name in sorted(self.manifest['runs'])]
+
+    def termination_coverages(self):
+        return [self.manifest['runs'][name]['termination_coverage'] for name in sorted(self.manifest['runs'])]
+
+    # Every run's stored grid interpolated at time_points, one run at a time in file name order
+    def _run_values(self, time_points):
+        for name in sorted(self.manifest['runs']):
+            grid = np.load(self._grid_path(name), mmap_mode='r')
+            yield np.interp(time_points, np.arange(len(grid)) * self.step, grid)
+
+    # Mean and population std on the fixed grid, read off the folder statistics
+    def grid_mean_std(self):
+        count = self.stats.count
+        return (np.arange(len(count)) * self.step, np.where(count > 0, self.stats.mean, np.nan),
+                np.where(count > 0, self.stats.std(), np.nan))
+
+    # Quantile sketch across runs at arbitrary time points, each run's stored grid
+    # interpolated at the points and added in turn, one run in memory at a time
+    def sketch(self, time_points, compression=100):
+        time_points = np.asarray(time_points, dtype=np.float64)
+        sketch = QuantileSketch(len(time_points), compression)
+        for values in self._run_values(time_points):
+            sketch.update(values)
+        return sketch
+
+
+# Opens a folder's partials and brings them up to date with its CSVs
+def update_partials(directory, time_column='time_elapsed', value_column='coverage_percent', step=GRID_STEP):
+    return RunPartials(directory, time_column, value_column, step).update()
@@ -0,0 +1,204 @@
+import os
+import re
+import json
+import time
+import shutil
+import numpy as np
+import pandas as pd
+
+# Cached columnar copies of the experiment folders live here, one store per folder
+CACHE_ROOT = os.environ.get('WSR_CACHE_DIR', '.wsr_cache')
+STORE_VERSION = 1
+
+
+def list_csv_files(directory):
+    return sorted(f for f in os.listdir(directory) if f.endswith('.csv'))
+
+# mtime and size are enough to notice a re-exported or appended run
+def file_signature(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def store_path(directory, kind='run_store'):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', os.path.normpath(directory)).strip('_')
+    return os.path.join(CACHE_ROOT, kind, slug)
+
+
+class RunStore:
+    # One experiment folder (e.g. wsr_near_far/time) stored as one memory-mapped
+    # array per column, with every run concatenated and split by `offsets`
+    def __init__(self, directory, manifest, columns):
+        self.directory = directory
+        self.manifest = manifest
+        self.columns = columns
+        self.files = [entry['name'] for entry in manifest['files']]
+        self.offsets = np.cumsum([0] + [entry['rows'] for entry in manifest['files']])
+
+    def __len__(self):
+        return len(self.files)
+
+    def column(self, name):
+        return self.columns[name]
+
+    def run_column(self, i, name):
+        return self.columns[name][self.offsets[i]:self.offsets[i + 1]]
+
+    # Largest value of a column in every run (NaN skipped), one reduceat over the memmap.
+    # Only runs with rows start a segment, so an empty run never cuts off the run before
+    # it; empty runs are NaN
+    def run_max(self, name):
+        column = np.asarray(self.columns[name], dtype=np.float64)
+        filled = np.diff(self.offsets) > 0
+        result = np.full(len(self), np.nan)
+        if filled.any():
+            result[filled] = np.fmax.reduceat(column, self.offsets[:-1][filled])
+        return result
+
+    # Last value of a column in every run, NaN for runs without rows
+    def run_last(self, name):
+        column = self.columns[name]
+        rows = np.diff(self.offsets)
+        last = column[np.maximum(self.offsets[1:] - 1, 0)] if len(column) else np.zeros(len(self))
+        return np.where(rows > 0, np.asarray(last, dtype=np.float64), np.nan)
+
+    def frame(self, i):
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        data = {}
+        for name, dtype in self.manifest['files'][i]['columns']:
+            data[name] = np.array(self.columns[name][start:stop]).astype(dtype)
+        return pd.DataFrame(data)
+
+    def frames(self):
+        return [self.frame(i) for i in range(len(self))]
+
+
+# A store directory holds immutable versions, <path>/v<time>_<pid>/ with the columns and
+# the manifest, plus a CURRENT file naming the live one. A rebuild writes a new version and
+# swaps CURRENT with os.replace, so a reader sees the old store or the new one, never a
+# partly written or half-deleted one
+def _current_version(path):
+    try:
+        with open(os.path.join(path, 'CURRENT')) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def _read_manifest(version_path):
+    try:
+        with open(os.path.join(version_path, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != STORE_VERSION:
+        return None
+    return manifest
+
+def _open_columns(version_path, manifest):
+    return {name: np.load(os.path.join(version_path, f'col_{i}.npy'), mmap_mode='r')
+            for i, name in enumerate(manifest['column_names'])}
+
+def _write_version(directory, version_path, files, signatures):
+    data_frames = [pd.read_csv(os.path.join(directory, f)) for f in files]
+
+    # Union of the columns in first-seen order, runs that lack a column get NaN / ''
+    column_names = []
+    for df in data_frames:
+        column_names.extend(c for c in df.columns if c not in column_names)
+
+    for i, name in enumerate(column_names):
+        numeric = all(pd.api.types.is_numeric_dtype(df[name]) for df in data_frames if name in df)
+        parts = []
+        for df in data_frames:
+            if name in df:
+                parts.append(df[name].to_numpy(dtype=np.float64) if numeric else df[name].astype(str).to_numpy())
+            else:
+                parts.append(np.full(len(df), np.nan) if numeric else np.full(len(df), ''))
+        values = np.concatenate(parts) if parts else np.empty(0)
+        if not numeric:
+            values = values.astype(str)
+        np.save(os.path.join(version_path, f'col_{i}.npy'), values)
+
+    manifest = {
+        'version': STORE_VERSION,
+        'directory': directory,
+        'column_names': column_names,
+        'files': [
+            {
+                'name': f,
+                'signature': signature,
+                'rows': len(df),
+                'columns': [[c, str(df[c].dtype)] for c in df.columns],
+            }
+            for f, signature, df in zip(files, signatures, data_frames)
+        ],
+    }
+    # The manifest goes last, a version without one is never pointed to
+    with open(os.path.join(version_path, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+# Versions older than the one just replaced are nobody's CURRENT any more, the replaced
+# one is kept for readers that resolved it a moment ago. Versions a concurrent build is
+# still writing are newer than that, so they are left alone. Files of the old flat
+# layout (manifest.json / col_*.npy directly in the store directory) are removed too
+def _prune(path, current, previous):
+    for name in os.listdir(path):
+        entry = os.path.join(path, name)
+        if name.startswith('CURRENT') or name in (current, previous):
+            continue
+        if os.path.isdir(entry):
+            if previous is not None and name.startswith('v') and name < previous:
+                shutil.rmtree(entry, ignore_errors=True)
+        elif name == 'manifest.json' or name.startswith('col_'):
+            os.remove(entry)
+
+# Writes a new version of the store and makes it current. Errors propagate, the
+# half-written version is removed and CURRENT still names the previous store
+def _build_store(directory, path, files, signatures):
+    os.makedirs(path, exist_ok=True)
+    version = f'v{time.time_ns():020d}_{os.getpid()}'
+    version_path = os.path.join(path, version)
+    os.makedirs(version_path)
+    try:
+        manifest = _write_version(directory, version_path, files, signatures)
+    except BaseException:
+        shutil.rmtree(version_path, ignore_errors=True)
+        raise
+
+    previous = _current_version(path)
+    pointer_path = os.path.join(path, f'CURRENT.tmp{os.getpid()}')
+    with open(pointer_path, 'w') as f:
+        f.write(version)
+    os.replace(pointer_path, os.path.join(path, 'CURRENT'))
+    _prune(path, version, previous)
+    return version_path, manifest
+
+# Opens the cached store for a folder, rebuilding it when any CSV was added,
+# removed or changed (mtime / size) since the store was written. A version pruned
+# between reading CURRENT and mapping its columns is retried from the new CURRENT
+def open_store(directory, attempts=3):
+    files = list_csv_files(directory)
+    signatures = [file_signature(os.path.join(directory, f)) for f in files]
+    path = store_path(directory)
+
+    for attempt in range(attempts):
+        version = _current_version(path)
+        version_path = None if version is None else os.path.join(path, version)
+        manifest = None if version is None else _read_manifest(version_path)
+        cached = None if manifest is None else [[e['name'], e['signature']] for e in manifest['files']]
+        if cached != [[f, s] for f, s in zip(files, signatures)]:
+            version_path, manifest = _build_store(directory, path, files, signatures)
+        try:
+            return RunStore(directory, manifest, _open_columns(version_path, manifest))
+        except FileNotFoundError:
+            if attempt == attempts - 1:
+                raise
+
+# Drop-in replacement for the per-script os.listdir + pd.read_csv loops. A folder
+# converted by compact_runs.py holds .wsrz files instead of CSVs and is decoded directly
+def load_all_csv(directory):
+    from compact_runs import SUFFIX, load_all_compact
+
+    if not list_csv_files(directory) and any(f.endswith(SUFFIX) for f in os.listdir(directory)):
+        return load_all_compact(directory)
+    return open_store(directory).frames()
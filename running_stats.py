@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class RunningStats:
+    # Streaming count / mean / variance / min / max for every point of a grid.
+    # Runs are folded in one at a time with Welford's update, so nothing but the
+    # accumulators is kept in memory, and partial results from different folders
+    # or worker processes are combined with Chan's parallel merge
+    def __init__(self, shape):
+        self.count = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+
+    # Adds one sample per grid point (e.g. one interpolated run). Points where
+    # mask is False are skipped, like the `interp > 0` masks in slow_analysis.py
+    def update(self, values, mask=None):
+        values = np.asarray(values, dtype=np.float64)
+        mask = np.ones(self.count.shape, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        x = values[mask]
+
+        self.count[mask] += 1
+        delta = x - self.mean[mask]
+        self.mean[mask] += delta / self.count[mask]
+        self.m2[mask] += delta * (x - self.mean[mask])
+        self.min[mask] = np.minimum(self.min[mask], x)
+        self.max[mask] = np.maximum(self.max[mask], x)
+        return self
+
+    # Adds a (runs x grid) block at once by reducing it and merging the result
+    def update_batch(self, values, mask=None):
+        values = np.asarray(values, dtype=np.float64)
+        mask = np.ones(values.shape, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+
+        batch = RunningStats(self.count.shape)
+        batch.count = mask.sum(axis=0).astype(np.float64)
+        safe_count = np.where(batch.count > 0, batch.count, 1)
+        batch.mean = np.where(mask, values, 0).sum(axis=0) / safe_count
+        batch.m2 = np.where(mask, (values - batch.mean) ** 2, 0).sum(axis=0)
+        batch.min = np.where(mask, values, np.inf).min(axis=0)
+        batch.max = np.where(mask, values, -np.inf).max(axis=0)
+        return self.merge(batch)
+
+    # Chan et al. pairwise combination of two partial accumulators
+    def merge(self, other):
+        count = self.count + other.count
+        safe_count = np.where(count > 0, count, 1)
+        delta = other.mean - self.mean
+
+        self.mean = self.mean + delta * other.count / safe_count
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / safe_count
+        self.count = count
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+
+    # Grid points with too few samples report 0, matching the old `count == 0 -> 1` guard
+    def variance(self, ddof=0):
+        return self.m2 / np.maximum(self.count - ddof, 1)
+
+    def std(self, ddof=0):
+        return np.sqrt(self.variance(ddof))
+
+
+# Combines the accumulators produced by several workers into one. With no
+# accumulators at all there is no grid shape to build an empty one from, unless
+# shape is given
+def merge_all(stats, shape=None):
+    stats = list(stats)
+    if not stats and shape is None:
+        raise ValueError('merge_all needs at least one accumulator or a shape')
+    total = RunningStats(stats[0].count.shape if shape is None else shape)
+    for s in stats:
+        total.merge(s)
+    return total
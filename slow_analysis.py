@@ -5,6 +5,10 @@ import os
 import re
 from matplotlib import rcParams
 
+from coverage_grid import interp_runs
+from robots import robot_coverage, robot_termination_times, slowest_robot
+from running_stats import RunningStats
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 11
@@ -16,132 +20,85 @@ csv_files = [f for f in files if f.endswith('.csv')]
 # Sort files based on the ending digit
 csv_files.sort(key=lambda x: int(re.search(r'(\d+)\.csv$', x).group(1)))
 
-slow_robot_list = [2, 2, 3, 3, 1, 1, 2, 3, 1, 2]
-
-termination_times_slow = []
-termination_times_fast_1 = []
-termination_times_fast_2 = []
 data_frames = []
-
-total_coverage_sum = np.zeros(1000)
-total_coverage_sum_sq = np.zeros(1000)
-total_coverage_count = np.zeros(1000)
+termination_times = []
 
 # Read all files and collect data
-for idx, file in enumerate(csv_files):
+for file in csv_files:
     file_path = os.path.join(folder_path, file)
     df = pd.read_csv(file_path)
-    slow_robot = slow_robot_list[idx]
+
+    # Per-robot coverage as a (samples x robots) array, discovered from the r_k_per columns.
+    # The slow robot (lowest final coverage) goes in the first column and the fast robots
+    # follow in id order
+    robot_list, robot_coverage_array = robot_coverage(df)
+    slow_robot = slowest_robot(robot_list, robot_coverage_array)
+    order = [robot_list.index(slow_robot)] + [i for i, r in enumerate(robot_list) if r != slow_robot]
+    robot_coverage_array = robot_coverage_array[:, order]
 
     # Append data frames
-    data_frames.append((df, slow_robot))
-
-    # Collect termination times based on slow and fast robots
-    slow_termination_time = df['time_elapsed'][df[f'r_{slow_robot}_per'] > 0].max()
-    termination_times_slow.append(slow_termination_time)
-
-    # Identify fast robots and split between fast_1 and fast_2
-    fast_robots = [r for r in [1, 2, 3] if r != slow_robot]
-
-    fast_1_termination_time = df['time_elapsed'][df[f'r_{fast_robots[0]}_per'] > 0].max()
-    termination_times_fast_1.append(fast_1_termination_time)
-
-    fast_2_termination_time = df['time_elapsed'][df[f'r_{fast_robots[1]}_per'] > 0].max()
-    termination_times_fast_2.append(fast_2_termination_time)
-
-# Calculate average termination times
-avg_termination_time_slow = np.mean(termination_times_slow)
-avg_termination_time_fast_1 = np.mean(termination_times_fast_1)
-avg_termination_time_fast_2 = np.mean(termination_times_fast_2)
-
-# Create time vectors with steps for each
-time_steps_slow = np.linspace(0, avg_termination_time_slow, num=1000)
-time_steps_fast_1 = np.linspace(0, avg_termination_time_fast_1, num=1000)
-time_steps_fast_2 = np.linspace(0, avg_termination_time_fast_2, num=1000)
-
-# Initialize arrays to accumulate the interpolated values and their squares
-slow_sum = np.zeros_like(time_steps_slow)
-slow_sum_sq = np.zeros_like(time_steps_slow)
-fast_1_sum = np.zeros_like(time_steps_fast_1)
-fast_1_sum_sq = np.zeros_like(time_steps_fast_1)
-fast_2_sum = np.zeros_like(time_steps_fast_2)
-fast_2_sum_sq = np.zeros_like(time_steps_fast_2)
-count_slow = np.zeros_like(time_steps_slow)
-count_fast_1 = np.zeros_like(time_steps_fast_1)
-count_fast_2 = np.zeros_like(time_steps_fast_2)
+    data_frames.append((df['time_elapsed'].to_numpy(), robot_coverage_array, df['coverage_percent'].to_numpy()))
+
+    # Collect termination times of every robot in one reduction
+    termination_times.append(robot_termination_times(df['time_elapsed'], robot_coverage_array))
+
+# Runs may log different fleet sizes: robot slots are the slow robot then the fast ones
+# in id order, slots a run does not have stay NaN and are left out of every average
+n_slots = max(len(times) for times in termination_times)
+termination_matrix = np.full((len(termination_times), n_slots), np.nan)
+for i, times in enumerate(termination_times):
+    termination_matrix[i, :len(times)] = times
+
+# Calculate average termination times, slow robot first
+avg_termination_times = np.nanmean(termination_matrix, axis=0)
+
+# Create time vectors with steps for each robot, one row per robot
+time_steps = np.linspace(0, avg_termination_times, num=1000, axis=-1)
 
 # Determine the maximum of the average termination times for the total coverage time vector
-max_avg_termination_time = max(avg_termination_time_slow, avg_termination_time_fast_1, avg_termination_time_fast_2)
+max_avg_termination_time = avg_termination_times.max()
 time_steps_total_coverage = np.linspace(0, max_avg_termination_time, num=1000)
 
+# Streaming statistics per robot and time step, only the accumulators are kept across runs
+robot_stats = RunningStats(time_steps.shape)
+total_coverage_stats = RunningStats(len(time_steps_total_coverage))
+
 # Interpolate data for each file and accumulate
-for df, slow_robot in data_frames:
-
-    # Interpolate and accumulate for slow robot
-    slow_interp = np.interp(time_steps_slow, df['time_elapsed'], df[f'r_{slow_robot}_per'])
-    mask_slow = slow_interp > 0
-    slow_sum[mask_slow] += slow_interp[mask_slow]
-    slow_sum_sq[mask_slow] += slow_interp[mask_slow] ** 2
-    count_slow[mask_slow] += 1
-
-    # Identify fast robots and interpolate
-    fast_robots = [r for r in [1, 2, 3] if r != slow_robot]
-
-    fast_1_interp = np.interp(time_steps_fast_1, df['time_elapsed'], df[f'r_{fast_robots[0]}_per'])
-    mask_fast_1 = fast_1_interp > 0
-    fast_1_sum[mask_fast_1] += fast_1_interp[mask_fast_1]
-    fast_1_sum_sq[mask_fast_1] += fast_1_interp[mask_fast_1] ** 2
-    count_fast_1[mask_fast_1] += 1
-
-    fast_2_interp = np.interp(time_steps_fast_2, df['time_elapsed'], df[f'r_{fast_robots[1]}_per'])
-    mask_fast_2 = fast_2_interp > 0
-    fast_2_sum[mask_fast_2] += fast_2_interp[mask_fast_2]
-    fast_2_sum_sq[mask_fast_2] += fast_2_interp[mask_fast_2] ** 2
-    count_fast_2[mask_fast_2] += 1
-
-    coverage_interp = np.interp(time_steps_total_coverage, df['time_elapsed'], df['coverage_percent'])
-    total_coverage_sum += coverage_interp
-    total_coverage_sum_sq += coverage_interp ** 2
-    total_coverage_count[coverage_interp > 0] += 1
-
-# Avoid division by zero
-count_slow[count_slow == 0] = 1
-count_fast_1[count_fast_1 == 0] = 1
-count_fast_2[count_fast_2 == 0] = 1
-total_coverage_count[total_coverage_count == 0] = 1
-
-# Calculate means
-slow_avg = slow_sum / count_slow
-fast_1_avg = fast_1_sum / count_fast_1
-fast_2_avg = fast_2_sum / count_fast_2
-total_coverage_avg = total_coverage_sum / total_coverage_count
-
-# Calculate standard deviations
-slow_std = np.sqrt((slow_sum_sq / count_slow) - slow_avg ** 2)
-fast_1_std = np.sqrt((fast_1_sum_sq / count_fast_1) - fast_1_avg ** 2)
-fast_2_std = np.sqrt((fast_2_sum_sq / count_fast_2) - fast_2_avg ** 2)
-total_coverage_std = np.sqrt((total_coverage_sum_sq / total_coverage_count) - total_coverage_avg ** 2)
+for time_elapsed, robot_coverage_array, coverage_percent in data_frames:
+    # Every robot of the run on its own time steps in one batched np.interp
+    n_robots = robot_coverage_array.shape[1]
+    robot_interp = np.full(time_steps.shape, np.nan)
+    interp_runs(time_steps[:n_robots], np.broadcast_to(time_elapsed, (n_robots, len(time_elapsed))),
+                robot_coverage_array.T, np.full(n_robots, len(time_elapsed)), out=robot_interp[:n_robots])
+    robot_stats.update(robot_interp, robot_interp > 0)
+
+    coverage_interp = np.interp(time_steps_total_coverage, time_elapsed, coverage_percent)
+    total_coverage_stats.update(coverage_interp, coverage_interp > 0)
+
+# Calculate means and standard deviations
+robot_avg = robot_stats.mean
+robot_std = robot_stats.std()
+total_coverage_avg = total_coverage_stats.mean
+total_coverage_std = total_coverage_stats.std()
 
 plt.figure(figsize=(12, 8))
 
 slow_line_color = '#CD797D'
-fast_line_color_1 = '#6E954B'
-fast_line_color_2 = '#5B838F'
+fast_line_colors = ['#6E954B', '#5B838F', '#884E6D', '#F2CC8F']
 total_map = '#F6B379'
 
 
 plt.plot(time_steps_total_coverage, total_coverage_avg, color=total_map, linewidth=2.5, label='Total Map Coverage', linestyle='--')
 plt.fill_between(time_steps_total_coverage, total_coverage_avg - total_coverage_std, total_coverage_avg + total_coverage_std, color=total_map, alpha=0.1)
 
-plt.plot(time_steps_fast_1, fast_1_avg, color=fast_line_color_1, linewidth=2.5,label='Fast Robot #1')
-plt.fill_between(time_steps_fast_1, fast_1_avg - fast_1_std, fast_1_avg + fast_1_std, color=fast_line_color_1, linewidth=2, alpha=0.2)
-
-plt.plot(time_steps_fast_2, fast_2_avg, color=fast_line_color_2, linewidth=2.5, label='Fast Robot #2')
-plt.fill_between(time_steps_fast_2, fast_2_avg - fast_2_std, fast_2_avg + fast_2_std, color=fast_line_color_2, linewidth=2, alpha=0.2)
+for k in range(1, len(time_steps)):
+    fast_line_color = fast_line_colors[(k - 1) % len(fast_line_colors)]
+    plt.plot(time_steps[k], robot_avg[k], color=fast_line_color, linewidth=2.5, label=f'Fast Robot #{k}')
+    plt.fill_between(time_steps[k], robot_avg[k] - robot_std[k], robot_avg[k] + robot_std[k], color=fast_line_color, linewidth=2, alpha=0.2)
 
 
-plt.plot(time_steps_slow, slow_avg, color=slow_line_color, linewidth=2.5, label='Slow Robot')
-plt.fill_between(time_steps_slow, slow_avg - slow_std, slow_avg + slow_std, color=slow_line_color, alpha=0.2)
+plt.plot(time_steps[0], robot_avg[0], color=slow_line_color, linewidth=2.5, label='Slow Robot')
+plt.fill_between(time_steps[0], robot_avg[0] - robot_std[0], robot_avg[0] + robot_std[0], color=slow_line_color, alpha=0.2)
 
 plt.xlabel('Time Elapsed (s)')
 plt.ylabel('Map Coverage Percent')
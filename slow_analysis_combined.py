@@ -5,6 +5,8 @@ import matplotlib.pyplot as plt
 
 from matplotlib import rcParams
 
+from region_merge import RegionRuns, capped_alignment
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 16
@@ -47,44 +49,16 @@ average_time_wsr = average_coverage_percent_wsr.index
 std_dev_termination_coverage_wsr = np.std(termination_coverages_wsr)
 print("Standard Deviation of Termination Coverage Percent for WSR:", std_dev_termination_coverage_wsr)
 
-# Processing slow_baseline data
-main_folder_slow_baseline = "slow_baseline"
-sub_folders = ["bottom", "upper_left", "upper_right"]
-
-all_total_coverages = []
-termination_times_slow_baseline = []
-
-for i in range(10):  # Loop over the 10 runs
-    region_coverage = {}
-
-    for sub_folder in sub_folders:
-        time_folder_path = os.path.join(main_folder_slow_baseline, sub_folder, "time")
-        files = sorted(os.listdir(time_folder_path), key=extract_number)
-        
-        file_path = os.path.join(time_folder_path, files[i])
-        df = pd.read_csv(file_path)
-        
-        df['time_elapsed'] = df['time_elapsed'].round()
-        
-        df_grouped = df.groupby('time_elapsed')['coverage_percent'].max().reset_index()
-        df_grouped['coverage_percent'] = df_grouped['coverage_percent'] / 3
-        
-        region_coverage[sub_folder] = df_grouped.set_index('time_elapsed')
-
-    max_time_slow_baseline = int(max(df.index.max() for df in region_coverage.values()))
-    termination_times_slow_baseline.append(max_time_slow_baseline)
-
-    for region, df in region_coverage.items():
-        region_coverage[region] = df.reindex(range(0, max_time_slow_baseline + 1)).ffill()
-
-    total_coverage = sum(region_coverage.values())
-    total_coverage = total_coverage.reset_index()
-    total_coverage = total_coverage[total_coverage['coverage_percent'] <= 99]
-
-    all_total_coverages.append(total_coverage.set_index('time_elapsed')['coverage_percent'])
+# Processing slow_baseline data: every region run loaded once onto a (runs x regions x seconds)
+# grid and the regions summed with an equal share of the map each
+slow_baseline_runs = RegionRuns("slow_baseline", ["bottom", "upper_left", "upper_right"])
+termination_times_slow_baseline = slow_baseline_runs.termination_seconds()
 
+# Rows above 99% are dropped, then every run is forward filled onto the average termination time
 average_total_time_slow_baseline = int(np.mean(termination_times_slow_baseline))
-aligned_coverages_slow_baseline = pd.concat([df.reindex(range(0, average_total_time_slow_baseline + 1)).ffill().fillna(0) for df in all_total_coverages], axis=1)
+time_index_slow_baseline = range(0, average_total_time_slow_baseline + 1)
+aligned_coverages_slow_baseline = pd.DataFrame(capped_alignment(slow_baseline_runs.combined(), len(time_index_slow_baseline)).T,
+                                               index=time_index_slow_baseline)
 
 average_coverage_percent_slow_baseline = aligned_coverages_slow_baseline.mean(axis=1)
 std_coverage_percent_slow_baseline = aligned_coverages_slow_baseline.std(axis=1)
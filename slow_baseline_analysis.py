@@ -1,33 +1,15 @@
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
+
+from region_merge import RegionRuns
 
 # Base directory structures
 base_dir_slow_baseline = "slow_baseline"
 base_dir_far_wsr_slow = "far_wsr_slow_updated"
-subfolders = ["bottom", "upper_left", "upper_right"]
+regions = ["bottom", "upper_left", "upper_right"]
 time_folder = "time"
 
-# Function to get max times for slow_baseline
-def get_max_times_slow_baseline(base_dir, subfolders, time_folder):
-    max_times = []
-    for i in range(10):
-        max_time_per_run = []
-        for subfolder in subfolders:
-            folder_path = os.path.join(base_dir, subfolder, time_folder)
-            csv_files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
-
-            # Ensure we process files in the same order across subfolders
-            csv_files.sort()
-
-            file_path = os.path.join(folder_path, csv_files[i])
-            df = pd.read_csv(file_path)
-            max_time = df['time_elapsed'].max()
-            max_time_per_run.append(max_time)
-        max_times.append(max(max_time_per_run))
-    return max_times
-
 # Function to get max times for far_wsr_slow
 def get_max_times_far_wsr_slow(base_dir, time_folder):
     max_times = []
@@ -45,7 +27,8 @@ def get_max_times_far_wsr_slow(base_dir, time_folder):
     return max_times
 
 # Get max times for both datasets
-max_times_slow_baseline = get_max_times_slow_baseline(base_dir_slow_baseline, subfolders, time_folder)
+# A slow_baseline run ends when its last region does
+max_times_slow_baseline = list(RegionRuns(base_dir_slow_baseline, regions, time_folder).termination_times())
 max_times_far_wsr_slow = get_max_times_far_wsr_slow(base_dir_far_wsr_slow, time_folder)
 
 # Calculate average max times and standard deviations
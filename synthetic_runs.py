@@ -0,0 +1,93 @@
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+# First run epoch of a generated corpus, runs are spaced like the real trials
+BASE_EPOCH = 1800000000
+RUN_SPACING = 900
+
+
+# Monotone coverage curve with the plateaus the real exploration runs show
+def _coverage_curve(rng, t, start, final, tau):
+    curve = start + (final - start) * (1 - np.exp(-t / tau))
+    noise = rng.normal(0, 0.4, len(t)).cumsum() * 0.05
+    stalls = rng.random(len(t)) < 0.3
+    curve = np.where(stalls, 0, curve + noise)
+    return np.clip(np.maximum.accumulate(curve), 0, 100)
+
+# One run in the time/, coverage/ and failure/ schemas. Returns the time and coverage
+# frames, plus the failure frame and failure time (None without failure injection)
+def generate_run(rng, n_robots=3, sample_rate=1.0, duration=None, failure=False, merged_column=None):
+    duration = duration or rng.uniform(250, 550)
+    n_samples = max(int(duration * sample_rate), 2)
+    t = np.arange(n_samples) / sample_rate + rng.uniform(0, 0.1) + rng.normal(0, 0.01, n_samples).clip(0)
+    t = np.maximum.accumulate(t)
+
+    start = rng.uniform(10, 30)
+    coverage = _coverage_curve(rng, t, start, rng.uniform(85, 97), duration / rng.uniform(2, 4))
+
+    shares = rng.dirichlet(np.ones(n_robots) * 4) * rng.uniform(100, 130)
+    robots = np.stack([_coverage_curve(rng, t, 0, share, duration / rng.uniform(1.5, 4)) for share in shares], axis=1)
+    robots[0] = 0
+
+    failure_df = None
+    failure_index = None
+    if failure:
+        failed_robot = rng.integers(n_robots)
+        failure_index = int(n_samples * rng.uniform(0.2, 0.5))
+        robots[failure_index:, failed_robot] = robots[failure_index, failed_robot]
+        failure_df = pd.DataFrame({'Robot': [f'tb3_{failed_robot + 1}'],
+                                   'Failure Coverage (%)': [coverage[failure_index]]})
+
+    time_df = pd.DataFrame({'coverage_percent': coverage, 'time_elapsed': t,
+                            'inter_agent_distance': np.abs(rng.normal(0, 3, n_samples).cumsum()) + 5})
+    time_df.loc[0, 'inter_agent_distance'] = 0
+    for k in range(n_robots):
+        time_df[f'r_{k + 1}_per'] = robots[:, k]
+    add_merged = failure if merged_column is None else merged_column
+    if add_merged:
+        time_df['merged_12_coverage'] = np.clip(robots.sum(axis=1) * coverage.max() / robots.sum(axis=1).max(), 0, 100)
+    for k in range(n_robots):
+        time_df[f'r{k + 1}_stop_time'] = 0.0
+
+    # The real runs end with the last row repeated and the first robot's stop time filled in
+    time_df = pd.concat([time_df, time_df.iloc[[-1]]], ignore_index=True)
+    time_df.loc[len(time_df) - 1, 'r1_stop_time'] = t[-1]
+
+    overlap = np.clip(np.linspace(-20, rng.uniform(20, 60), n_samples) + rng.normal(0, 5, n_samples), -40, 100)
+    coverage_df = pd.DataFrame({'Time Elapsed (s)': t, 'Coverage Overlap (%)': overlap})
+
+    return time_df, coverage_df, failure_df, (t[failure_index] if failure else None)
+
+# Writes a corpus of n_runs runs under folder/{time,coverage,failure}, named like the
+# real exports so run_index pairs them the same way
+def generate_corpus(folder, n_runs, n_robots=3, sample_rate=1.0, failure_rate=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    for sub_folder in ('time', 'coverage', 'failure'):
+        os.makedirs(os.path.join(folder, sub_folder), exist_ok=True)
+
+    for i in range(n_runs):
+        epoch = BASE_EPOCH + i * RUN_SPACING
+        time_df, coverage_df, failure_df, failure_time = generate_run(
+            rng, n_robots=n_robots, sample_rate=sample_rate, failure=rng.random() < failure_rate,
+            merged_column=failure_rate > 0)
+        time_df.to_csv(os.path.join(folder, 'time', f'exploration_exploration_test_{epoch}.csv'), index=False)
+        coverage_df.to_csv(os.path.join(folder, 'coverage', f'exploration_test_{epoch}.csv'), index=False)
+        if failure_df is not None:
+            # Failure files are stamped at the failure, before the run file
+            failure_epoch = epoch - int(time_df['time_elapsed'].iloc[-1] - failure_time)
+            failure_df.to_csv(os.path.join(folder, 'failure', f'failed_{failure_epoch}.csv'), index=False)
+    return folder
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic run corpus')
+    parser.add_argument('folder')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--robots', type=int, default=3)
+    parser.add_argument('--sample-rate', type=float, default=1.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    generate_corpus(args.folder, args.runs, args.robots, args.sample_rate, args.failure_rate, args.seed)
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import run_store
+
+
+def _write_runs(directory, runs):
+    os.makedirs(directory)
+    for name, rows in runs.items():
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write('time_elapsed,coverage_percent\n')
+            for time, coverage in rows:
+                f.write(f'{time},{coverage}\n')
+
+# Header-only CSVs in the middle and at the end of a folder must not cut off the run before them
+def test_run_max_and_last_with_empty_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_store, 'CACHE_ROOT', str(tmp_path / 'cache'))
+    directory = str(tmp_path / 'time')
+    _write_runs(directory, {
+        'run_1.csv': [(0, 1), (2, 4), (1, 3)],
+        'run_2.csv': [],
+        'run_3.csv': [(5, 2), (9, 6), (30, 8)],
+        'run_4.csv': [],
+    })
+
+    store = run_store.open_store(directory)
+    np.testing.assert_array_equal(store.run_max('time_elapsed'), [2, np.nan, 30, np.nan])
+    np.testing.assert_array_equal(store.run_last('coverage_percent'), [3, np.nan, 8, np.nan])
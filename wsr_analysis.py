@@ -5,6 +5,9 @@ import matplotlib.pyplot as plt
 from matplotlib import rcParams
 import matplotlib.cm as cm
 
+from bootstrap import bootstrap_ci, mean
+from coverage_grid import align_runs, grid_mean_std
+
 rcParams['font.family'] = 'serif'
 rcParams['font.serif'] = ['Times New Roman']
 rcParams['font.size'] = 17
@@ -31,33 +34,12 @@ avg_termination_coverage = np.mean(termination_coverage)
 termination_times = [df['time_elapsed'].max() for df in data_frames]
 avg_time_elapsed = int(np.mean(termination_times))
 
-# Function to extrapolate the coverage to the average termination coverage and time
-def extrapolate_coverage(df, avg_time_elapsed, avg_termination_coverage):
-    max_time = df['time_elapsed'].max()
-    max_coverage = df['coverage_percent'].max()
-    
-    if max_coverage < avg_termination_coverage and max_time < avg_time_elapsed:
-        slope = (avg_termination_coverage - max_coverage) / (avg_time_elapsed - max_time)
-        extrapolated_time = list(range(max_time, avg_time_elapsed + 1))
-        extrapolated_coverage = [max_coverage + slope * (t - max_time) for t in extrapolated_time]
-        extrapolated_df = pd.DataFrame({'time_elapsed': extrapolated_time, 'coverage_percent': extrapolated_coverage})
-        df = pd.concat([df, extrapolated_df.iloc[1:]], ignore_index=True)
-    elif max_time < avg_time_elapsed:
-        extrapolated_time = list(range(max_time, avg_time_elapsed + 1))
-        extrapolated_coverage = [max_coverage] * len(extrapolated_time)
-        extrapolated_df = pd.DataFrame({'time_elapsed': extrapolated_time, 'coverage_percent': extrapolated_coverage})
-        df = pd.concat([df, extrapolated_df.iloc[1:]], ignore_index=True)
-    return df
-
-# Extrapolate data for each trial
-extrapolated_data_frames = [extrapolate_coverage(df, avg_time_elapsed, avg_termination_coverage) for df in data_frames]
+# Stack every trial onto one (runs x seconds) grid, extrapolating the trials that stop early
+seconds, coverage_grid = align_runs(data_frames, avg_time_elapsed, avg_termination_coverage)
 
 # Calculate the average coverage over time
 time_range = range(0, avg_time_elapsed + 1)
-avg_coverage = []
-for t in time_range:
-    coverage_values = [df[df['time_elapsed'] == t]['coverage_percent'].values[0] for df in extrapolated_data_frames if t in df['time_elapsed'].values]
-    avg_coverage.append(np.mean(coverage_values))
+avg_coverage, _ = grid_mean_std(coverage_grid[:, :avg_time_elapsed + 1])
 
 # Prepare the average dataframe for plotting
 avg_df = pd.DataFrame({
@@ -69,10 +51,10 @@ coverage_stdev = np.std(termination_coverage)
 
 # Plotting
 plt.figure(figsize=(10, 6))
-colors = cm.RdYlGn(np.linspace(0, 1, len(extrapolated_data_frames)))
+colors = cm.RdYlGn(np.linspace(0, 1, len(coverage_grid)))
 
-for i, (df, file) in enumerate(zip(extrapolated_data_frames, files)):
-    plt.plot(df['time_elapsed'], df['coverage_percent'], color=colors[i], alpha=0.35, linewidth=3)
+for i, run_coverage in enumerate(coverage_grid):
+    plt.plot(seconds, run_coverage, color=colors[i], alpha=0.35, linewidth=3)
 
 # Plot the average line
 plt.plot(avg_df['time_elapsed'], avg_df['coverage_percent'], linestyle='--', label='Average Exploration Trajectory', color='black', linewidth=3)
@@ -115,4 +97,10 @@ plt.show()
 print(f"Average Termination Time: {avg_time_elapsed} s")
 print(f"Standard Deviation of Termination Times: {np.std(termination_times):.2f} s")
 print(f"Average Map Coverage at Termination: {avg_termination_coverage:.2f}%")
-print(f"Standard Deviation of Map Coverage at Termination: {coverage_stdev:.2f}%")
\ No newline at end of file
+print(f"Standard Deviation of Map Coverage at Termination: {coverage_stdev:.2f}%")
+
+# 95% bootstrap confidence intervals of the termination metrics
+_, (time_low, time_high) = bootstrap_ci(mean, termination_times, n_boot=100000)
+_, (coverage_low, coverage_high) = bootstrap_ci(mean, termination_coverage, n_boot=100000)
+print(f"95% CI of Average Termination Time: [{time_low:.2f}, {time_high:.2f}] s")
+print(f"95% CI of Average Map Coverage at Termination: [{coverage_low:.2f}, {coverage_high:.2f}]%")
@@ -0,0 +1,156 @@
+import os
+import sys
+import runpy
+import argparse
+
+# Single entry point for the analyses: python wsr_cli.py <subcommand> [folders] [--plot].
+# Without --plot a subcommand only prints its per-folder numbers, so matplotlib is never
+# imported; --plot runs the paper scripts as they are, so the figures do not change.
+# numpy, pandas and the run store are imported by the functions that use them, so
+# --help and argument errors return without loading them
+
+# Folders a subcommand summarises when none are given, as experiment catalog queries
+DEFAULT_QUERIES = {
+    'time': "study in ('baseline', 'hardware') and merged",
+    'overlap': "study in ('baseline', 'hardware') and merged",
+    'failure': "study == 'failure' and merged",
+    'noise': "study == 'noise' and location == 'near_far'",
+    'slow': "study == 'slow' and runs > 0",
+    'ablation': "study == 'ablation' or folder == 'wsr_near_far'",
+}
+
+# Scripts behind --plot, in the order they are run
+PLOT_SCRIPTS = {
+    'time': ['baseline_time_paper_interp.py'],
+    'overlap': ['baseline_overlap_paper_interp.py'],
+    'failure': ['failure_analysis.py'],
+    'noise': ['noise_analysis.py', 'noise_overlap.py'],
+    'slow': ['slow_analysis_combined.py'],
+    'ablation': ['ablation_test_time.py', 'ablation_test_overlap.py'],
+}
+
+SORT_COLUMNS = {'noise': 'noise_deg'}
+
+
+def _mean_std(prefix, values):
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    return {f'{prefix}_mean': np.nanmean(values), f'{prefix}_std': np.nanstd(values)}
+
+# Termination time and map coverage of every run in folder/time
+def time_summary(folder):
+    from run_store import load_all_csv
+
+    data_frames = load_all_csv(os.path.join(folder, 'time'))
+    row = {'runs': len(data_frames)}
+    row.update(_mean_std('time', [df['time_elapsed'].max() for df in data_frames]))
+    row.update(_mean_std('coverage', [df['coverage_percent'].max() for df in data_frames]))
+    return row
+
+# Coverage overlap at termination of every run in folder/coverage
+def overlap_summary(folder):
+    from run_store import load_all_csv
+
+    data_frames = load_all_csv(os.path.join(folder, 'coverage'))
+    row = {'runs': len(data_frames)}
+    row.update(_mean_std('time', [df['Time Elapsed (s)'].max() for df in data_frames]))
+    row.update(_mean_std('overlap', [df['Coverage Overlap (%)'].iloc[-1] for df in data_frames]))
+    return row
+
+# Every run aligned on its own failure (failure_alignment): coverage and time at the
+# failure, termination time, final merged coverage and how fast the merged map recovers
+def failure_summary(folder):
+    from failure_alignment import load_failure_runs
+
+    metrics = load_failure_runs(folder).metrics(regain_levels=(0,))
+    row = {'runs': len(metrics)}
+    for column in ('failure_coverage', 'failure_time', 'termination_time', 'final_coverage', 'recovery_speed', 'regain_0_time'):
+        row.update(_mean_std(column, metrics[column]))
+    return row
+
+# Average termination time and final coverage of every robot id over the runs
+def slow_summary(folder):
+    import numpy as np
+    from robots import fleet_summary
+    from run_store import load_all_csv
+
+    data_frames = load_all_csv(os.path.join(folder, 'time'))
+    ids, termination, final_coverage = fleet_summary(data_frames)
+    row = {'runs': len(data_frames)}
+    row.update(_mean_std('time', [df['time_elapsed'].max() for df in data_frames]))
+    for i, robot in enumerate(ids):
+        row[f'r{robot}_time'] = np.nanmean(termination[:, i])
+        row[f'r{robot}_coverage'] = np.nanmean(final_coverage[:, i])
+    return row
+
+SUMMARIES = {
+    'time': time_summary,
+    'overlap': overlap_summary,
+    'failure': failure_summary,
+    'noise': time_summary,
+    'slow': slow_summary,
+    'ablation': time_summary,
+}
+
+
+def select(command, folders=None, where=None, root='.'):
+    if folders:
+        return list(folders)
+    from experiment_catalog import select_folders
+
+    return select_folders(where or DEFAULT_QUERIES[command], root, SORT_COLUMNS.get(command))
+
+# One row per folder, the numbers behind a subcommand's figure
+def summarize(command, folders):
+    import pandas as pd
+
+    return pd.DataFrame([SUMMARIES[command](folder) for folder in folders], index=pd.Index(folders, name='folder'))
+
+# Runs the subcommand's scripts in this process, the first point matplotlib gets imported.
+# With out_dir the scripts write their figures there instead of opening windows (ValueError for
+# a command whose scripts do not go through figures.output_figure yet), bands='quantile' shades
+# interquartile and 5-95% bands instead of mean +- std
+def plot(command, out_dir=None, bands=None):
+    if out_dir:
+        from figures import check_figure_scripts
+
+        check_figure_scripts(PLOT_SCRIPTS[command])
+        os.environ['WSR_FIGURE_DIR'] = out_dir
+    if bands:
+        os.environ['WSR_BANDS'] = bands
+    for script in PLOT_SCRIPTS[command]:
+        runpy.run_path(script, run_name='__main__')
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='wsr-analysis', description='WSR experiment analyses')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for command in SUMMARIES:
+        sub = commands.add_parser(command, help=f"{command} analysis ({', '.join(PLOT_SCRIPTS[command])} with --plot)")
+        sub.add_argument('folders', nargs='*', help='experiment folders (default: catalog query)')
+        sub.add_argument('--where', help='experiment catalog query selecting the folders')
+        sub.add_argument('--plot', action='store_true', help='also draw the paper figures')
+        sub.add_argument('--out', help='write figures to this directory instead of showing them (time, overlap)')
+        sub.add_argument('--bands', choices=('std', 'quantile'), help='band shading of the figures (default: std)')
+        sub.add_argument('--csv', help='save the summary table as CSV')
+    return parser
+
+def print_summary(summary):
+    import pandas as pd
+
+    with pd.option_context('display.width', 200, 'display.max_columns', None, 'display.float_format', '{:.2f}'.format):
+        print(summary)
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    folders = select(args.command, args.folders, args.where)
+    summary = summarize(args.command, folders)
+    print_summary(summary)
+    if args.csv:
+        summary.to_csv(args.csv)
+    if args.plot:
+        plot(args.command, args.out, args.bands)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])